@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+from a2a.types import AgentCard
+from pydantic import ValidationError
+
+from stock_screener.utils.paths import DATA_DIR
+from stock_screener.utils.read_env_vars import ENV
+
+
+class AgentCardCache:
+    """On-disk cache of resolved agent cards, keyed by agent address.
+
+    Lets the host agent start from the cards it resolved last time instead of
+    waiting for every remote agent, and revalidate them in the background.
+    """
+
+    def __init__(
+            self,
+            path: Union[str, Path] = DATA_DIR / "agent_cards.json",
+            max_age_seconds: float = ENV.host_agent.get("CARD_CACHE_MAX_AGE_HOURS", 168) * 3600,
+        ):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Ignoring unreadable agent card cache {self.path}: {e}")
+            return {}
+
+    def load(self, addresses: list[str]) -> dict[str, AgentCard]:
+        """Return the cached cards of `addresses` that are younger than the maximum age."""
+        with self._lock:
+            entries = self._read()
+
+        now = time.time()
+        cards = {}
+        for address in addresses:
+            entry = entries.get(address)
+            if not entry or now - entry.get("fetched_at", 0) > self.max_age_seconds:
+                continue
+            try:
+                cards[address] = AgentCard.model_validate(entry["card"])
+            except (KeyError, ValidationError) as e:
+                print(f"WARNING: Ignoring invalid cached agent card for {address}: {e}")
+        return cards
+
+    def store(self, cards: dict[str, AgentCard]) -> None:
+        """Save freshly resolved cards, keeping the cached cards of other addresses."""
+        if not cards:
+            return
+
+        with self._lock:
+            entries = self._read()
+            now = time.time()
+            for address, card in cards.items():
+                entries[address] = {
+                    "fetched_at": now,
+                    "card": card.model_dump(mode="json", exclude_none=True),
+                }
+
+            # Write to a temporary file first, so readers never see a partial cache
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+            tmp_path.replace(self.path)
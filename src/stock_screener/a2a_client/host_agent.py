@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import json
 import uuid
 from typing import Any
@@ -14,8 +15,8 @@ from a2a.types import (
     SendMessageResponse,
     SendMessageSuccessResponse,
     Task,
+    TaskState,
 )
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
 from google.adk.agents.llm_agent import LlmAgent
 
@@ -24,12 +25,16 @@ from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools.tool_context import ToolContext
 
-from stock_screener.a2a_client.remote_agent_connection import (
-    RemoteAgentConnections,
-    TaskUpdateCallback,
-)
+from stock_screener.a2a_client.card_cache import AgentCardCache
+from stock_screener.a2a_client.http_pool import HttpClientPool
+from stock_screener.a2a_client.remote_agent_connection import TaskUpdateCallback
+from stock_screener.a2a_client.replica_set import ReplicaSet
+from stock_screener.a2a_client.resilience import AgentUnavailableError
+from stock_screener.a2a_client.response_cache import ResponseCache, task_key
 
+from stock_screener.utils.mcp_toolsets import CachedMCPToolset
 from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.tracing import TRACER, inject_trace_context
 
 
 ENV.export_google_api_key()
@@ -79,47 +84,168 @@ class HostAgent:
     def __init__(
         self,
         task_callback: TaskUpdateCallback | None = None,
+        card_timeout: float = ENV.host_agent.get("CARD_TIMEOUT_SECONDS", 5),
+        card_cache: AgentCardCache | None = None,
+        http_pool: HttpClientPool | None = None,
+        batch_deadline: float = ENV.host_agent.get("BATCH_DEADLINE_SECONDS", 60),
+        response_cache: ResponseCache | None = None,
+        card_retry_seconds: float = ENV.host_agent.get("CARD_RETRY_SECONDS", 30),
     ):
         self.task_callback = task_callback
-        self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
+        self.card_timeout = card_timeout
+        self.card_cache = card_cache or AgentCardCache()
+        self.http_pool = http_pool or HttpClientPool()
+        self.batch_deadline = batch_deadline
+        self.card_retry_seconds = card_retry_seconds
+        if response_cache is None and ENV.host_agent.get("RESPONSE_CACHE", True):
+            response_cache = ResponseCache()
+        self.response_cache = response_cache
+        # Replicas of an agent serve the same card name from different URLs
+        self.remote_agent_connections: dict[str, ReplicaSet] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
+        # Addresses whose cards are still to be resolved or revalidated
+        self._stale_addresses: list[str] = []
+        self._refresh_task: asyncio.Task | None = None
+
+    async def _resolve_card(
+        self, client: httpx.AsyncClient, address: str
+    ) -> AgentCard | None:
+        """Fetch the agent card of one remote agent within the card timeout."""
+        card_resolver = A2ACardResolver(client, address)
+        try:
+            return await asyncio.wait_for(
+                card_resolver.get_agent_card(), timeout=self.card_timeout
+            )
+        except asyncio.TimeoutError:
+            print(
+                f'ERROR: Timed out after {self.card_timeout}s getting agent card from {address}'
+            )
+        except httpx.ConnectError as e:
+            print(f'ERROR: Failed to get agent card from {address}: {e}')
+        except Exception as e:  # Catch other potential errors
+            print(f'ERROR: Failed to initialize connection for {address}: {e}')
+        return None
+
+    async def _resolve_cards(self, addresses: list[str]) -> dict[str, AgentCard]:
+        """Fetch the agent cards of all addresses concurrently and cache them."""
+        if not addresses:
+            return {}
+
+        # Use a single httpx.AsyncClient for all card resolutions for efficiency.
+        # It is not the pooled client, because startup may run in another
+        # event loop than the one serving requests.
+        async with httpx.AsyncClient(timeout=self.card_timeout) as client:
+            cards = await asyncio.gather(
+                *(self._resolve_card(client, address) for address in addresses)
+            )
 
-    async def _async_init_components(
-        self, remote_agent_addresses: list[str]
-    ) -> None:
-        """Asynchronous part of initialization."""
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(
-                    client, address
-                )  # Constructor is sync
-                try:
-                    card = (
-                        await card_resolver.get_agent_card()
-                    )  # get_agent_card is async
-
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:  # Catch other potential errors
-                    print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
-                    )
+        resolved = {
+            address: card for address, card in zip(addresses, cards) if card
+        }
+        self.card_cache.store(resolved)
+        return resolved
 
+    def _register_card(self, address: str, card: AgentCard) -> None:
+        replicas = self.remote_agent_connections.get(card.name)
+        if replicas is None:
+            replicas = self.remote_agent_connections[card.name] = ReplicaSet(self.http_pool)
+        replicas.add(card, address, timeout=ENV.agent_timeouts.get(address))
+        self.cards[card.name] = card
+
+    def _update_agent_info(self) -> None:
         # Populate self.agents using the logic from original __init__ (via list_remote_agents)
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
             agent_info.append(json.dumps(agent_detail_dict))
         self.agents = '\n'.join(agent_info)
 
+    async def _refresh_cards(self) -> None:
+        """Resolve the stale cards until all of them answered, retrying every card_retry_seconds."""
+        while self._stale_addresses:
+            resolved = await self._resolve_cards(self._stale_addresses)
+            changed = False
+            for address, card in resolved.items():
+                if self.cards.get(card.name) != card:
+                    print(f'Agent card of {address} changed, updating the connection.')
+                    self._register_card(address, card)
+                    changed = True
+            if changed:
+                self._update_agent_info()
+
+            self._stale_addresses = [
+                address for address in self._stale_addresses if address not in resolved
+            ]
+            if self._stale_addresses:
+                await asyncio.sleep(self.card_retry_seconds)
+
+    def _ensure_card_refresh(self) -> None:
+        """Refresh the stale cards in the background of the running event loop.
+
+        The refresh registers connections on the pooled client, so it runs
+        on the loop that serves requests. A refresh started by another loop,
+        like the one of a synchronous startup or the main() loop that Gradio
+        blocks while it serves from its own loop, is restarted on the current one.
+        """
+        if not self._stale_addresses:
+            return
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return
+        self._stop_card_refresh()
+        self._refresh_task = asyncio.create_task(
+            self._refresh_cards(), name='agent-card-refresh'
+        )
+
+    def _stop_card_refresh(self) -> asyncio.Task | None:
+        """Cancel the card refresh, and return it if it runs on the current loop."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is None or task.done():
+            return None
+        if task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            return task
+        # The loop of the task may run in another thread, or be stopped for good
+        with contextlib.suppress(RuntimeError):
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        return None
+
+    async def _async_init_components(
+        self, remote_agent_addresses: list[str]
+    ) -> None:
+        """Asynchronous part of initialization.
+
+        Starts from the cached cards where possible and resolves the others
+        concurrently, so one slow agent only delays startup by the card timeout.
+        """
+        cached = self.card_cache.load(remote_agent_addresses)
+        resolved = await self._resolve_cards(
+            [address for address in remote_agent_addresses if address not in cached]
+        )
+
+        for address in remote_agent_addresses:
+            card = resolved.get(address) or cached.get(address)
+            if card:
+                self._register_card(address, card)
+
+        self._update_agent_info()
+
+        # Revalidate the cached cards and retry the agents that did not answer
+        self._stale_addresses = [
+            address for address in remote_agent_addresses if address not in resolved
+        ]
+        self._ensure_card_refresh()
+
+    async def aclose(self) -> None:
+        """Stop the card refresh and health checks and close the pooled connections."""
+        refresh = self._stop_card_refresh()
+        if refresh is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await refresh
+        for replicas in self.remote_agent_connections.values():
+            await replicas.aclose()
+        await self.http_pool.aclose()
+
     @classmethod
     async def create(
         cls,
@@ -144,14 +270,14 @@ class HostAgent:
             model="gemini-2.5-flash",
             include_contents="default",
             before_model_callback=self.before_model_callback,
-            tools=[toolset, self.send_message],
+            tools=[toolset, self.send_message, self.send_messages],
         )
         return agent
     
-    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> MCPToolset:
+    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> CachedMCPToolset:
         """Return the tools available in the agent."""
         
-        toolset = MCPToolset(
+        toolset = CachedMCPToolset(
             connection_params=StreamableHTTPServerParams(url=mcp_url),
             tool_filter=[
                 "get_gross_margins",
@@ -183,6 +309,8 @@ class HostAgent:
 
         * **Answer Directly:** Answer user query if you have the appropriate tools to answer them directly
         * **Task Delegation:** If you lack the tools to answer the user query, utilize the `send_message` function to assign actionable tasks to remote agents.
+        * **Batch Delegation:** If a request needs several remote agents, or several independent tasks such as one per ticker,         
+        send them all in one `send_messages` call instead of calling `send_message` repeatedly.
         * **Contextual Awareness for Remote Agents:** If a remote agent repeatedly requests user confirmation, assume it lacks access to the         
         full conversation history. In such cases, enrich the task description with all necessary contextual information relevant to that         
         specific agent.
@@ -219,6 +347,7 @@ class HostAgent:
     def before_model_callback(
         self, callback_context: CallbackContext, llm_request
     ):
+        self._ensure_card_refresh()
         state = callback_context.state
         if 'session_active' not in state or not state['session_active']:
             if 'session_id' not in state:
@@ -259,24 +388,95 @@ class HostAgent:
             raise ValueError(f'Agent {agent_name} not found')
         state = tool_context.state
         state['active_agent'] = agent_name
-        client = self.remote_agent_connections[agent_name]
 
-        if not client:
-            raise ValueError(f'Client not available for {agent_name}')
-        
         if 'context_id' in state:
             context_id = state['context_id']
         else:
             context_id = str(uuid.uuid4())
 
         message_id = ''
+        if 'input_message_metadata' in state:
+            message_id = state['input_message_metadata'].get('message_id', '')
+
+        return await self._delegate(
+            agent_name, task, state, context_id, message_id or str(uuid.uuid4())
+        )
+
+    async def send_messages(
+        self, agent_names: list[str], tasks: list[str], tool_context: ToolContext
+    ):
+        """Sends several tasks to remote agents at once.
+
+        Use this instead of calling send_message repeatedly when a request
+        needs several remote agents, or several independent tasks for one
+        agent, e.g. one task per ticker. All tasks run concurrently.
+
+        Args:
+            agent_names: The name of the agent to send each task to.
+            tasks: The tasks, in the same order as agent_names. Each one must
+                be self-contained, with all the context the agent needs.
+            tool_context: The tool context this method runs in.
+
+        Returns:
+            One result per task, in the order of the tasks, with either the
+            answer of the agent or an error.
+        """
+        if len(agent_names) != len(tasks):
+            raise ValueError('agent_names and tasks must have the same length')
+        unknown = sorted(set(agent_names) - set(self.remote_agent_connections))
+        if unknown:
+            raise ValueError(f'Agents {unknown} not found')
+
+        # Each task gets its own context, so the remote agent runs them in
+        # separate sessions instead of queueing them on one
+        state = tool_context.state
+        delegations = [
+            asyncio.create_task(
+                self._delegate(agent_name, task, state, str(uuid.uuid4()), str(uuid.uuid4()))
+            )
+            for agent_name, task in zip(agent_names, tasks)
+        ]
+        try:
+            await asyncio.wait(delegations, timeout=self.batch_deadline)
+        finally:
+            # Stops the late delegations, and all of them when this call is canceled
+            late = [delegation for delegation in delegations if not delegation.done()]
+            for delegation in late:
+                delegation.cancel()
+            await asyncio.gather(*late, return_exceptions=True)
+
+        results = []
+        for agent_name, task, delegation in zip(agent_names, tasks, delegations):
+            result = {'agent_name': agent_name, 'task': task}
+            if delegation in late:
+                result['error'] = f'No answer within {self.batch_deadline}s'
+            elif delegation.exception() is not None:
+                result['error'] = str(delegation.exception())
+            elif isinstance(delegation.result(), Task):
+                result['result'] = delegation.result().model_dump(mode='json', exclude_none=True)
+            else:
+                result['result'] = delegation.result()
+            results.append(result)
+        return results
+
+    async def _delegate(
+        self, agent_name: str, task: str, state, context_id: str, message_id: str
+    ):
+        """Send one task to a remote agent and return its task, or an error."""
+        key = task_key(agent_name, task)
+        if self.response_cache is not None and key is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        client = self.remote_agent_connections[agent_name]
+
+        if not client:
+            raise ValueError(f'Client not available for {agent_name}')
+
         metadata = {}
         if 'input_message_metadata' in state:
             metadata.update(**state['input_message_metadata'])
-            if 'message_id' in state['input_message_metadata']:
-                message_id = state['input_message_metadata']['message_id']
-        if not message_id:
-            message_id = str(uuid.uuid4())
 
         payload = {
             'message': {
@@ -291,12 +491,23 @@ class HostAgent:
         if context_id:
             payload['message']['contextId'] = context_id
 
-        message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
-        )
-        send_response: SendMessageResponse = await client.send_message(
-            message_request=message_request
-        )
+        with TRACER.start_as_current_span(
+            'a2a.send_message', attributes={'a2a.agent_name': agent_name}
+        ):
+            # The remote agent continues this trace from the message metadata
+            payload['message']['metadata'] = inject_trace_context(metadata)
+
+            message_request = SendMessageRequest(
+                id=message_id, params=MessageSendParams.model_validate(payload)
+            )
+            try:
+                send_response: SendMessageResponse = await client.send_message(
+                    message_request=message_request
+                )
+            except AgentUnavailableError as e:
+                # Let the model tell the user instead of failing the whole turn
+                print(f'ERROR: {e}')
+                return {'error': str(e)}
         print(
             'send_response',
             send_response.model_dump_json(exclude_none=True, indent=2),
@@ -310,31 +521,75 @@ class HostAgent:
             print('received non-task response. Aborting get task ')
             return None
 
-        return send_response.root.result
+        result = send_response.root.result
+        if (
+            self.response_cache is not None
+            and key is not None
+            and result.status.state == TaskState.completed
+        ):
+            self.response_cache.put(key, result)
+        return result
+
+_host_agent: HostAgent | None = None
+_root_agent: Agent | None = None
+_root_agent_lock = asyncio.Lock()
+
+
+async def create_root_agent(agent_urls: list[str] = ENV.agent_urls) -> Agent:
+    """Create and initialize a HostAgent and build its LLM agent."""
+    routing_agent_instance = await HostAgent.create(
+        remote_agent_addresses=agent_urls
+    )
+    return routing_agent_instance._build_agent()
+
+
+async def get_root_agent() -> Agent:
+    """Return the shared host LLM agent, creating it on first use."""
+    global _host_agent, _root_agent
+
+    if _root_agent is None:
+        async with _root_agent_lock:
+            if _root_agent is None:
+                _host_agent = await HostAgent.create(remote_agent_addresses=ENV.agent_urls)
+                _root_agent = _host_agent._build_agent()
+    return _root_agent
+
+
+async def close_root_agent() -> None:
+    """Close the connections of the shared host agent."""
+    global _host_agent, _root_agent
+
+    if _host_agent is not None:
+        await _host_agent.aclose()
+    _host_agent = None
+    _root_agent = None
 
 
 def _get_initialized_routing_agent_sync(agent_urls: list[str] = ENV.agent_urls) -> Agent:
     """Synchronously creates and initializes the HostAgent."""
 
-    async def _async_main() -> Agent:
-        routing_agent_instance = await HostAgent.create(
-            remote_agent_addresses=agent_urls
-        )
-        return routing_agent_instance._build_agent()
-
     try:
-        return asyncio.run(_async_main())
+        return asyncio.run(create_root_agent(agent_urls))
     except RuntimeError as e:
         if 'asyncio.run() cannot be called from a running event loop' in str(e):
             print(
                 f'Warning: Could not initialize HostAgent with asyncio.run(): {e}. '
                 'This can happen if an event loop is already running (e.g., in Jupyter). '
-                'Consider initializing HostAgent within an async function in your application.'
+                'Use `await get_root_agent()` inside an async function instead.'
             )
         raise
 
 
-root_agent = _get_initialized_routing_agent_sync()
-
+def __getattr__(name: str) -> Any:
+    """Build `root_agent` on first access instead of at import time.
 
+    Kept for code that imports `root_agent` directly, such as `adk web`.
+    Async code should use `await get_root_agent()`.
+    """
+    global _root_agent
 
+    if name == 'root_agent':
+        if _root_agent is None:
+            _root_agent = _get_initialized_routing_agent_sync()
+        return _root_agent
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,66 @@
+import importlib.util
+
+import httpx
+
+from stock_screener.utils.read_env_vars import ENV
+
+
+class HttpClientPool:
+    """One tuned httpx connection pool shared by all remote agent connections.
+
+    Keeps connections to the remote agents alive between delegations, so
+    most requests skip the TCP and TLS handshakes. HTTP/2 is negotiated with
+    agents served over TLS when enabled and the `h2` package is installed.
+
+    The client binds to the event loop that first uses it, so it should only
+    be used from the loop that serves requests.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = ENV.host_agent.get("MAX_CONNECTIONS", 100),
+            max_keepalive_connections: int = ENV.host_agent.get("MAX_KEEPALIVE_CONNECTIONS", 20),
+            keepalive_expiry: float = ENV.host_agent.get("KEEPALIVE_SECONDS", 30),
+            timeout: float = ENV.host_agent.get("REQUEST_TIMEOUT_SECONDS", 30),
+            http2: bool = ENV.host_agent.get("HTTP2", False),
+        ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("WARNING: HTTP2 needs the h2 package (pip install httpx[http2]), using HTTP/1.1.")
+            http2 = False
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is None:
+            return
+        try:
+            await self._client.aclose()
+        except RuntimeError as e:
+            # Connections opened by an event loop that has already stopped
+            # were released with it
+            print(f"WARNING: Could not close pooled connections cleanly: {e}")
+
+    async def __aenter__(self) -> "HttpClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
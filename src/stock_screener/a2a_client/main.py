@@ -6,25 +6,37 @@ from pprint import pformat
 
 import gradio as gr
 
-from stock_screener.a2a_client.host_agent import (
-    root_agent
-)
+from stock_screener.a2a_client.host_agent import close_root_agent, get_root_agent
 from google.adk.events import Event
-from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin
+from stock_screener.utils.mcp_pool import close_session_pools
+from stock_screener.utils.runners import ScopedRunner
+from stock_screener.utils.tracing import setup_tracing
+
 
 APP_NAME = 'routing_app'
 USER_ID = 'default_user'
 SESSION_ID = 'default_session'
 
 SESSION_SERVICE = InMemorySessionService()
-ROUTING_AGENT_RUNNER = Runner(
-    agent=root_agent,
-    app_name=APP_NAME,
-    session_service=SESSION_SERVICE,
-)
+ROUTING_AGENT_RUNNER: ScopedRunner | None = None
+
+
+async def get_runner() -> ScopedRunner:
+    """Return the host agent runner, building the host agent on first use."""
+    global ROUTING_AGENT_RUNNER
+
+    if ROUTING_AGENT_RUNNER is None:
+        ROUTING_AGENT_RUNNER = ScopedRunner(
+            agent=await get_root_agent(),
+            app_name=APP_NAME,
+            session_service=SESSION_SERVICE,
+            plugins=[MCPBatchingPlugin()],
+        )
+    return ROUTING_AGENT_RUNNER
 
 
 async def get_response_from_agent(
@@ -33,7 +45,8 @@ async def get_response_from_agent(
 ) -> AsyncIterator[gr.ChatMessage]:
     """Get response from host agent."""
     try:
-        event_iterator: AsyncIterator[Event] = ROUTING_AGENT_RUNNER.run_async(
+        runner = await get_runner()
+        event_iterator: AsyncIterator[Event] = runner.run_async(
             user_id=USER_ID,
             session_id=SESSION_ID,
             new_message=types.Content(
@@ -95,6 +108,11 @@ async def get_response_from_agent(
 
 async def main():
     """Main gradio app."""
+    setup_tracing("host-agent")
+
+    print('Building host agent...')
+    await get_runner()
+
     print('Creating ADK session...')
     await SESSION_SERVICE.create_session(
         app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
@@ -121,10 +139,14 @@ async def main():
         )
 
     print('Launching Gradio interface...')
-    demo.queue().launch(
-        server_name='0.0.0.0',
-        server_port=8083,
-    )
+    try:
+        demo.queue().launch(
+            server_name='0.0.0.0',
+            server_port=8083,
+        )
+    finally:
+        await close_root_agent()
+        await close_session_pools()
     print('Gradio application has been shut down.')
 
 
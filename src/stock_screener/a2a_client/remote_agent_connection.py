@@ -1,7 +1,5 @@
 from collections.abc import Callable
 
-import httpx
-
 from a2a.client import A2AClient
 from a2a.types import (
     AgentCard,
@@ -12,6 +10,8 @@ from a2a.types import (
     TaskStatusUpdateEvent,
 )
 
+from stock_screener.a2a_client.http_pool import HttpClientPool
+
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
@@ -20,19 +20,28 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        http_pool: HttpClientPool,
+        timeout: float | None = None,
+    ):
         print(f'agent_card: {agent_card}')
         print(f'agent_url: {agent_url}')
-        self._httpx_client = httpx.AsyncClient(timeout=30)
-        self.agent_client = A2AClient(
-            self._httpx_client, agent_card, url=agent_url
-        )
+        # Connections are pooled across all remote agents. Requests go to the
+        # configured URL rather than the card's, because replicas of an agent
+        # share one card
+        self.agent_client = A2AClient(http_pool.client, url=agent_url)
         self.card = agent_card
+        self.timeout = timeout or http_pool.timeout
 
     def get_agent(self) -> AgentCard:
         return self.card
 
     async def send_message(
-        self, message_request: SendMessageRequest
+        self, message_request: SendMessageRequest, timeout: float | None = None
     ) -> SendMessageResponse:
-        return await self.agent_client.send_message(message_request)
\ No newline at end of file
+        return await self.agent_client.send_message(
+            message_request, http_kwargs={'timeout': timeout or self.timeout}
+        )
\ No newline at end of file
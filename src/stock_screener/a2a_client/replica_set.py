@@ -0,0 +1,308 @@
+import asyncio
+import contextlib
+import random
+
+import httpx
+from a2a.client import A2AClientHTTPError, A2AClientTimeoutError
+from a2a.types import AgentCard, SendMessageRequest, SendMessageResponse
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from opentelemetry import trace
+
+from stock_screener.a2a_client.http_pool import HttpClientPool
+from stock_screener.a2a_client.remote_agent_connection import RemoteAgentConnections
+from stock_screener.a2a_client.resilience import (
+    AgentUnavailableError,
+    CircuitBreaker,
+    LatencyWindow,
+)
+from stock_screener.utils.read_env_vars import ENV
+
+
+# Errors that say something about the replica rather than about the request
+REPLICA_ERRORS = (httpx.TransportError, A2AClientTimeoutError)
+
+
+def is_replica_error(error: BaseException) -> bool:
+    """Return whether `error` is worth retrying on another replica."""
+    if isinstance(error, A2AClientHTTPError):
+        return error.status_code >= 500
+    return isinstance(error, REPLICA_ERRORS)
+
+
+class Replica:
+    """One endpoint of a remote agent, with its load and health."""
+
+    def __init__(self, connection: RemoteAgentConnections, url: str):
+        self.connection = connection
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.healthy = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, eject_after: int) -> None:
+        self.failures += 1
+        if self.healthy and self.failures >= eject_after:
+            print(f'WARNING: Ejecting replica {self.url} after {self.failures} consecutive failures.')
+            self.healthy = False
+
+
+class ReplicaSet:
+    """The connections to all replicas of one remote agent.
+
+    Sends each request to the healthy replica with the fewest outstanding
+    requests. Replicas are ejected after `eject_after` consecutive failed
+    requests or a failed health check, and readmitted once a health check
+    passes. Health checks run in the background on the event loop that serves
+    requests, every `health_check_interval` seconds.
+
+    Each message has a latency budget, the request timeout of the agent, which
+    covers all its attempts. A request slower than the p95 latency is hedged
+    with a second one to another replica, and the first answer wins. Failed
+    requests are retried up to `max_retries` times with jittered exponential
+    backoff. A circuit breaker fails fast while the agent keeps failing.
+    """
+
+    def __init__(
+            self,
+            http_pool: HttpClientPool,
+            health_check_interval: float = ENV.host_agent.get("HEALTH_CHECK_SECONDS", 10),
+            health_check_path: str = ENV.host_agent.get("HEALTH_CHECK_PATH", AGENT_CARD_WELL_KNOWN_PATH),
+            eject_after: int = ENV.host_agent.get("EJECT_AFTER_FAILURES", 3),
+            max_retries: int = ENV.host_agent.get("MAX_RETRIES", 2),
+            retry_backoff: float = ENV.host_agent.get("RETRY_BACKOFF_SECONDS", 0.2),
+            hedge: bool = ENV.host_agent.get("HEDGE", True),
+            hedge_min_samples: int = ENV.host_agent.get("HEDGE_MIN_SAMPLES", 20),
+            circuit_failures: int = ENV.host_agent.get("CIRCUIT_FAILURES", 5),
+            circuit_reset: float = ENV.host_agent.get("CIRCUIT_RESET_SECONDS", 30),
+        ):
+        self.http_pool = http_pool
+        self.health_check_interval = health_check_interval
+        self.health_check_path = '/' + health_check_path.lstrip('/')
+        self.eject_after = eject_after
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(circuit_failures, circuit_reset)
+        self.latencies = LatencyWindow()
+        self.budget = http_pool.timeout
+        self.replicas: dict[str, Replica] = {}
+        self.card: AgentCard | None = None
+        self._health_task: asyncio.Task | None = None
+
+    def add(self, agent_card: AgentCard, agent_url: str, timeout: float | None = None) -> None:
+        """Add a replica, or update the card of a known one.
+
+        `timeout` is the latency budget of the agent, and defaults to the
+        request timeout of the pool.
+        """
+        connection = RemoteAgentConnections(
+            agent_card=agent_card,
+            agent_url=agent_url,
+            http_pool=self.http_pool,
+            timeout=timeout,
+        )
+        replica = self.replicas.get(agent_url)
+        if replica is None:
+            self.replicas[agent_url] = Replica(connection, agent_url)
+        else:
+            replica.connection = connection
+        self.card = agent_card
+        self.budget = connection.timeout
+
+    def get_agent(self) -> AgentCard:
+        return self.card
+
+    def _pick(self, exclude: Replica | None = None) -> Replica | None:
+        """Return the healthy replica with the fewest outstanding requests.
+
+        Ties are broken at random, so idle replicas share the load evenly. When
+        every replica is ejected, all of them are tried rather than none.
+        """
+        candidates = [replica for replica in self.replicas.values() if replica is not exclude]
+        healthy = [replica for replica in candidates if replica.healthy]
+        candidates = healthy or ([] if exclude else candidates)
+        if not candidates:
+            return None
+        fewest = min(replica.outstanding for replica in candidates)
+        return random.choice([replica for replica in candidates if replica.outstanding == fewest])
+
+    def _hedge_delay(self) -> float | None:
+        """Return how long to wait before hedging, or None to not hedge."""
+        if not self.hedge or len(self.latencies) < self.hedge_min_samples:
+            return None
+        if sum(replica.healthy for replica in self.replicas.values()) < 2:
+            return None
+        return self.latencies.percentile(95)
+
+    async def _attempt(
+        self, replica: Replica, message_request: SendMessageRequest, deadline: float
+    ) -> SendMessageResponse:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        replica.outstanding += 1
+        try:
+            response = await replica.connection.send_message(
+                message_request, timeout=max(deadline - start, 0.001)
+            )
+        except Exception as e:
+            if is_replica_error(e):
+                replica.record_failure(self.eject_after)
+            raise
+        finally:
+            replica.outstanding -= 1
+        replica.record_success()
+        self.latencies.add(loop.time() - start)
+        return response
+
+    async def _send_hedged(
+        self, message_request: SendMessageRequest, deadline: float
+    ) -> SendMessageResponse:
+        """Send to one replica, and to a second one if the first is slower than p95."""
+        primary = self._pick()
+        trace.get_current_span().set_attribute('a2a.agent_url', primary.url)
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._attempt(primary, message_request, deadline)
+
+        tasks = {asyncio.create_task(self._attempt(primary, message_request, deadline))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                secondary = self._pick(exclude=primary)
+                if secondary is not None:
+                    trace.get_current_span().set_attribute('a2a.hedged_url', secondary.url)
+                    tasks.add(asyncio.create_task(self._attempt(secondary, message_request, deadline)))
+
+            # The first successful answer wins; fail only when every attempt failed
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            raise next(iter(done)).exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send_with_retries(
+        self, message_request: SendMessageRequest, deadline: float
+    ) -> SendMessageResponse:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._send_hedged(message_request, deadline)
+            except Exception as e:
+                backoff = random.uniform(0, self.retry_backoff * 2 ** attempt)
+                if (
+                    not is_replica_error(e)
+                    or attempt == self.max_retries
+                    or loop.time() + backoff >= deadline
+                ):
+                    raise
+                print(f'WARNING: Retrying {self.card.name} in {backoff:.2f}s after: {e}')
+                await asyncio.sleep(backoff)
+
+    async def send_message(
+        self, message_request: SendMessageRequest
+    ) -> SendMessageResponse:
+        """Send a message within the latency budget of the agent.
+
+        Raises AgentUnavailableError when the circuit is open, the budget runs
+        out, or every retry failed.
+        """
+        self._ensure_health_checks()
+
+        trial = self.breaker.state == 'half_open'
+        if not self.breaker.allow():
+            raise AgentUnavailableError(
+                f'{self.card.name} is failing, not sending requests to it for now'
+            )
+
+        deadline = asyncio.get_running_loop().time() + self.budget
+        try:
+            response = await asyncio.wait_for(
+                self._send_with_retries(message_request, deadline), timeout=self.budget
+            )
+        except asyncio.TimeoutError as e:
+            self.breaker.record_failure()
+            raise AgentUnavailableError(
+                f'{self.card.name} did not answer within {self.budget}s'
+            ) from e
+        except Exception as e:
+            if not is_replica_error(e):
+                # The agent answered, the request itself was rejected
+                self.breaker.record_success()
+                raise
+            self.breaker.record_failure()
+            raise AgentUnavailableError(f'{self.card.name} failed: {e}') from e
+        except BaseException:
+            # Cancelled: no outcome for the circuit, let the next call be the trial
+            if trial:
+                self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return response
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            response = await self.http_pool.client.get(
+                replica.url.rstrip('/') + self.health_check_path,
+                timeout=self.health_check_interval,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if replica.healthy:
+                print(f'WARNING: Ejecting replica {replica.url}, health check failed: {e}')
+            replica.healthy = False
+            return
+
+        if not replica.healthy:
+            print(f'Replica {replica.url} passed its health check, readmitting it.')
+        replica.healthy = True
+        replica.failures = 0
+
+    async def check_health(self) -> None:
+        """Check all replicas once, concurrently."""
+        await asyncio.gather(*(self._check(replica) for replica in list(self.replicas.values())))
+
+    async def _health_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
+
+    def _ensure_health_checks(self) -> None:
+        # A single endpoint has nowhere else to send requests, so it is not checked
+        if len(self.replicas) < 2 or self.health_check_interval <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_check_loop())
+
+    async def aclose(self) -> None:
+        """Stop the health checks."""
+        if self._health_task is None:
+            return
+        self._health_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, RuntimeError):
+            await self._health_task
+        self._health_task = None
+
+    def stats(self) -> dict:
+        """Return the circuit state, latency and the load and health of each replica."""
+        return {
+            'circuit': self.breaker.state,
+            'p95_seconds': self.latencies.percentile(95),
+            'replicas': [
+                {
+                    'url': replica.url,
+                    'outstanding': replica.outstanding,
+                    'failures': replica.failures,
+                    'healthy': replica.healthy,
+                }
+                for replica in self.replicas.values()
+            ],
+        }
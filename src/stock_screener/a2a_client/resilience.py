@@ -0,0 +1,79 @@
+import time
+from collections import deque
+
+from a2a.client import A2AClientError
+
+
+class AgentUnavailableError(A2AClientError):
+    """A remote agent did not answer within its budget, or its circuit is open."""
+
+
+class LatencyWindow:
+    """The latencies of the most recent successful requests."""
+
+    def __init__(self, size: int = 100):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, q: float) -> float | None:
+        """Return the `q` percentile (0 to 100) of the window, or None when it is empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class CircuitBreaker:
+    """Fail fast while a remote agent keeps failing.
+
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`. Then lets one trial call through: it closes the circuit
+    when it succeeds, and opens it again when it fails. A trial call that
+    ends without an outcome, e.g. because it was cancelled, must be released
+    so that the next call can be the trial.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at < self.reset_seconds:
+            return 'open'
+        return 'half_open'
+
+    def allow(self) -> bool:
+        """Return whether a call may go through now."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def release(self) -> None:
+        """End a call without an outcome, freeing the trial slot it may hold."""
+        self._trial_running = False
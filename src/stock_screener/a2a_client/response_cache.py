@@ -0,0 +1,90 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from stock_screener.a2a_server.screening import classify_query, ticker_set
+from stock_screener.utils.market_hours import is_market_open, seconds_until_next_open
+from stock_screener.utils.metrics import CACHE_REQUESTS
+from stock_screener.utils.read_env_vars import ENV
+
+
+def task_key(
+        agent_name: str,
+        task: str,
+        cached_agents: tuple[str, ...] = tuple(
+            ENV.host_agent.get("RESPONSE_CACHE_AGENTS", ["Technical Analyst Agent"])
+        ),
+    ) -> tuple | None:
+    """Return the cache key of a task delegated to an agent, or None if its answer must not be cached.
+
+    Only answers that depend on market data alone are cached: tasks of the
+    `cached_agents` that ask for the technical analysis of explicit tickers.
+    They share a key whatever their wording and ticker order. Other tasks
+    may depend on the conversation they were sent from.
+    """
+    if agent_name not in cached_agents:
+        return None
+    tickers = classify_query(task)
+    if not tickers:
+        return None
+    return (agent_name, ticker_set(tickers))
+
+
+class ResponseCache:
+    """LRU cache of remote agent answers that expire with the trading calendar.
+
+    Answers cached while the market is open are kept for `open_ttl` seconds.
+    Answers cached while it is closed stay valid until the next open, because
+    the prices they are based on cannot change before then.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = ENV.host_agent.get("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+            open_ttl: float = ENV.host_agent.get("RESPONSE_CACHE_OPEN_TTL_SECONDS", 60),
+        ):
+        self.max_entries = max_entries
+        self.open_ttl = open_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl(self) -> float:
+        """Return how long an answer cached now stays valid, in seconds."""
+        if is_market_open():
+            return self.open_ttl
+        return seconds_until_next_open()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache="response", result="miss")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache="response", result="hit")
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
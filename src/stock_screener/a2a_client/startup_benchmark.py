@@ -0,0 +1,75 @@
+"""Measure the startup cost of the host agent.
+
+Reports the time to import the host agent module in a fresh interpreter,
+split into its third-party dependencies and the module itself, and the time
+to build the host agent with a cold and a warm agent card cache.
+
+    uv run -m stock_screener.a2a_client.startup_benchmark
+"""
+
+import asyncio
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from stock_screener.a2a_client.card_cache import AgentCardCache
+from stock_screener.a2a_client.host_agent import HostAgent
+from stock_screener.utils.read_env_vars import ENV
+
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import a2a.client, google.adk.agents, httpx
+deps = time.perf_counter()
+import stock_screener.a2a_client.host_agent
+end = time.perf_counter()
+print(deps - start, end - deps)
+"""
+
+
+def measure_import(runs: int = 3) -> tuple[float, float]:
+    """Return the median seconds to import the dependencies and the host agent module."""
+    deps, module = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        deps.append(float(output[-2]))
+        module.append(float(output[-1]))
+    return statistics.median(deps), statistics.median(module)
+
+
+async def measure_build(agent_urls: list[str], cache_path: Path) -> float:
+    """Return the seconds to resolve the agent cards and build the host agent."""
+    start = time.perf_counter()
+    host = HostAgent(card_cache=AgentCardCache(cache_path))
+    await host._async_init_components(agent_urls)
+    host._build_agent()
+    return time.perf_counter() - start
+
+
+def main():
+
+    deps, module = measure_import()
+    print(f"Import dependencies (a2a, google-adk, httpx): {deps * 1000:8.1f} ms")
+    print(f"Import host_agent module:                    {module * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = Path(tmp_dir) / "agent_cards.json"
+        cold = asyncio.run(measure_build(ENV.agent_urls, cache_path))
+        warm = asyncio.run(measure_build(ENV.agent_urls, cache_path))
+
+    print(f"Build host agent, cold card cache:           {cold * 1000:8.1f} ms")
+    print(f"Build host agent, warm card cache:           {warm * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+
+    main()
@@ -7,12 +7,14 @@ from a2a.types import (
     AgentCard,
     MessageSendParams,
     SendMessageRequest,
+    SendStreamingMessageRequest,
+    TaskArtifactUpdateEvent,
 )
 
 
 base_url = 'http://localhost:9999'
 
-async def main() -> None:
+async def main(stream: bool = True) -> None:
 
     async with httpx.AsyncClient(timeout=60) as httpx_client:
         # Initialize A2ACardResolver
@@ -56,16 +58,37 @@ async def main() -> None:
                 'messageId': uuid4().hex,
             },
         }
+        if stream:
+            streaming_request = SendStreamingMessageRequest(
+                id=str(uuid4()), params=MessageSendParams(**send_message_payload)
+            )
+
+            # Print the response artifact chunks as they arrive. A chunk that
+            # does not append replaces the artifact with the text printed so far.
+            started = set()
+            async for chunk in client.send_message_streaming(streaming_request):
+                event = getattr(chunk.root, 'result', None)
+                if isinstance(event, TaskArtifactUpdateEvent) and event.artifact.name == 'response':
+                    if not event.append and event.artifact.artifact_id in started:
+                        continue
+                    started.add(event.artifact.artifact_id)
+                    for part in event.artifact.parts:
+                        if part.root.kind == 'text':
+                            print(part.root.text, end='', flush=True)
+            print()
+            return
+
         request = SendMessageRequest(
             id=str(uuid4()), params=MessageSendParams(**send_message_payload)
         )
 
         response = await client.send_message(request)
-        print(response.model_dump(
-            mode='json', 
+        artifacts = response.model_dump(
+            mode='json',
             exclude_none=True
-        ).get("result").get("artifacts")[0].get("parts")[0].get("text")
-        )
+        ).get("result").get("artifacts")
+        response_artifact = next(a for a in artifacts if a.get("name") == "response")
+        print(''.join(part.get("text", "") for part in response_artifact.get("parts")))
 
 
 if __name__ == '__main__':
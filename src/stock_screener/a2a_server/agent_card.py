@@ -7,7 +7,7 @@ from a2a.types import (
 from stock_screener.a2a_server.technical_analyst_agent import TechnicalAnalystAgent
 
 
-capabilities = AgentCapabilities(streaming=False)
+capabilities = AgentCapabilities(streaming=True)
 
 technical_signal_skill = AgentSkill(
     id="technical_stock_signals",
@@ -32,6 +32,20 @@ technical_stock_screening_skill = AgentSkill(
     ]   
 )
 
+technical_indicator_batch_skill = AgentSkill(
+    id="technical_indicator_batch",
+    name="Returns technical indicators for a batch of stocks as JSON",
+    description="Computes the latest technical indicators and signal for every ticker in a JSON \
+        request like {\"tickers\": [...], \"indicators\": [...], \"lookback\": 300}, \
+        and returns a JSON artifact with one row per ticker",
+    tags=["technical", "indicators", "batch", "json"],
+    examples=[
+        '{"tickers": ["TSLA", "INTC"], "indicators": ["rsi_14", "macd"], "lookback": 300}'
+    ],
+    input_modes=["application/json"],
+    output_modes=["application/json"],
+)
+
 public_agent_card = AgentCard(
     name="Technical Analyst Agent",
     description="Main agent for stock screening based on technical indicators.",
@@ -40,6 +54,6 @@ public_agent_card = AgentCard(
     default_input_modes=TechnicalAnalystAgent.SUPPORTED_CONTENT_TYPES,
     default_output_modes=TechnicalAnalystAgent.SUPPORTED_CONTENT_TYPES,
     capabilities=capabilities,
-    skills=[technical_signal_skill, technical_stock_screening_skill],
+    skills=[technical_signal_skill, technical_stock_screening_skill, technical_indicator_batch_skill],
     # supports_authenticated_extended_card=True,
 )
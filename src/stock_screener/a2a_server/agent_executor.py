@@ -1,33 +1,177 @@
+import asyncio
+import contextlib
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.utils import new_agent_text_message, new_task
-from a2a.types import TaskState, TextPart
+from a2a.types import DataPart, TaskNotCancelableError, TaskState, TextPart
+from a2a.utils.errors import ServerError
 
+from google.adk.agents.invocation_context import new_invocation_context_id
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService
+from google.adk.tools.base_toolset import BaseToolset
 from google.genai import types as genai_types
+from opentelemetry import trace
 from a2a.types import Part
 
+from stock_screener.a2a_server.coalescing import SingleFlight
+from stock_screener.a2a_server.screening import (
+    ENGINE_SIGNAL_NOTE,
+    classify_query,
+    parse_batch_request,
+    parse_screening_request,
+    render_signal_table,
+    shard,
+    shard_query,
+    table_header,
+    table_rows,
+    ticker_set,
+)
+from stock_screener.a2a_server.task_store import SQLiteTaskStore
 from stock_screener.a2a_server.technical_analyst_agent import TechnicalAnalystAgent
+from stock_screener.indicators.tool import analyze_universe, compute_technical_indicators
+from stock_screener.utils.metrics import (
+    CACHE_REQUESTS,
+    FAILURES,
+    QUEUE_WAIT,
+    SESSION_LATENCY,
+    TASK_LATENCY,
+)
+from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.tracing import TRACER, extract_trace_context
+
+
+TERMINAL_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
 
+# (artifact name, parts, last chunk) of a streamed artifact
+ArtifactChunk = tuple[str, list[Part], bool]
 
 class TechAnalystAgentExecutor(AgentExecutor):
     """Executor class for the Technical Analyst Agent"""
 
-    def __init__(self):
+    def __init__(
+            self,
+            streaming: bool = True,
+            session_service: BaseSessionService | None = None,
+            shard_size: int = ENV.a2a_server.get("SHARD_SIZE", 5),
+            max_concurrent_shards: int = ENV.a2a_server.get("MAX_CONCURRENT_SHARDS", 4),
+            fast_path: bool = ENV.a2a_server.get("FAST_PATH", True),
+            coalesce: bool = ENV.a2a_server.get("COALESCE", True),
+            task_store: SQLiteTaskStore | None = None,
+            cancel_poll_seconds: float = ENV.a2a_server.get("CANCEL_POLL_SECONDS", 1),
+            signals_artifact: bool = ENV.a2a_server.get("SIGNALS_ARTIFACT", False),
+            warmup_retry_seconds: float = ENV.a2a_server.get("WARMUP_RETRY_SECONDS", 1),
+            warmup_max_retry_seconds: float = ENV.a2a_server.get("WARMUP_MAX_RETRY_SECONDS", 60),
+        ):
 
         self.agent = None
         self.runner = None
+        self.streaming = streaming
+        self.session_service = session_service
+        self.shard_size = shard_size
+        self.max_concurrent_shards = max_concurrent_shards
+        self.fast_path = fast_path
+        self.coalesce = coalesce
+        # Tool results as a separate artifact, which non-streaming callers
+        # such as the host agent would pay for in prompt tokens
+        self.signals_artifact = signals_artifact
+        self.singleflight = SingleFlight()
+        self.ready = False
+        self.warmup_error = None
+        self.warmup_retry_seconds = warmup_retry_seconds
+        self.warmup_max_retry_seconds = warmup_max_retry_seconds
+        self._init_lock = asyncio.Lock()
+        # Running execute() calls by task id, so they can be canceled
+        self._running_tasks: dict[str, asyncio.Task] = {}
+        # Set when several workers share the task store, whose cancel
+        # requests can reach a worker that does not run the task
+        self.task_store = task_store
+        self.cancel_poll_seconds = cancel_poll_seconds
+        self._cancel_watch: asyncio.Task | None = None
 
         print("Initialized agent.")
 
     def _init_agent(self):
 
-        agent_obj = TechnicalAnalystAgent()
+        agent_obj = TechnicalAnalystAgent(session_service=self.session_service)
 
         self.agent = agent_obj._agent
         self.runner = agent_obj._runner
         self.status_message = "Processing request..."
         self.artifact_name = "response"
+        self.signals_artifact_name = "signals"
+
+    async def _ensure_agent(self):
+        """Build the agent exactly once, even when the first requests arrive together."""
+
+        if self.agent:
+            return
+
+        with QUEUE_WAIT.time(stage="agent_init"):
+            async with self._init_lock:
+                if not self.agent:
+                    self._init_agent()
+
+    async def warm_up(self, prime_ticker: str | None = None):
+        """Build the agent, open its MCP sessions and list their tools before the first request.
+
+        Retries with exponential backoff, capped at warmup_max_retry_seconds,
+        until warm-up succeeds, e.g. once the MCP server is up.
+        """
+
+        delay = self.warmup_retry_seconds
+        while True:
+            try:
+                await self._warm_up_once(prime_ticker)
+                return
+            except Exception as e:
+                self.warmup_error = str(e)
+                print(f"ERROR: Warm-up failed, retrying in {delay:g}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.warmup_max_retry_seconds)
+
+    async def _warm_up_once(self, prime_ticker: str | None) -> None:
+        await self._ensure_agent()
+
+        for tool in self.agent.tools:
+            if isinstance(tool, BaseToolset):
+                tools = await tool.get_tools()
+                print(f"Warm-up: listed {len(tools)} tools from {type(tool).__name__}.")
+
+        if prime_ticker:
+            # Loads the price store and indicator code paths without spending LLM tokens
+            await compute_technical_indicators([prime_ticker])
+            print(f"Warm-up: primed indicators with {prime_ticker}.")
+
+        self.ready = True
+        self.warmup_error = None
+        print("Warm-up finished.")
+
+    def service_stats(self) -> dict[str, dict[str, int]]:
+        """Return usage counters of request coalescing and the runner's session and artifact services."""
+
+        stats = {"coalescing": self.singleflight.stats}
+
+        if self.runner:
+            for name, service in [
+                ("sessions", self.runner.session_service),
+                ("artifacts", self.runner.artifact_service),
+            ]:
+                if hasattr(service, "stats"):
+                    stats[name] = service.stats
+
+        return stats
 
     async def cancel(
         self,
@@ -35,23 +179,420 @@ class TechAnalystAgentExecutor(AgentExecutor):
         event_queue: EventQueue,
     ) -> None:
         """Cancel the execution of a specific task."""
-        raise NotImplementedError(
-            'Cancellation is not implemented for ADKAgentExecutor.'
+
+        task = context.current_task
+        if task and task.status.state in TERMINAL_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+
+        # Cancelling the running execution interrupts the pending LLM request
+        # or MCP tool call, and execute() closes the ADK event generator and
+        # sends the canceled status. The cancel request's queue is tapped
+        # from the execution's queue, so it receives that status too.
+        running = self._running_tasks.get(context.task_id)
+        if running and not running.done():
+            running.cancel()
+            return
+
+        # Nothing runs the task in this worker, so the status is sent here
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.cancel(
+            new_agent_text_message(
+                'Task was canceled.', context.context_id, context.task_id
+            )
         )
 
+    async def _watch_cancellations(self):
+        """Stop running tasks that were canceled through another worker, while any are running."""
+
+        while self._running_tasks:
+            await asyncio.sleep(self.cancel_poll_seconds)
+            try:
+                canceled = await self.task_store.canceled(list(self._running_tasks))
+            except Exception as e:
+                print(f'WARNING: Failed to check for canceled tasks: {e}')
+                continue
+
+            for task_id in canceled:
+                running = self._running_tasks.get(task_id)
+                if running and not running.done():
+                    print(f'Task {task_id} was canceled through another worker.')
+                    running.cancel()
+
+        self._cancel_watch = None
+
+    async def _get_session(self, user_id: str, session_id: str):
+        """Return the ADK session for an A2A context, creating it if needed."""
+
+        with SESSION_LATENCY.time(operation="get"):
+            session = await self.runner.session_service.get_session(
+                app_name=self.runner.app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
+        if session:
+            return session
+
+        with SESSION_LATENCY.time(operation="create"):
+            return await self.runner.session_service.create_session(
+                app_name=self.runner.app_name,
+                user_id=user_id,
+                session_id=session_id,
+            )
+
+    async def _collect_response(self, query: str, user_id: str, session_id: str) -> str:
+        """Run the ADK agent to completion and return its final response text."""
+
+        content = genai_types.Content(role='user', parts=[genai_types.Part(text=query)])
+        session = await self._get_session(user_id, session_id)
+
+        response_text = ''
+        events_async = self.runner.run_async(
+            session_id=session.id, user_id=user_id, new_message=content
+        )
+
+        try:
+            async for event in events_async:
+                if event.is_final_response() and event.content and event.content.parts:
+                    response_text += ''.join(
+                        part.text + '\n' for part in event.content.parts
+                        if part.text and not part.thought
+                    )
+        finally:
+            await events_async.aclose()
+
+        return response_text
+
+    async def _record_turn(self, user_id: str, session_id: str, query: str, answer: str) -> None:
+        """Add a query and its answer to the session of a conversation, as an agent turn would."""
+
+        session = await self._get_session(user_id, session_id)
+        invocation_id = new_invocation_context_id()
+        for author, role, text in [('user', 'user', query), (self.agent.name, 'model', answer)]:
+            await self.runner.session_service.append_event(
+                session,
+                Event(
+                    invocation_id=invocation_id,
+                    author=author,
+                    content=genai_types.Content(role=role, parts=[genai_types.Part(text=text)]),
+                ),
+            )
+
+    async def _emit(self, chunks: AsyncIterator[ArtifactChunk], updater: TaskUpdater) -> str:
+        """Write artifact chunks to a task and return the text of its response artifact.
+
+        The last chunk of a text artifact streamed in several chunks replaces
+        them with one part holding the whole text, so the final task that
+        message/send returns has a single text part per artifact.
+        """
+
+        # Artifact ids are per task, so coalesced tasks get their own artifacts
+        artifact_ids: dict[str, str] = {}
+        # Text streamed so far by artifact, None once an artifact has other parts
+        texts: dict[str, list[str] | None] = {}
+
+        async for name, parts, last_chunk in chunks:
+            append = name in artifact_ids
+            if not append:
+                artifact_ids[name] = str(uuid.uuid4())
+                texts[name] = []
+
+            if texts[name] is not None:
+                if all(isinstance(part.root, TextPart) for part in parts):
+                    texts[name].extend(part.root.text for part in parts)
+                else:
+                    texts[name] = None
+            if append and last_chunk and texts[name] is not None:
+                parts = [Part(root=TextPart(text=''.join(texts[name])))]
+                append = False
+
+            await updater.add_artifact(
+                parts,
+                artifact_id=artifact_ids[name],
+                name=name,
+                append=append,
+                last_chunk=last_chunk,
+            )
+
+        return ''.join(texts.get(self.artifact_name) or [])
+
+    def _coalesce(
+            self,
+            key: tuple | None,
+            start: Callable[[], AsyncIterator[ArtifactChunk]],
+    ) -> AsyncIterator[ArtifactChunk]:
+        """Share the chunks of identical concurrent requests, unless coalescing is off or key is None."""
+
+        if not self.coalesce or key is None:
+            return start()
+
+        CACHE_REQUESTS.inc(
+            cache="coalescing", result="hit" if self.singleflight.in_flight(key) else "miss"
+        )
+        return self.singleflight.subscribe(key, start)
+
+    async def _sharded_chunks(
+            self,
+            tickers: list[str],
+            user_id: str,
+            context_id: str,
+    ) -> AsyncIterator[ArtifactChunk]:
+        """Screen tickers in concurrent shards and merge the results into one table artifact."""
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_shards)
+        # Concurrent screenings of one context have their own shard sessions,
+        # so each run only ever deletes the sessions it created
+        run_id = uuid.uuid4().hex
+
+        async def analyze(index: int, shard_tickers: list[str]) -> tuple[list[str], str]:
+            # Each shard runs in its own short-lived session
+            session_id = f'{context_id}-shard-{run_id}-{index}'
+            waiting_since = time.perf_counter()
+            async with semaphore:
+                QUEUE_WAIT.observe(time.perf_counter() - waiting_since, stage="shard_slot")
+                try:
+                    text = await self._collect_response(
+                        shard_query(shard_tickers), user_id, session_id
+                    )
+                except Exception as e:
+                    FAILURES.inc(component="shard")
+                    text = f'Error: {e!s}'
+                finally:
+                    with SESSION_LATENCY.time(operation="delete"):
+                        await self.runner.session_service.delete_session(
+                            app_name=self.runner.app_name,
+                            user_id=user_id,
+                            session_id=session_id,
+                        )
+            return shard_tickers, text
+
+        yield self.artifact_name, [Part(root=TextPart(text=table_header()))], False
+
+        shard_tasks = [
+            asyncio.create_task(analyze(index, shard_tickers))
+            for index, shard_tickers in enumerate(shard(tickers, self.shard_size))
+        ]
+
+        try:
+            # Rows are streamed as soon as each shard finishes
+            for next_result in asyncio.as_completed(shard_tasks):
+                shard_tickers, text = await next_result
+                yield (
+                    self.artifact_name,
+                    [Part(root=TextPart(text=table_rows(text, shard_tickers)))],
+                    False,
+                )
+        finally:
+            for shard_task in shard_tasks:
+                shard_task.cancel()
+
+        yield self.artifact_name, [Part(root=TextPart(text='\n'))], True
+
+    async def _fast_path_chunks(self, tickers: list[str]) -> AsyncIterator[ArtifactChunk]:
+        """Answer a canonical query with the local indicator engine, without an LLM turn.
+
+        The engine has its own signal rules and only uses completed sessions,
+        so its verdicts can differ from those of the MCP tools the agent uses.
+        The table says so. Yields nothing when no price data is available, so
+        the caller can fall back to the agent.
+        """
+
+        rows = await asyncio.to_thread(analyze_universe, tickers)
+        if not any(row['signal'] != 'no data' for row in rows):
+            CACHE_REQUESTS.inc(cache="fast_path", result="miss")
+            return
+
+        CACHE_REQUESTS.inc(cache="fast_path", result="hit")
+
+        table = render_signal_table(rows)
+        yield self.artifact_name, [Part(root=TextPart(text=f'{table}\n{ENGINE_SIGNAL_NOTE}\n'))], True
+
+    async def _batch_chunks(self, request: dict) -> AsyncIterator[ArtifactChunk]:
+        """Answer a structured batch request with a JSON artifact holding one row per ticker."""
+
+        rows = await asyncio.to_thread(
+            analyze_universe,
+            request['tickers'],
+            tuple(request['indicators']),
+            request['lookback'],
+        )
+
+        yield self.artifact_name, [Part(root=DataPart(data={'rows': rows}))], True
+
+    async def _agent_chunks(
+            self,
+            query: str,
+            user_id: str,
+            session_id: str,
+    ) -> AsyncIterator[ArtifactChunk]:
+        """Run the ADK agent and stream its output as artifact chunks."""
+
+        content = genai_types.Content(role='user', parts=[genai_types.Part(text=query)])
+        session = await self._get_session(user_id, session_id)
+
+        run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if self.streaming else StreamingMode.NONE
+        )
+
+        events_async = self.runner.run_async(
+            session_id=session.id,
+            user_id=user_id,
+            new_message=content,
+            run_config=run_config,
+        )
+
+        # Response text, and tool results when enabled, are sent as chunks of
+        # two artifacts, so streaming clients see output as soon as it is produced.
+        signals_started = False
+        # In SSE mode ADK yields the partial text deltas first and then one
+        # aggregated event with the same text, which must not be sent twice.
+        streamed_partial_text = False
+
+        try:
+            async for event in events_async:
+
+                if not event.content or not event.content.parts:
+                    continue
+
+                for function_response in (
+                    event.get_function_responses() if self.signals_artifact else []
+                ):
+                    response = function_response.response
+                    if not isinstance(response, dict):
+                        response = {'result': response}
+
+                    yield (
+                        self.signals_artifact_name,
+                        [Part(root=DataPart(
+                            data={'tool': function_response.name, 'response': response}
+                        ))],
+                        False,
+                    )
+                    signals_started = True
+
+                if event.partial:
+                    chunk = ''.join(
+                        part.text for part in event.content.parts
+                        if part.text and not part.thought
+                    )
+                    streamed_partial_text = streamed_partial_text or bool(chunk)
+                elif event.is_final_response():
+                    if streamed_partial_text:
+                        streamed_partial_text = False
+                        continue
+                    chunk = ''.join(
+                        part.text + '\n' for part in event.content.parts
+                        if part.text and not part.thought
+                    )
+                else:
+                    # Function calls are handled internally by ADK
+                    continue
+
+                if chunk:
+                    yield self.artifact_name, [Part(root=TextPart(text=chunk))], False
+        finally:
+            # Runs on cancellation too, so ADK stops the invocation and
+            # releases any in-flight tool call
+            await events_async.aclose()
+
+        # Close the streamed artifacts
+        if signals_started:
+            yield self.signals_artifact_name, [Part(root=DataPart(data={}))], True
+
+        yield self.artifact_name, [Part(root=TextPart(text='\n'))], True
+
+    async def _respond(
+            self,
+            context: RequestContext,
+            user_id: str,
+            context_id: str,
+            updater: TaskUpdater,
+    ) -> str:
+        """Route a request to the batch API, the fast path, the sharded screener or the agent.
+
+        Concurrent requests with the same tickers share one computation.
+        Agent turns are never shared, since they add to the session of their
+        own conversation. The fast path and sharded answers are added to that
+        session too, so follow-up questions can refer to them. Returns the
+        name of the route.
+        """
+
+        batch_request = parse_batch_request(context.message)
+        if batch_request is not None:
+            key = (
+                'batch',
+                ticker_set(batch_request['tickers']),
+                tuple(sorted(batch_request['indicators'])),
+                batch_request['lookback'],
+            )
+            await self._emit(
+                self._coalesce(key, lambda: self._batch_chunks(batch_request)), updater
+            )
+            return 'batch'
+
+        query = context.get_user_input()
+
+        if self.fast_path:
+            canonical_tickers = classify_query(query)
+            answer = ''
+            if canonical_tickers:
+                answer = await self._emit(
+                    self._coalesce(
+                        ('fast_path', ticker_set(canonical_tickers)),
+                        lambda: self._fast_path_chunks(canonical_tickers),
+                    ),
+                    updater,
+                )
+            if answer:
+                await self._record_turn(user_id, context_id, query, answer)
+                return 'fast_path'
+
+        tickers = parse_screening_request(query)
+        if len(tickers) > self.shard_size:
+            answer = await self._emit(
+                self._coalesce(
+                    ('sharded', ticker_set(tickers)),
+                    lambda: self._sharded_chunks(tickers, user_id, context_id),
+                ),
+                updater,
+            )
+            await self._record_turn(user_id, context_id, query, answer)
+            return 'sharded'
+
+        await self._emit(self._agent_chunks(query, user_id, context_id), updater)
+        return 'agent'
+
     async def execute(
-            self, 
+            self,
             context: RequestContext,
             event_queue: EventQueue
     ) -> None:
         """Execute the agent executor"""
 
-        if not self.agent:
-            self._init_agent()
+        # Continue the trace of the calling agent, sent in the message metadata
+        with TRACER.start_as_current_span(
+            'a2a.execute',
+            context=extract_trace_context(context.message.metadata if context.message else None),
+            attributes={'a2a.task_id': context.task_id or '', 'a2a.context_id': context.context_id or ''},
+        ) as span:
+            await self._execute(context, event_queue, span)
+
+    async def _execute(
+            self,
+            context: RequestContext,
+            event_queue: EventQueue,
+            span: trace.Span,
+    ) -> None:
+        """Run a task and record its latency by route and final status."""
+
+        started = time.perf_counter()
+        # Set once the request has been routed, failures before that have no route
+        route = 'none'
+        status = TaskState.failed
+
+        await self._ensure_agent()
 
-        query = context.get_user_input()
         task = context.current_task or new_task(context.message)
-        
+
         await event_queue.enqueue_event(task)
 
         updater = TaskUpdater(event_queue, task.id, task.context_id)
@@ -61,6 +602,10 @@ class TechAnalystAgentExecutor(AgentExecutor):
         else:
             user_id = 'a2a_user'
 
+        self._running_tasks[task.id] = asyncio.current_task()
+        if self.task_store is not None and self._cancel_watch is None:
+            self._cancel_watch = asyncio.create_task(self._watch_cancellations())
+
         try:
             # Update status with custom message
             await updater.update_status(
@@ -70,47 +615,25 @@ class TechAnalystAgentExecutor(AgentExecutor):
                 ),
             )
 
-            content = genai_types.Content(role='user', parts=[genai_types.Part(text=query)])
-            session = await self.runner.session_service.get_session(
-                app_name=self.runner.app_name,
-                user_id=user_id,
-                session_id=task.context_id,
-            ) or await self.runner.session_service.create_session(
-                app_name=self.runner.app_name,
-                user_id=user_id,
-                session_id=task.context_id,
-            )
-
-            response_text = ''
-
-            events_async = self.runner.run_async(
-                session_id=session.id, user_id=user_id, new_message=content
-            )
+            route = await self._respond(context, user_id, task.context_id, updater)
+            span.set_attribute('a2a.route', route)
 
-            async for event in events_async:
-                
-                if (
-                        event.is_final_response()
-                        and event.content
-                        and event.content.parts
-                    ):
-                      
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_text += part.text + '\n'
-                            elif hasattr(part, 'function_call'):
-                                # Log or handle function calls if needed
-                                pass  # Function calls are handled internally by ADK
-
-            # Add response as artifact with custom name
-            await updater.add_artifact(
-                [Part(root=TextPart(text=response_text))],
-                name=self.artifact_name,
-            )
-            
             await updater.complete()
+            status = TaskState.completed
+
+        except asyncio.CancelledError:
+            status = TaskState.canceled
+            print(f'Task {task.id} was canceled.')
+            with contextlib.suppress(RuntimeError):
+                await updater.cancel(
+                    new_agent_text_message(
+                        'Task was canceled.', task.context_id, task.id
+                    )
+                )
+            raise
 
         except Exception as e:
+            FAILURES.inc(component="task")
             await updater.update_status(
                 TaskState.failed,
                 new_agent_text_message(
@@ -118,4 +641,7 @@ class TechAnalystAgentExecutor(AgentExecutor):
                 ),
                 final=True,
             )
-            
\ No newline at end of file
+
+        finally:
+            self._running_tasks.pop(task.id, None)
+            TASK_LATENCY.observe(time.perf_counter() - started, route=route, status=status.value)
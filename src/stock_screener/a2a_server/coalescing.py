@@ -0,0 +1,113 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Hashable
+from typing import Any
+
+
+class SharedRun:
+    """One running computation whose output is replayed to every subscriber.
+
+    The computation runs in its own asyncio task, so a subscriber that goes
+    away does not interrupt the others. It is canceled once the last
+    subscriber has left.
+    """
+
+    def __init__(self, items: AsyncIterator[Any]):
+        self._items: list[Any] = []
+        self._error: BaseException | None = None
+        self._finished = False
+        self._changed = asyncio.Condition()
+        self._subscribers = 0
+        # Set when the last subscriber left, the run may still be finishing
+        self.canceled = False
+        self._task = asyncio.create_task(self._consume(items))
+
+    @property
+    def done(self) -> bool:
+        return self._task.done()
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        self._task.add_done_callback(lambda _: callback())
+
+    async def _consume(self, items: AsyncIterator[Any]) -> None:
+        try:
+            async for item in items:
+                async with self._changed:
+                    self._items.append(item)
+                    self._changed.notify_all()
+        except BaseException as e:
+            self._error = e
+        finally:
+            # Lets the computation release its resources when it was canceled
+            await items.aclose()
+            async with self._changed:
+                self._finished = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        """Yield every item of the computation, from the first one on."""
+        self._subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: index < len(self._items) or self._finished
+                    )
+                    new_items = self._items[index:]
+                    finished = self._finished
+
+                for item in new_items:
+                    yield item
+                index += len(new_items)
+
+                if finished and index == len(self._items):
+                    if self._error is not None:
+                        raise self._error
+                    return
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._task.done():
+                self.canceled = True
+                self._task.cancel()
+
+
+class SingleFlight:
+    """Coalesces concurrent computations with the same key into one shared run.
+
+    Only computations that are in flight are shared: once a run has finished
+    or been canceled, the next request with the same key starts a new one.
+    """
+
+    def __init__(self):
+        self._runs: dict[Hashable, SharedRun] = {}
+        self.counters = {"started": 0, "coalesced": 0}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return how many runs were started and how many requests joined a running one."""
+        return {**self.counters, "in_flight": len(self._runs)}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Return whether a run for `key` is in flight and can be joined."""
+        run = self._runs.get(key)
+        return run is not None and not run.done and not run.canceled
+
+    def subscribe(
+            self,
+            key: Hashable,
+            start: Callable[[], AsyncIterator[Any]],
+        ) -> AsyncIterator[Any]:
+        """Join the in-flight run for `key`, or start one with `start()`."""
+        run = self._runs.get(key)
+        if not self.in_flight(key):
+            run = SharedRun(start())
+            self._runs[key] = run
+            run.add_done_callback(lambda: self._forget(key, run))
+            self.counters["started"] += 1
+        else:
+            self.counters["coalesced"] += 1
+        return run.subscribe()
+
+    def _forget(self, key: Hashable, run: SharedRun) -> None:
+        if self._runs.get(key) is run:
+            del self._runs[key]
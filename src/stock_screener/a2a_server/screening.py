@@ -0,0 +1,203 @@
+import re
+
+from a2a.types import DataPart, Message
+
+from stock_screener.indicators.engine import INDICATORS
+from stock_screener.utils.read_env_vars import ENV
+
+
+TICKER_PATTERN = re.compile(r"^[A-Z]{1,5}(?:[.-][A-Z]{1,2})?$")
+
+# "Perform technical analysis on: TSLA, INTC, GOOGL, META."
+SCREENING_PATTERN = re.compile(
+    r"technical\s+analysis\s+(?:on|for)(?:\s+stocks?)?\s*:\s*(?P<tickers>.+)$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Single-ticker phrasings from the agent card's skill examples
+SINGLE_TICKER_PATTERNS = [
+    re.compile(r"^run technical analysis (?:for|on) (?:the )?(?:stock )?(?P<ticker>\S+?)[.!]?$", re.IGNORECASE),
+    re.compile(r"^is (?:the )?(?:stock )?(?P<ticker>\S+) bullish or bearish(?: right now)?\??$", re.IGNORECASE),
+    re.compile(r"^what are the technical signals(?: like)? for (?:the )?(?:stock )?(?P<ticker>\S+?)\??$", re.IGNORECASE),
+]
+
+SHARD_TABLE_COLUMNS = ["Ticker", "Signal", "Key indicators"]
+
+SIGNAL_TABLE_COLUMNS = [
+    ("Ticker", "ticker"),
+    ("Signal", "signal"),
+    ("Close", "close"),
+    ("RSI 14", "rsi_14"),
+    ("MACD hist", "macd_hist"),
+    ("SMA 50", "sma_50"),
+    ("SMA 200", "sma_200"),
+]
+
+
+def parse_ticker_list(text: str) -> list[str]:
+    """Split a comma or whitespace separated list into unique ticker symbols.
+
+    Returns an empty list if any token is not an upper-case ticker symbol, so
+    free-form text is never mistaken for a ticker list.
+    """
+    tickers = []
+    for token in re.split(r"[,\s]+", text.strip().rstrip(".")):
+        if not token or token.lower() in ("and", "&"):
+            continue
+        if not TICKER_PATTERN.match(token):
+            return []
+        if token not in tickers:
+            tickers.append(token)
+    return tickers
+
+
+def parse_screening_request(query: str) -> list[str]:
+    """Return the tickers of a "technical analysis on: ..." request, or an empty list."""
+    match = SCREENING_PATTERN.search(query.strip())
+    if not match:
+        return []
+    return parse_ticker_list(match.group("tickers"))
+
+
+def classify_query(query: str) -> list[str]:
+    """Return the tickers of a query that matches a known skill template, or an empty list."""
+    query = " ".join(query.split())
+    for pattern in SINGLE_TICKER_PATTERNS:
+        match = pattern.match(query)
+        if match:
+            return parse_ticker_list(match.group("ticker"))
+    return parse_screening_request(query)
+
+
+def parse_batch_request(
+        message: Message | None,
+        max_tickers: int = ENV.a2a_server.get("MAX_BATCH_TICKERS", 500),
+    ) -> dict | None:
+    """Return the structured batch request of a message, or None if it has none.
+
+    A batch request is a JSON data part such as
+    {"tickers": ["TSLA", "INTC"], "indicators": ["rsi_14", "macd"], "lookback": 300},
+    where only "tickers" is required. Tickers are upper-cased and deduplicated,
+    and at most `max_tickers` are accepted.
+
+    Raises:
+        ValueError: If the payload is not a valid batch request.
+    """
+    if message is None:
+        return None
+
+    data = next(
+        (part.root.data for part in message.parts
+         if isinstance(part.root, DataPart) and "tickers" in part.root.data),
+        None,
+    )
+    if data is None:
+        return None
+
+    tickers = data["tickers"]
+    if not isinstance(tickers, list) or not all(isinstance(ticker, str) for ticker in tickers):
+        raise ValueError("'tickers' must be a list of ticker symbols")
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+    invalid = [ticker for ticker in tickers if not TICKER_PATTERN.match(ticker)]
+    if invalid:
+        raise ValueError(f"Invalid ticker symbols: {invalid[:10]}")
+    if len(tickers) > max_tickers:
+        raise ValueError(f"At most {max_tickers} tickers can be requested at once, got {len(tickers)}")
+
+    indicators = data.get("indicators") or list(INDICATORS)
+    if not isinstance(indicators, list):
+        raise ValueError("'indicators' must be a list of indicator names")
+    unknown = sorted(set(indicators) - set(INDICATORS))
+    if unknown:
+        raise ValueError(f"Unknown indicators: {unknown}, expected any of {list(INDICATORS)}")
+
+    lookback = data.get("lookback", 300)
+    if not isinstance(lookback, int) or isinstance(lookback, bool) or lookback <= 0:
+        raise ValueError("'lookback' must be a positive number of trading days")
+
+    return {"tickers": tickers, "indicators": indicators, "lookback": lookback}
+
+
+def ticker_set(tickers: list[str]) -> tuple[str, ...]:
+    """Return tickers as a sorted tuple of unique upper-case symbols, for use as a key."""
+    return tuple(sorted({ticker.strip().upper() for ticker in tickers if ticker.strip()}))
+
+
+# Explains fast path answers, whose signals can differ from those of the agent's MCP tools
+ENGINE_SIGNAL_NOTE = (
+    "Signals from the local indicator engine, on daily prices up to the last completed "
+    "session: price vs SMA 50, SMA 50 vs SMA 200, MACD histogram and RSI 14 vs 50 each "
+    "vote bullish or bearish, and a net of two votes decides."
+)
+
+
+def render_signal_table(rows: list[dict]) -> str:
+    """Render indicator rows as a markdown table."""
+    def cell(value) -> str:
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return f"{value:,.2f}"
+        return str(value)
+
+    lines = [
+        "| " + " | ".join(title for title, _ in SIGNAL_TABLE_COLUMNS) + " |",
+        "|" + "---|" * len(SIGNAL_TABLE_COLUMNS),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(cell(row.get(key)) for _, key in SIGNAL_TABLE_COLUMNS) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def shard(tickers: list[str], shard_size: int) -> list[list[str]]:
+    """Split tickers into consecutive shards of at most `shard_size`."""
+    return [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+
+
+def shard_query(tickers: list[str]) -> str:
+    """Build the screening prompt for one shard, asking for a table that can be merged."""
+    return (
+        f"Perform technical analysis on: {', '.join(tickers)}. "
+        f"Respond only with a markdown table with the columns "
+        f"{', '.join(SHARD_TABLE_COLUMNS)} and one row per ticker."
+    )
+
+
+def split_markdown_table(text: str) -> tuple[list[str], list[str], list[str]]:
+    """Split a response into table header lines, table rows and the remaining text."""
+    header, rows, other = [], [], []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            if stripped:
+                other.append(stripped)
+            continue
+        if not header:
+            header.append(stripped)
+        elif len(header) == 1 and set(stripped) <= set("|-: "):
+            header.append(stripped)
+        else:
+            rows.append(stripped)
+    return header, rows, other
+
+
+def table_header() -> str:
+    """Return the header of the merged screening table."""
+    return (
+        "| " + " | ".join(SHARD_TABLE_COLUMNS) + " |\n"
+        + "|" + "---|" * len(SHARD_TABLE_COLUMNS) + "\n"
+    )
+
+
+def table_rows(text: str, tickers: list[str]) -> str:
+    """Return the rows a shard contributes to the merged table.
+
+    Shards that did not answer with a table contribute one row per ticker
+    holding their text, so no ticker is silently dropped.
+    """
+    _, rows, other = split_markdown_table(text)
+    if rows:
+        return "".join(row + "\n" for row in rows)
+
+    summary = " ".join(other).replace("|", "/") or "No result"
+    return "".join(f"| {ticker} | - | {summary} |\n" for ticker in tickers)
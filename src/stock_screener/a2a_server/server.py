@@ -1,22 +1,68 @@
+import asyncio
+import contextlib
+
 import uvicorn
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
+from google.adk.sessions import BaseSessionService, DatabaseSessionService
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
 from stock_screener.a2a_server.agent_card import public_agent_card
 from stock_screener.a2a_server.agent_executor import TechAnalystAgentExecutor
+from stock_screener.a2a_server.task_store import SQLiteTaskStore
+from stock_screener.utils.mcp_pool import close_session_pools
+from stock_screener.utils.metrics import CONTENT_TYPE, render_metrics
 
+from stock_screener.utils.paths import DATA_DIR
 from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.tracing import setup_tracing
 
 
 ENV.export_google_api_key()
 
-def main():
+SESSION_DB_URL = f"sqlite:///{DATA_DIR / 'adk_sessions.db'}"
+
+
+def _num_workers() -> int:
+    return int(ENV.a2a_server.get("WORKERS", 1))
+
+
+def _build_session_service() -> BaseSessionService | None:
+    """Return a session service shared by all workers, or None to keep sessions in memory."""
+    if _num_workers() <= 1:
+        return None
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    session_service = DatabaseSessionService(
+        db_url=SESSION_DB_URL, connect_args={"timeout": 30}
+    )
+    # WAL lets the workers read sessions while another one writes
+    with session_service.db_engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    return session_service
+
+
+def create_app() -> Starlette:
+    """Build the A2A application. Each uvicorn worker calls this once."""
+
+    setup_tracing("technical-analyst-agent")
+
+    task_store = SQLiteTaskStore(
+        ttl_seconds=ENV.a2a_server.get("TASK_TTL_HOURS", 168) * 3600,
+    )
+
+    agent_executor = TechAnalystAgentExecutor(
+        session_service=_build_session_service(),
+        # Lets a worker stop its tasks when they are canceled through another one
+        task_store=task_store if _num_workers() > 1 else None,
+    )
 
     request_handler = DefaultRequestHandler(
-        agent_executor=TechAnalystAgentExecutor(),
-        task_store=InMemoryTaskStore(),
+        agent_executor=agent_executor,
+        task_store=task_store,
     )
 
     server = A2AStarletteApplication(
@@ -25,10 +71,57 @@ def main():
         extended_agent_card=public_agent_card,
     )
 
-    uvicorn.run(server.build(), host='0.0.0.0', port=9999)
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        # Warm up in the background so the readiness endpoint can report progress
+        warmup_task = asyncio.create_task(
+            agent_executor.warm_up(ENV.a2a_server.get("WARMUP_TICKER") or None)
+        )
+        yield
+        warmup_task.cancel()
+        # Write any batched task updates before exiting
+        await task_store.close()
+        await close_session_pools()
+
+    async def readiness(request: Request) -> JSONResponse:
+        """Report whether the agent has finished warming up."""
+        return JSONResponse(
+            {"ready": agent_executor.ready, "error": agent_executor.warmup_error},
+            status_code=200 if agent_executor.ready else 503,
+        )
+
+    async def stats(request: Request) -> JSONResponse:
+        """Report session and artifact service usage and eviction counters."""
+        return JSONResponse(agent_executor.service_stats())
+
+    async def metrics(request: Request) -> Response:
+        """Export latency histograms and counters in the Prometheus text format."""
+        return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+    app = server.build(lifespan=lifespan)
+    app.add_route("/ready", readiness, methods=["GET"])
+    app.add_route("/stats", stats, methods=["GET"])
+    app.add_route("/metrics", metrics, methods=["GET"])
+    return app
+
+
+def main():
+
+    workers = _num_workers()
+
+    if workers > 1:
+        # Create the shared session tables once, before the workers race to do it
+        _build_session_service()
+
+    uvicorn.run(
+        "stock_screener.a2a_server.server:create_app",
+        factory=True,
+        host='0.0.0.0',
+        port=9999,
+        workers=workers,
+    )
 
 
 if __name__ == "__main__":
 
     main()
-
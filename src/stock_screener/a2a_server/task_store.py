@@ -0,0 +1,217 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+from stock_screener.utils.paths import DATA_DIR
+
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite-backed task store shared by all server workers on one host.
+
+    The database runs in WAL mode so several processes can read while one
+    writes. Intermediate status updates are buffered and written in batches,
+    final states are written immediately, and tasks that have not been
+    updated within the TTL are evicted. Final states are never overwritten,
+    so a task canceled through one worker stays canceled when the worker
+    running it saves its result later.
+
+    Buffered tasks are kept by reference and only serialized when a batch is
+    written, so streaming many artifact chunks costs one write per batch
+    rather than one copy of the whole task per chunk.
+    """
+
+    FINAL_STATES = {
+        TaskState.completed,
+        TaskState.canceled,
+        TaskState.failed,
+        TaskState.rejected,
+    }
+    _FINAL_STATES_SQL = ", ".join(f"'{state.value}'" for state in FINAL_STATES)
+    # States that end or pause a task are written through immediately
+    WRITE_THROUGH_STATES = FINAL_STATES | {
+        TaskState.input_required,
+        TaskState.auth_required,
+    }
+
+    def __init__(
+            self,
+            db_path: Union[str, Path] = DATA_DIR / "a2a_tasks.db",
+            ttl_seconds: float = 7 * 24 * 3600,
+            batch_size: int = 64,
+            flush_interval: float = 0.25,
+            eviction_interval: float = 600,
+        ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.eviction_interval = eviction_interval
+
+        self._pending: dict[str, tuple[Task, float]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._last_eviction = 0.0
+        self._db_lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                context_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_context_id ON tasks (context_id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at);
+            """
+        )
+
+    @staticmethod
+    def _rows(updates: list[tuple[Task, float]]) -> list[tuple]:
+        return [
+            (task.id, task.context_id, task.status.state.value, task.model_dump_json(exclude_none=True), saved_at)
+            for task, saved_at in updates
+        ]
+
+    def _write(self, rows: list[tuple]) -> None:
+        """Upsert the task rows in a single transaction."""
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"""
+                    INSERT INTO tasks (task_id, context_id, state, data, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (task_id) DO UPDATE SET
+                        context_id = excluded.context_id,
+                        state = excluded.state,
+                        data = excluded.data,
+                        updated_at = excluded.updated_at
+                    WHERE excluded.updated_at >= tasks.updated_at
+                        AND tasks.state NOT IN ({self._FINAL_STATES_SQL})
+                    """,
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _read(self, task_id: str) -> Task | None:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT data FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return Task.model_validate_json(row[0]) if row else None
+
+    def _read_context(self, context_id: str) -> list[Task]:
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT data FROM tasks WHERE context_id = ? ORDER BY updated_at", (context_id,)
+            ).fetchall()
+        return [Task.model_validate_json(row[0]) for row in rows]
+
+    def _read_canceled(self, task_ids: list[str]) -> set[str]:
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT task_id FROM tasks WHERE state = ? AND task_id IN ({', '.join('?' * len(task_ids))})",
+                (TaskState.canceled.value, *task_ids),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _remove(self, task_id: str) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def _evict(self, cutoff: float) -> int:
+        with self._db_lock:
+            return self._conn.execute("DELETE FROM tasks WHERE updated_at < ?", (cutoff,)).rowcount
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered task updates to the database."""
+        if not self._pending:
+            return
+
+        updates = dict(self._pending)
+        # Serialized here, since the event loop keeps updating buffered tasks
+        await asyncio.to_thread(self._write, self._rows(list(updates.values())))
+
+        # Keep updates that arrived while writing for the next batch
+        for task_id, update in updates.items():
+            if self._pending.get(task_id) is update:
+                del self._pending[task_id]
+
+        if time.time() - self._last_eviction > self.eviction_interval:
+            await self.evict_expired()
+
+    async def evict_expired(self) -> int:
+        """Delete tasks that were not updated within the TTL and return how many were removed."""
+        self._last_eviction = time.time()
+        return await asyncio.to_thread(self._evict, self._last_eviction - self.ttl_seconds)
+
+    async def save(self, task: Task) -> None:
+        """Saves or updates a task, batching intermediate status updates."""
+        # Rows carry the save time, so a batch that lands late never
+        # overwrites a newer write-through update
+        saved_at = time.time()
+        if task.status.state in self.WRITE_THROUGH_STATES:
+            self._pending.pop(task.id, None)
+            await asyncio.to_thread(self._write, self._rows([(task, saved_at)]))
+            return
+
+        # Only the latest update of a task needs to be written. The task
+        # manager saves the same task object after every event, so keeping a
+        # reference is enough.
+        self._pending[task.id] = (task, saved_at)
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def get(self, task_id: str) -> Task | None:
+        """Retrieves a task by ID, including updates that are not flushed yet."""
+        if task_id in self._pending:
+            return self._pending[task_id][0].model_copy(deep=True)
+        return await asyncio.to_thread(self._read, task_id)
+
+    async def get_by_context(self, context_id: str) -> list[Task]:
+        """Retrieves all stored tasks of a context, oldest first."""
+        await self.flush()
+        return await asyncio.to_thread(self._read_context, context_id)
+
+    async def canceled(self, task_ids: list[str]) -> set[str]:
+        """Returns which of the tasks are canceled in the database, e.g. through another worker."""
+        if not task_ids:
+            return set()
+        return await asyncio.to_thread(self._read_canceled, task_ids)
+
+    async def delete(self, task_id: str) -> None:
+        """Deletes a task by ID."""
+        self._pending.pop(task_id, None)
+        await asyncio.to_thread(self._remove, task_id)
+
+    async def close(self) -> None:
+        """Flush buffered updates and close the database connection."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        with self._db_lock:
+            self._conn.close()
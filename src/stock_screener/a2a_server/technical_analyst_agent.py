@@ -1,13 +1,16 @@
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
+from google.adk.sessions import BaseSessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.runners import Runner
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
 from google.genai import types
 
+from stock_screener.indicators.tool import compute_technical_indicators
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin
+from stock_screener.utils.mcp_toolsets import CachedMCPToolset
+from stock_screener.utils.metrics import MetricsPlugin
 from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.runners import ScopedRunner
+from stock_screener.utils.session_services import BoundedArtifactService, BoundedSessionService
 
 
 class TechnicalAnalystAgent:
@@ -15,17 +18,22 @@ class TechnicalAnalystAgent:
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain", "application/json"]
 
-    def __init__(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")):
+    def __init__(
+            self,
+            mcp_url: str = ENV.mcp_urls.get("YFINANCE"),
+            session_service: BaseSessionService | None = None,
+        ):
         """Initialize the Stock Screener Agent with necessary tools."""
 
         self._agent = self._build_agent(mcp_url)
         self._user_id = "user_1"
-        self._runner = Runner(
+        self._runner = ScopedRunner(
             app_name=self._agent.name,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService()
+            artifact_service=BoundedArtifactService(),
+            session_service=session_service or BoundedSessionService(),
+            memory_service=InMemoryMemoryService(),
+            plugins=[MetricsPlugin(), MCPBatchingPlugin()],
         )
 
 
@@ -39,17 +47,19 @@ class TechnicalAnalystAgent:
             description="Main agent for stock screening based on technical indicator.",
             instruction="""You are a financial analyst. 
             Use the tools provided to answer stock-related queries and perform technical analysis. 
+            When analyzing or screening several stocks, call compute_technical_indicators once 
+            with all the ticker symbols instead of calling a tool per ticker.
             Use tabular format wherever possible.""",
             model="gemini-2.5-flash",
-            tools=[toolset]
+            tools=[toolset, compute_technical_indicators]
         )
         return agent
     
 
-    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> MCPToolset:
+    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> CachedMCPToolset:
         """Return the tools available in the agent."""
         
-        toolset = MCPToolset(
+        toolset = CachedMCPToolset(
             connection_params=StreamableHTTPServerParams(url=mcp_url),
             tool_filter=[
                 "get_technical_signals",
@@ -0,0 +1,193 @@
+import contextlib
+import fcntl
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from stock_screener.utils.paths import OHLCV_DIR
+
+
+@dataclass
+class PriceHistory:
+    """Daily OHLCV prices for a universe, as (tickers, days) matrices."""
+
+    tickers: list[str]
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+class OHLCVStore:
+    """Append-only, memory-mapped columnar store of daily OHLCV prices.
+
+    Each ticker is a directory holding one raw binary file per column. Reads
+    memory-map the files, so slicing a date range does not copy any data.
+    Appends hold an exclusive lock on the ticker, so threads and processes
+    refreshing the same ticker at once do not write its rows twice.
+    """
+
+    COLUMNS = {
+        "date": np.dtype("datetime64[D]"),
+        "open": np.dtype(np.float64),
+        "high": np.dtype(np.float64),
+        "low": np.dtype(np.float64),
+        "close": np.dtype(np.float64),
+        "volume": np.dtype(np.float64),
+    }
+    PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, root: Union[str, Path] = OHLCV_DIR):
+        self.root = Path(root)
+
+    def _column_path(self, ticker: str, column: str) -> Path:
+        return self.root / ticker.upper() / f"{column}.bin"
+
+    @contextlib.contextmanager
+    def _locked(self, ticker: str):
+        """Hold an exclusive lock on a ticker's files."""
+        ticker_dir = self.root / ticker.upper()
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        with open(ticker_dir / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def tickers(self) -> list[str]:
+        """Return all tickers that have stored prices."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            path.name for path in self.root.iterdir() if (path / "date.bin").exists()
+        )
+
+    def __len__(self) -> int:
+        return len(self.tickers())
+
+    def num_rows(self, ticker: str) -> int:
+        """Return the number of complete rows stored for a ticker."""
+        sizes = []
+        for column, dtype in self.COLUMNS.items():
+            path = self._column_path(ticker, column)
+            if not path.exists():
+                return 0
+            sizes.append(path.stat().st_size // dtype.itemsize)
+        # A crash during an append can leave some columns longer than others,
+        # only rows present in every column count.
+        return min(sizes)
+
+    def read(
+            self,
+            ticker: str,
+            start: Union[str, np.datetime64, None] = None,
+            end: Union[str, np.datetime64, None] = None,
+        ) -> dict[str, np.ndarray]:
+        """Return read-only memory-mapped columns for a ticker, sliced to [start, end]."""
+        rows = self.num_rows(ticker)
+        if rows == 0:
+            return {column: np.empty(0, dtype=dtype) for column, dtype in self.COLUMNS.items()}
+
+        columns = {
+            column: np.memmap(self._column_path(ticker, column), dtype=dtype, mode="r", shape=(rows,))
+            for column, dtype in self.COLUMNS.items()
+        }
+
+        dates = columns["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = rows if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return {column: values[lo:hi] for column, values in columns.items()}
+
+    def last_date(self, ticker: str) -> np.datetime64 | None:
+        """Return the most recent stored date for a ticker."""
+        rows = self.num_rows(ticker)
+        if rows == 0:
+            return None
+        return self.read(ticker)["date"][-1]
+
+    def last_check(self, ticker: str) -> tuple[np.datetime64, float] | None:
+        """Return the last session a refresh found no prices for, and when it looked."""
+        path = self.root / ticker.upper() / "checked"
+        try:
+            return np.datetime64(path.read_text().strip(), "D"), path.stat().st_mtime
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def mark_checked(self, ticker: str, session: np.datetime64) -> None:
+        """Record that a refresh found no prices for `session`, so it is not downloaded again soon."""
+        ticker_dir = self.root / ticker.upper()
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        (ticker_dir / "checked").write_text(str(np.datetime64(session, "D")))
+
+    def append(
+            self,
+            ticker: str,
+            dates: np.ndarray,
+            opens: np.ndarray,
+            highs: np.ndarray,
+            lows: np.ndarray,
+            closes: np.ndarray,
+            volumes: np.ndarray,
+        ) -> int:
+        """Append rows newer than the last stored date and return how many were written."""
+        new_columns = {
+            "date": np.asarray(dates, dtype="datetime64[D]"),
+            "open": np.asarray(opens, dtype=np.float64),
+            "high": np.asarray(highs, dtype=np.float64),
+            "low": np.asarray(lows, dtype=np.float64),
+            "close": np.asarray(closes, dtype=np.float64),
+            "volume": np.asarray(volumes, dtype=np.float64),
+        }
+
+        order = np.argsort(new_columns["date"], kind="stable")
+        keep = order[~np.isnan(new_columns["close"][order])]
+        # Drop duplicate dates within the new batch
+        _, first = np.unique(new_columns["date"][keep], return_index=True)
+        keep = keep[np.sort(first)]
+
+        if len(keep) == 0:
+            return 0
+
+        with self._locked(ticker):
+            # Another writer may have appended since the caller checked
+            last = self.last_date(ticker)
+            if last is not None:
+                keep = keep[new_columns["date"][keep] > last]
+            if len(keep) == 0:
+                return 0
+
+            rows = self.num_rows(ticker)
+            for column, dtype in self.COLUMNS.items():
+                path = self._column_path(ticker, column)
+                with open(path, "r+b" if path.exists() else "wb") as f:
+                    # Drop any partially written rows left by an interrupted append
+                    f.truncate(rows * dtype.itemsize)
+                    f.seek(0, 2)
+                    f.write(new_columns[column][keep].astype(dtype, copy=False).tobytes())
+
+        return len(keep)
+
+    def load_matrix(self, tickers: list[str], lookback_days: int) -> PriceHistory:
+        """Align the last `lookback_days` trading days of each ticker into (tickers, days) matrices."""
+        columns = [self.read(ticker) for ticker in tickers]
+        all_dates = np.unique(np.concatenate(
+            [c["date"] for c in columns] or [np.empty(0, dtype="datetime64[D]")]
+        ))[-lookback_days:]
+
+        matrices = {
+            column: np.full((len(tickers), len(all_dates)), np.nan)
+            for column in self.PRICE_COLUMNS
+        }
+        if len(all_dates):
+            for i, c in enumerate(columns):
+                first = int(np.searchsorted(c["date"], all_dates[0]))
+                positions = np.searchsorted(all_dates, c["date"][first:])
+                for column in self.PRICE_COLUMNS:
+                    matrices[column][i, positions] = c[column][first:]
+
+        return PriceHistory(tickers=list(tickers), dates=all_dates, **matrices)
@@ -0,0 +1,140 @@
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from stock_screener.data.ohlcv_store import OHLCVStore, PriceHistory
+from stock_screener.utils.market_hours import previous_trading_day
+from stock_screener.utils.read_env_vars import ENV
+
+
+def _last_completed_session() -> np.datetime64:
+    """Return the most recent trading day before today, the last session with a final daily bar."""
+    return np.datetime64(previous_trading_day(date.today()), "D")
+
+
+def download_prices(tickers: list[str], start: date) -> dict[str, dict[str, np.ndarray]]:
+    """Download daily prices for all tickers in a single bulk yfinance request."""
+    import yfinance as yf
+
+    data = yf.download(
+        tickers,
+        start=start.isoformat(),
+        interval="1d",
+        auto_adjust=True,
+        group_by="column",
+        progress=False,
+        threads=True,
+    )
+    if data is None or data.empty:
+        return {}
+
+    dates = data.index.to_numpy(dtype="datetime64[D]")
+    # Today's bar is still moving during market hours, only store completed sessions
+    completed = dates < np.datetime64(date.today(), "D")
+
+    prices = {}
+    for ticker in tickers:
+        if ticker not in data["Close"].columns:
+            continue
+        prices[ticker] = {"date": dates[completed]}
+        for column, field in [("open", "Open"), ("high", "High"), ("low", "Low"),
+                              ("close", "Close"), ("volume", "Volume")]:
+            prices[ticker][column] = data[field][ticker].to_numpy(dtype=np.float64)[completed]
+    return prices
+
+
+def _is_fresh(
+        store: OHLCVStore,
+        ticker: str,
+        last: np.datetime64 | None,
+        last_session: np.datetime64,
+        recheck_seconds: float,
+    ) -> bool:
+    """Return whether a ticker has the last session, or recently had no prices for it."""
+    if last is not None and last >= last_session:
+        return True
+
+    check = store.last_check(ticker)
+    return check is not None and check[0] >= last_session and time.time() - check[1] < recheck_seconds
+
+
+def refresh_store(
+        tickers: list[str],
+        lookback_days: int = 300,
+        store: OHLCVStore | None = None,
+        recheck_seconds: float = ENV.data.get("RECHECK_MINUTES", 60) * 60,
+    ) -> int:
+    """Append any missing completed sessions for the tickers to the local store.
+
+    Tickers that the download returns no prices for, e.g. unknown or delisted
+    symbols, are not downloaded again for `recheck_seconds`.
+    """
+    # An empty store is falsy, since its length is its number of tickers
+    store = store if store is not None else OHLCVStore()
+    last_session = _last_completed_session()
+
+    stale = {}
+    for ticker in tickers:
+        last = store.last_date(ticker)
+        if not _is_fresh(store, ticker, last, last_session, recheck_seconds):
+            stale[ticker] = last
+
+    if not stale:
+        return 0
+
+    # Roughly 5 trading days per 7 calendar days, plus a margin for holidays
+    default_start = date.today() - timedelta(days=lookback_days * 7 // 5 + 10)
+    known = [last for last in stale.values() if last is not None]
+    start = default_start
+    if known and len(known) == len(stale):
+        start = min(known).astype(date) + timedelta(days=1)
+
+    rows = 0
+    for ticker, columns in download_prices(list(stale), start).items():
+        rows += store.append(
+            ticker,
+            columns["date"],
+            columns["open"],
+            columns["high"],
+            columns["low"],
+            columns["close"],
+            columns["volume"],
+        )
+
+    for ticker in stale:
+        last = store.last_date(ticker)
+        if last is None or last < last_session:
+            store.mark_checked(ticker, last_session)
+    return rows
+
+
+def load_price_history(
+        tickers: list[str],
+        lookback_days: int = 300,
+        offline: bool = ENV.offline,
+        store: OHLCVStore | None = None,
+    ) -> PriceHistory:
+    """Return price matrices for the tickers, reading the local store first.
+
+    Missing or stale tickers are fetched with one bulk download and appended to
+    the store. In offline mode, or when the download fails, only stored prices
+    are used.
+    """
+    store = store if store is not None else OHLCVStore()
+
+    if not offline:
+        try:
+            refresh_store(tickers, lookback_days, store)
+        except Exception as e:
+            print(f"WARNING: Failed to refresh prices, using the local store only: {e}")
+
+    return store.load_matrix(tickers, lookback_days)
+
+
+if __name__ == "__main__":
+
+    import sys
+
+    appended = refresh_store([ticker.upper() for ticker in sys.argv[1:]])
+    print(f"Appended {appended} rows to the local OHLCV store.")
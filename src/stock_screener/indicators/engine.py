@@ -0,0 +1,190 @@
+"""Vectorized technical indicators.
+
+Every function takes 2-D arrays shaped (tickers, days) and computes the
+indicator for the whole universe at once. Missing prices are NaN, so tickers
+with a shorter history are left-padded with NaN and the indicator values are
+NaN until enough data is available.
+"""
+
+import numpy as np
+
+
+def _as_matrix(prices) -> np.ndarray:
+    """Return prices as a float64 (tickers, days) matrix."""
+    matrix = np.asarray(prices, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a (tickers, days) matrix, got shape {matrix.shape}")
+    return matrix
+
+
+def sma(prices, window: int) -> np.ndarray:
+    """Simple moving average over the last `window` days."""
+    prices = _as_matrix(prices)
+    out = np.full_like(prices, np.nan)
+    if window > prices.shape[1]:
+        return out
+
+    # Rolling sums via cumulative sums, windows with missing prices stay NaN
+    valid = ~np.isnan(prices)
+    cumsum = np.cumsum(np.insert(np.where(valid, prices, 0.0), 0, 0.0, axis=1), axis=1)
+    counts = np.cumsum(np.insert(valid, 0, False, axis=1), axis=1)
+    sums = cumsum[:, window:] - cumsum[:, :-window]
+    full = (counts[:, window:] - counts[:, :-window]) == window
+    out[:, window - 1:] = np.where(full, sums / window, np.nan)
+    return out
+
+
+def _recursive_average(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential average along the day axis, seeded by each row's first value."""
+    out = np.full_like(values, np.nan)
+    state = np.full(values.shape[0], np.nan)
+
+    for day in range(values.shape[1]):
+        current = values[:, day]
+        has_value = ~np.isnan(current)
+        seed = has_value & np.isnan(state)
+        update = has_value & ~seed
+        state[seed] = current[seed]
+        state[update] = alpha * current[update] + (1.0 - alpha) * state[update]
+        out[:, day] = state
+
+    return out
+
+
+def ema(prices, span: int) -> np.ndarray:
+    """Exponential moving average with smoothing 2 / (span + 1)."""
+    return _recursive_average(_as_matrix(prices), 2.0 / (span + 1.0))
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    close = _as_matrix(close)
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    gains = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    losses = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+    avg_gain = _recursive_average(gains, 1.0 / period)
+    avg_loss = _recursive_average(losses, 1.0 / period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out = np.where(avg_loss == 0, 100.0, out)
+    out = np.where(np.isnan(avg_gain) | np.isnan(avg_loss), np.nan, out)
+
+    # Values are only meaningful once a full period has been seen
+    valid_days = np.cumsum(~np.isnan(delta), axis=1)
+    out[valid_days < period] = np.nan
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    close = _as_matrix(close)
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(close, window: int = 20, num_std: float = 2.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Middle, upper and lower Bollinger Bands."""
+    close = _as_matrix(close)
+    middle = sma(close, window)
+    std = np.full_like(close, np.nan)
+
+    if window <= close.shape[1]:
+        windows = np.lib.stride_tricks.sliding_window_view(close, window, axis=1)
+        std[:, window - 1:] = windows.std(axis=2)
+
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    high, low, close = _as_matrix(high), _as_matrix(low), _as_matrix(close)
+    previous_close = np.roll(close, 1, axis=1)
+    previous_close[:, :1] = np.nan
+
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)),
+    )
+    return _recursive_average(true_range, 1.0 / period)
+
+
+INDICATORS = ("sma_50", "sma_200", "ema_20", "rsi_14", "macd", "bollinger", "atr_14")
+
+
+def compute_indicators(close, high=None, low=None, indicators=INDICATORS) -> dict[str, np.ndarray]:
+    """Compute the requested indicators for a universe of tickers.
+
+    Args:
+        close: Closing prices shaped (tickers, days).
+        high: Daily highs, required for ATR.
+        low: Daily lows, required for ATR.
+        indicators: Names from `INDICATORS` to compute.
+
+    Returns:
+        A dict mapping each output series name to a (tickers, days) matrix.
+    """
+    close = _as_matrix(close)
+    unknown = set(indicators) - set(INDICATORS)
+    if unknown:
+        raise ValueError(f"Unknown indicators: {sorted(unknown)}")
+
+    results = {"close": close}
+    if "sma_50" in indicators:
+        results["sma_50"] = sma(close, 50)
+    if "sma_200" in indicators:
+        results["sma_200"] = sma(close, 200)
+    if "ema_20" in indicators:
+        results["ema_20"] = ema(close, 20)
+    if "rsi_14" in indicators:
+        results["rsi_14"] = rsi(close, 14)
+    if "macd" in indicators:
+        results["macd"], results["macd_signal"], results["macd_hist"] = macd(close)
+    if "bollinger" in indicators:
+        results["bb_middle"], results["bb_upper"], results["bb_lower"] = bollinger_bands(close)
+    if "atr_14" in indicators and high is not None and low is not None:
+        results["atr_14"] = atr(high, low, close, 14)
+
+    return results
+
+
+def classify_signals(latest: dict[str, np.ndarray]) -> np.ndarray:
+    """Label each ticker bullish, bearish or neutral from its latest indicator values.
+
+    Each available check (price vs SMA 50, SMA 50 vs SMA 200, MACD histogram,
+    RSI vs 50) votes +1 or -1, and a net score of 2 or more decides the label.
+    """
+    score = np.zeros(latest["close"].shape[0])
+
+    checks = [
+        ("close", "sma_50"),
+        ("sma_50", "sma_200"),
+    ]
+    for left, right in checks:
+        if left in latest and right in latest:
+            score += np.nan_to_num(np.sign(latest[left] - latest[right]))
+    if "macd_hist" in latest:
+        score += np.nan_to_num(np.sign(latest["macd_hist"]))
+    if "rsi_14" in latest:
+        score += np.nan_to_num(np.sign(latest["rsi_14"] - 50.0))
+
+    return np.where(score >= 2, "bullish", np.where(score <= -2, "bearish", "neutral"))
+
+
+def latest_values(results: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Return the last non-NaN value of every series for each ticker."""
+    latest = {}
+    for name, series in results.items():
+        if series.shape[1] == 0:
+            latest[name] = np.full(series.shape[0], np.nan)
+            continue
+        valid = ~np.isnan(series)
+        # Index of the last valid day per row, rows without data stay NaN
+        last_index = series.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        values = series[np.arange(series.shape[0]), last_index]
+        latest[name] = np.where(valid.any(axis=1), values, np.nan)
+    return latest
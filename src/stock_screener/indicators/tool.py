@@ -0,0 +1,67 @@
+import asyncio
+
+import numpy as np
+
+from stock_screener.data.prices import load_price_history
+from stock_screener.indicators.engine import (
+    INDICATORS,
+    classify_signals,
+    compute_indicators,
+    latest_values,
+)
+from stock_screener.utils.read_env_vars import ENV
+
+
+def analyze_universe(
+        tickers: list[str],
+        indicators: list[str] | tuple[str, ...] = INDICATORS,
+        lookback_days: int = 300,
+        offline: bool = ENV.offline,
+    ) -> list[dict]:
+    """Compute the latest indicator values and signal for every ticker in one pass."""
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+    if not tickers:
+        return []
+
+    history = load_price_history(tickers, lookback_days, offline=offline)
+    results = compute_indicators(history.close, history.high, history.low, indicators)
+    latest = latest_values(results)
+    signals = classify_signals(latest)
+
+    rows = []
+    for i, ticker in enumerate(history.tickers):
+        if np.isnan(latest["close"][i]):
+            rows.append({"ticker": ticker, "signal": "no data"})
+            continue
+
+        row = {"ticker": ticker, "signal": str(signals[i])}
+        for name, values in latest.items():
+            row[name] = None if np.isnan(values[i]) else round(float(values[i]), 4)
+        rows.append(row)
+
+    return rows
+
+
+async def compute_technical_indicators(
+        tickers: list[str],
+        indicators: list[str] | None = None,
+        lookback_days: int = 300,
+    ) -> dict:
+    """Computes technical indicators and a bullish/bearish signal for many stocks at once.
+
+    Prefer this tool over per-ticker tools when analyzing or screening more than one stock.
+
+    Args:
+        tickers: Stock ticker symbols to analyze, for example ["TSLA", "INTC"].
+        indicators: Indicators to compute. Any of sma_50, sma_200, ema_20, rsi_14,
+            macd, bollinger and atr_14. All of them are computed when omitted.
+        lookback_days: Number of trading days of price history to use.
+
+    Returns:
+        A dictionary with one row per ticker holding the latest indicator values and
+        a signal that is one of bullish, bearish or neutral.
+    """
+    rows = await asyncio.to_thread(
+        analyze_universe, tickers, tuple(indicators or INDICATORS), lookback_days
+    )
+    return {"rows": rows}
@@ -0,0 +1,131 @@
+"""Local stand-in for the yfinance MCP server that replays recorded tool calls.
+
+Serves the tool definitions and results captured by MCPRecorder, so the
+agents can be run, benchmarked and regression-tested without network access.
+A call is answered with the last recorded result of the same tool and
+arguments, and calls that were never recorded get an error result. Every
+call can be delayed by a fixed latency, by its recorded latency, or both.
+
+    uv run -m stock_screener.mcp_replay.server [RECORDING]
+
+Point `YFINANCE` under `[mcp-urls]` at http://127.0.0.1:8765/mcp to use it.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Union
+
+from fastmcp import FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.tools.tool import Tool, ToolResult
+from mcp import types as mcp_types
+
+from stock_screener.utils.mcp_recorder import RECORDINGS_DIR
+from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.tool_cache import tool_key
+
+
+# The tools the agents of this project use, served even when none of their
+# calls were recorded
+PROJECT_TOOLS = [
+    "get_technical_signals",
+    "screen_bullish_stocks",
+    "screen_stocks",
+    "get_gross_margins",
+    "get_market_cap",
+    "get_ticker_financials",
+    "get_stock_info",
+    "get_news",
+]
+
+
+class ReplayTool(Tool):
+    """Tool that answers with recorded results instead of running anything."""
+
+    results: dict[str, dict[str, Any]] = {}
+    seconds: dict[str, float] = {}
+    latency: float = 0.0
+    recorded_latency: bool = False
+
+    async def run(self, arguments: dict[str, Any]) -> ToolResult:
+        key = tool_key(self.name, arguments)
+        delay = self.latency + (self.seconds.get(key, 0.0) if self.recorded_latency else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        recorded = self.results.get(key)
+        if recorded is None:
+            raise ToolError(f"No recorded result for {self.name} with arguments {json.dumps(arguments, sort_keys=True)}")
+
+        result = mcp_types.CallToolResult.model_validate(recorded)
+        if result.isError:
+            raise ToolError(
+                " ".join(block.text for block in result.content if isinstance(block, mcp_types.TextContent))
+            )
+        return ToolResult(content=result.content, structured_content=result.structuredContent)
+
+
+def load_recording(path: Union[str, Path]) -> tuple[dict[str, dict], dict[str, dict], dict[str, dict]]:
+    """Return the tool definitions, results and latencies of a recording, by tool name.
+
+    Results and latencies are keyed by the canonical tool call, and later
+    recordings of a call replace earlier ones.
+    """
+    definitions, results, seconds = {}, {}, {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line:
+            continue
+        entry = json.loads(line)
+        if entry["type"] == "tool":
+            definitions[entry["tool"]["name"]] = entry["tool"]
+        elif entry["type"] == "call":
+            key = tool_key(entry["tool"], entry["arguments"])
+            results.setdefault(entry["tool"], {})[key] = entry["result"]
+            seconds.setdefault(entry["tool"], {})[key] = entry.get("seconds", 0.0)
+    return definitions, results, seconds
+
+
+def create_server(
+        recording: Union[str, Path] = ENV.mcp_replay.get("RECORDING") or RECORDINGS_DIR / "yfinance.jsonl",
+        latency_ms: float = ENV.mcp_replay.get("LATENCY_MS", 0),
+        recorded_latency: bool = ENV.mcp_replay.get("RECORDED_LATENCY", False),
+    ) -> FastMCP:
+    """Build a FastMCP server that replays `recording`."""
+    definitions, results, seconds = load_recording(recording)
+
+    server = FastMCP("yfinance-replay")
+    for name in dict.fromkeys([*definitions, *PROJECT_TOOLS]):
+        definition = definitions.get(name, {})
+        server.add_tool(ReplayTool(
+            name=name,
+            description=definition.get("description") or f"Replays recorded {name} results.",
+            parameters=definition.get("inputSchema") or {"type": "object", "properties": {}},
+            output_schema=definition.get("outputSchema"),
+            results=results.get(name, {}),
+            seconds=seconds.get(name, {}),
+            latency=latency_ms / 1000,
+            recorded_latency=recorded_latency,
+        ))
+
+    print(
+        f"Replaying {sum(len(calls) for calls in results.values())} recorded calls "
+        f"of {len(results)} tools from {recording}"
+    )
+    return server
+
+
+def main():
+
+    server = create_server(*sys.argv[1:2])
+    server.run(
+        transport="http",
+        host="127.0.0.1",
+        port=int(ENV.mcp_replay.get("PORT", 8765)),
+    )
+
+
+if __name__ == "__main__":
+
+    main()
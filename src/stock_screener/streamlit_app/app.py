@@ -1,10 +1,10 @@
 import streamlit as st
-import asyncio
 
 from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
 
-from stock_screener.streamlit_app.runnable import get_agent, ask_agent
+from stock_screener.streamlit_app.runnable import get_agent, ask_agent, run_in_background_loop
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin
+from stock_screener.utils.runners import ScopedRunner
 
 st.set_page_config(page_title="Stock Screener", layout="centered")
 
@@ -16,20 +16,21 @@ if "adk_agent" not in st.session_state:
     session_service = InMemorySessionService()
 
     # Create a session
-    session = asyncio.run(session_service.create_session(
+    session = run_in_background_loop(session_service.create_session(
         state={},
         app_name=APP_NAME,
         user_id="user",
     ))
 
     # Create the agent with the tools
-    agent = asyncio.run(get_agent())
+    agent = run_in_background_loop(get_agent())
 
     # Runner
-    runner = Runner(
+    runner = ScopedRunner(
         app_name=APP_NAME,
         agent=agent,
         session_service=session_service,
+        plugins=[MCPBatchingPlugin()],
     )
 
     st.session_state.adk_agent = agent
@@ -53,7 +54,7 @@ buttons = st.columns([2,6,1])
 with buttons[0]:
     if st.button("Ask"):
         with st.spinner("Thinking..."):
-            st.session_state["response"] = asyncio.run(ask_agent(
+            st.session_state["response"] = run_in_background_loop(ask_agent(
                 user_query,
                 st.session_state.adk_session,
                 st.session_state.adk_runner
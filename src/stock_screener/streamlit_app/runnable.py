@@ -1,24 +1,49 @@
 import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
 
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
 from google.genai import types
 
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin
+from stock_screener.utils.mcp_toolsets import CachedMCPToolset
 from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.runners import ScopedRunner
 
 ENV.export_google_api_key()
 
 APP_NAME = "StockScreener"
 
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def run_in_background_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on one long-lived event loop and wait for its result.
+
+    Streamlit reruns the script for every interaction. Running each answer on
+    the same loop, instead of a new one per `asyncio.run`, keeps the pooled
+    MCP sessions open between answers.
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agent-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
 
 async def get_agent(
         mcp_url: str = ENV.mcp_urls.get("YFINANCE")
     ) -> LlmAgent:
 
-    toolset = MCPToolset(
+    toolset = CachedMCPToolset(
         connection_params=StreamableHTTPServerParams(url=mcp_url),
     )
 
@@ -59,10 +84,11 @@ async def run_agent():
 
     print("Agent created with tools")
 
-    runner = Runner(
+    runner = ScopedRunner(
         app_name=APP_NAME,
         agent=agent,
         session_service=session_service,
+        plugins=[MCPBatchingPlugin()],
     )
 
     print("\n--- Simulating First User Interaction (New Session) ---")
@@ -143,8 +169,6 @@ async def ask_agent(user_query: str, session, runner) -> str:
 
                 elif event.actions and event.actions.escalate: # Handle potential errors/escalations
                     final_response_text = f"Agent escalated: {event.error_message or 'No specific message.'}"
-                
-                await runner.close()
 
                 print(event.content)
 
@@ -1,13 +1,13 @@
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.sessions import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.artifacts import InMemoryArtifactService
-from google.adk.runners import Runner
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
 from google.genai import types
 
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin
+from stock_screener.utils.mcp_toolsets import CachedMCPToolset
 from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.runners import ScopedRunner
+from stock_screener.utils.session_services import BoundedArtifactService, BoundedSessionService
 
 
 class StockScreenerAgent:
@@ -20,12 +20,13 @@ class StockScreenerAgent:
         
         self._agent = self._build_agent(mcp_url)
         self._user_id = "user_1"
-        self._runner = Runner(
+        self._runner = ScopedRunner(
             app_name=self._agent.name,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService()
+            artifact_service=BoundedArtifactService(),
+            session_service=BoundedSessionService(),
+            memory_service=InMemoryMemoryService(),
+            plugins=[MCPBatchingPlugin()],
         )
 
     def _build_agent(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> LlmAgent:
@@ -47,10 +48,10 @@ class StockScreenerAgent:
         )
         return agent
     
-    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> MCPToolset:
+    def _get_tools(self, mcp_url: str = ENV.mcp_urls.get("YFINANCE")) -> CachedMCPToolset:
         """Return the tools available in the agent."""
         
-        toolset = MCPToolset(
+        toolset = CachedMCPToolset(
             connection_params=StreamableHTTPServerParams(url=mcp_url),
             tool_filter=[
                 "get_gross_margins",
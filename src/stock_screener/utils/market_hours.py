@@ -0,0 +1,108 @@
+"""Regular trading hours of the US stock exchanges (NYSE and Nasdaq).
+
+Early closes are treated as full trading days.
+"""
+
+import datetime as dt
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dt.time(9, 30)
+MARKET_CLOSE = dt.time(16, 0)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> dt.date:
+    """Return the `n`th `weekday` (Monday is 0) of a month, counting from the end when `n` is negative."""
+    if n > 0:
+        first = dt.date(year, month, 1)
+        return first + dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = dt.date(year, month + 1, 1) - dt.timedelta(days=1) if month < 12 else dt.date(year, 12, 31)
+    return last - dt.timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+
+def _easter(year: int) -> dt.date:
+    """Return Easter Sunday of the Gregorian calendar."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    weekday_offset = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * weekday_offset) // 451
+    month, day = divmod(h + weekday_offset - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+def _observed(day: dt.date) -> dt.date:
+    """Move a holiday on a weekend to the nearest weekday."""
+    if day.weekday() == 5:
+        return day - dt.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + dt.timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=16)
+def holidays(year: int) -> frozenset[dt.date]:
+    """Return the full-day market holidays of a year."""
+    days = {
+        _nth_weekday(year, 1, 0, 3),                # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),                # Washington's Birthday
+        _easter(year) - dt.timedelta(days=2),       # Good Friday
+        _nth_weekday(year, 5, 0, -1),               # Memorial Day
+        _observed(dt.date(year, 7, 4)),             # Independence Day
+        _nth_weekday(year, 9, 0, 1),                # Labor Day
+        _nth_weekday(year, 11, 3, 4),               # Thanksgiving Day
+        _observed(dt.date(year, 12, 25)),           # Christmas Day
+    }
+    # New Year's Day on a Saturday is not observed on the Friday before
+    new_year = dt.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+    if year >= 2022:
+        days.add(_observed(dt.date(year, 6, 19)))   # Juneteenth
+    return frozenset(days)
+
+
+def is_trading_day(day: dt.date) -> bool:
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def previous_trading_day(day: dt.date) -> dt.date:
+    """Return the last trading day before `day`."""
+    day -= dt.timedelta(days=1)
+    while not is_trading_day(day):
+        day -= dt.timedelta(days=1)
+    return day
+
+
+def _as_market_time(now: dt.datetime | None) -> dt.datetime:
+    now = now or dt.datetime.now(MARKET_TZ)
+    if now.tzinfo is None:
+        raise ValueError("now must be timezone-aware")
+    return now.astimezone(MARKET_TZ)
+
+
+def is_market_open(now: dt.datetime | None = None) -> bool:
+    """Return whether the market is in its regular trading session at `now`."""
+    now = _as_market_time(now)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def next_open(now: dt.datetime | None = None) -> dt.datetime:
+    """Return the start of the next regular trading session after `now`."""
+    now = _as_market_time(now)
+    day = now.date()
+    if now.time() >= MARKET_OPEN:
+        day += dt.timedelta(days=1)
+    while not is_trading_day(day):
+        day += dt.timedelta(days=1)
+    return dt.datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ)
+
+
+def seconds_until_next_open(now: dt.datetime | None = None) -> float:
+    now = _as_market_time(now)
+    return (next_open(now) - now).total_seconds()
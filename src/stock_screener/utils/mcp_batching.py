@@ -0,0 +1,124 @@
+"""Batch the MCP tool calls that the model makes in one turn.
+
+ADK runs the function calls of a model response one after another, so 30
+`get_market_cap` calls cost 30 sequential MCP round trips. MCPBatchingPlugin
+records the function calls of each model response event. When the first of
+them runs, the cached MCP tools start all the recorded calls to their toolset
+at once, with bounded concurrency and identical calls merged, and every later
+call picks up its own result. Results are kept for the rest of the
+invocation, so a repeated call is not sent again; failed calls are.
+
+Only calls that will run are recorded: a before_tool callback may answer a
+call in place of its tool, so the responses of agents with such callbacks, or
+of runs with plugins that may skip tools, are not batched. Run the plugin
+with ScopedRunner, which drops the recorded and started calls of an
+invocation however its run ends.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.genai import types
+
+from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.runners import InvocationPlugin
+from stock_screener.utils.tool_cache import tool_key
+
+
+# Function calls of the last model response, by invocation
+_announced: dict[str, list[types.FunctionCall]] = {}
+# Started calls by tool key, by invocation
+_prefetched: dict[str, dict[str, asyncio.Task]] = {}
+
+
+def _may_skip_tools(plugin: BasePlugin) -> bool:
+    """Whether the plugin may answer tool calls in place of their tools."""
+    overrides = type(plugin).before_tool_callback is not BasePlugin.before_tool_callback
+    return overrides and getattr(plugin, "may_skip_tools", True)
+
+
+class MCPBatchingPlugin(InvocationPlugin):
+    """ADK plugin that records the function calls of each model response for batching."""
+
+    def __init__(self):
+        super().__init__(name="mcp_batching")
+
+    async def on_event_callback(
+            self, *, invocation_context: InvocationContext, event: Event
+        ) -> Optional[Event]:
+        if event.partial:
+            return None
+        calls = event.get_function_calls()
+        if len(calls) < 2:
+            return None
+
+        agent = invocation_context.agent.root_agent.find_agent(event.author)
+        if agent is None or getattr(agent, "before_tool_callback", None):
+            return None
+        if any(_may_skip_tools(plugin) for plugin in invocation_context.plugin_manager.plugins):
+            return None
+
+        _announced[invocation_context.invocation_id] = calls
+        return None
+
+    def close_invocation(self, invocation_id: str) -> None:
+        _announced.pop(invocation_id, None)
+        for task in _prefetched.pop(invocation_id, {}).values():
+            task.cancel()
+            if task.done() and not task.cancelled():
+                # Mark the error as seen, nobody asked for this result
+                task.exception()
+
+
+def prefetch(
+        invocation_id: str,
+        tools: dict[str, BaseTool],
+        call: Callable[[BaseTool, dict[str, Any]], Awaitable[Any]],
+        max_concurrency: int = ENV.mcp_batching.get("MAX_CONCURRENCY", 8),
+    ) -> None:
+    """Start the recorded calls of an invocation to any of `tools` with `call`."""
+    calls = _announced.pop(invocation_id, None)
+    if not calls:
+        return
+
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def limited(tool: BaseTool, args: dict[str, Any]) -> Any:
+        async with limit:
+            return await call(tool, args)
+
+    prefetched = _prefetched.setdefault(invocation_id, {})
+    remaining = []
+    for function_call in calls:
+        tool = tools.get(function_call.name)
+        if tool is None:
+            remaining.append(function_call)
+            continue
+        args = dict(function_call.args or {})
+        key = tool_key(function_call.name, args)
+        if key not in prefetched:
+            prefetched[key] = asyncio.create_task(limited(tool, args))
+
+    # Calls to tools of other toolsets are left for them
+    if remaining:
+        _announced[invocation_id] = remaining
+
+
+def take_prefetched(invocation_id: str, tool_name: str, args: dict[str, Any]) -> Optional[asyncio.Task]:
+    """Return the started call of an invocation with these arguments, if any.
+
+    The call stays available to identical calls until the invocation closes,
+    unless it has failed.
+    """
+    prefetched = _prefetched.get(invocation_id, {})
+    key = tool_key(tool_name, args)
+    task = prefetched.get(key)
+    if task is not None and task.done() and (task.cancelled() or task.exception() is not None):
+        del prefetched[key]
+        return None
+    return task
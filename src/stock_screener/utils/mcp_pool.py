@@ -0,0 +1,242 @@
+"""Process-wide pool of MCP client sessions, keyed by server URL.
+
+Opening an MCP session costs a handshake, and every new toolset also lists
+the tools again. With the pool, every toolset of the process borrows from the
+same few long-lived sessions per server. Sessions are health-checked with MCP
+pings in the background, and replaced when they fail or disconnect.
+
+Sessions belong to the event loop that opened them. When the pool is used
+from another event loop, it opens new sessions there, so callers should keep
+one long-running loop, as the A2A server, the host agent and the Streamlit
+app do.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from google.adk.tools.mcp_tool.mcp_session_manager import MCPSessionManager
+from mcp import ClientSession
+
+from stock_screener.utils.read_env_vars import ENV
+
+
+_pools_lock = threading.Lock()
+_pools: dict[str, "MCPSessionPool"] = {}
+
+
+class _ADKTransport:
+    """The private ADK and anyio internals the pool relies on, pinned to google-adk 1.7.
+
+    MCPSessionManager has no public way to open a transport without a session,
+    or to tell whether a session has disconnected. Check these methods when
+    upgrading ADK.
+    """
+
+    def __init__(self, connection_params: Any):
+        self._manager = MCPSessionManager(connection_params)
+
+    def merge_headers(self, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        return self._manager._merge_headers(headers)
+
+    def open(self, headers: Optional[Dict[str, str]]):
+        """Async context manager of the read and write streams of a new connection."""
+        return self._manager._create_client(headers)
+
+    @staticmethod
+    def disconnected(session: ClientSession) -> bool:
+        return session._read_stream._closed or session._write_stream._closed
+
+
+class PooledSession:
+    """One MCP session, owned by a task that opens it and later closes it.
+
+    The transport and session contexts are entered and exited in the same
+    task, as anyio requires.
+    """
+
+    def __init__(self, transport: _ADKTransport, headers: Optional[Dict[str, str]]):
+        self._transport = transport
+        self.session: Optional[ClientSession] = None
+        self._ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(headers))
+
+    async def _run(self, headers: Optional[Dict[str, str]]) -> None:
+        try:
+            async with self._transport.open(headers) as transports:
+                # The streamable HTTP client also returns a session id callback
+                async with ClientSession(*transports[:2]) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set_result(session)
+                    await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            else:
+                print(f"WARNING: MCP session closed with an error: {e}")
+
+    async def wait_ready(self) -> ClientSession:
+        return await asyncio.shield(self._ready)
+
+    @property
+    def broken(self) -> bool:
+        if self._task.done():
+            return True
+        if self.session is None:
+            return False
+        return self._transport.disconnected(self.session)
+
+    async def aclose(self) -> None:
+        self._closing.set()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class MCPSessionPool:
+    """Up to `size` MCP sessions to one server, shared by all toolsets of the process.
+
+    Drop-in replacement for ADK's MCPSessionManager: `create_session` borrows
+    the sessions in turn, opening or reopening them as needed, and `close`
+    leaves them open for the other toolsets. Use `close_all` to close them.
+    """
+
+    def __init__(
+            self,
+            connection_params: Any,
+            size: int = ENV.mcp_pool.get("SESSIONS", 2),
+            health_check_interval: float = ENV.mcp_pool.get("HEALTH_CHECK_SECONDS", 30),
+            ping_timeout: float = ENV.mcp_pool.get("PING_TIMEOUT_SECONDS", 5),
+        ):
+        self._transport = _ADKTransport(connection_params)
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self._slots: dict[str, list[Optional[PooledSession]]] = {}
+        self._next = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self.stats = {"opened": 0, "reconnected": 0, "borrowed": 0}
+
+    def _bind_loop(self) -> None:
+        """Forget the sessions of another event loop, which cannot be used from this one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            for slots in self._slots.values():
+                for pooled in slots:
+                    if pooled is not None:
+                        self._loop.call_soon_threadsafe(pooled._closing.set)
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._slots = {}
+        self._health_task = None
+
+    async def create_session(self, headers: Optional[Dict[str, str]] = None) -> ClientSession:
+        """Return a connected session to the server."""
+        self._bind_loop()
+        self._ensure_health_checks()
+
+        merged_headers = self._transport.merge_headers(headers)
+        slots = self._slots.setdefault(
+            json.dumps(merged_headers, sort_keys=True), [None] * self.size
+        )
+        index = self._next % self.size
+        self._next += 1
+        self.stats["borrowed"] += 1
+
+        pooled = slots[index]
+        if pooled is None or pooled.broken:
+            async with self._lock:
+                pooled = slots[index]
+                if pooled is None or pooled.broken:
+                    if pooled is not None:
+                        self.stats["reconnected"] += 1
+                        await pooled.aclose()
+                    pooled = slots[index] = PooledSession(self._transport, merged_headers)
+                    self.stats["opened"] += 1
+
+        try:
+            return await pooled.wait_ready()
+        except Exception:
+            # Let the next borrower try again
+            if slots[index] is pooled:
+                slots[index] = None
+            raise
+
+    async def _check(self, slots: list[Optional[PooledSession]], index: int) -> None:
+        pooled = slots[index]
+        if pooled is None or pooled.session is None:
+            return
+        try:
+            if pooled.broken:
+                raise ConnectionError("disconnected")
+            await asyncio.wait_for(pooled.session.send_ping(), timeout=self.ping_timeout)
+        except Exception as e:
+            print(f"WARNING: MCP session failed its health check, reconnecting on next use: {e!r}")
+            if slots[index] is pooled:
+                slots[index] = None
+            await pooled.aclose()
+
+    async def check_health(self) -> None:
+        """Ping every open session once, and drop the ones that do not answer."""
+        await asyncio.gather(*(
+            self._check(slots, index)
+            for slots in list(self._slots.values())
+            for index in range(len(slots))
+        ))
+
+    async def _health_check_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
+
+    def _ensure_health_checks(self) -> None:
+        if self.health_check_interval <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_check_loop())
+
+    async def close(self) -> None:
+        """Called by toolsets when they close. The sessions stay open for the other toolsets."""
+
+    async def close_all(self) -> None:
+        """Close every session of the pool."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for slots in self._slots.values():
+            for pooled in slots:
+                if pooled is not None:
+                    await pooled.aclose()
+        self._slots = {}
+
+
+def get_session_pool(connection_params: Any) -> MCPSessionPool:
+    """Return the session pool of the server of `connection_params`, creating it on first use."""
+    key = json.dumps(
+        [getattr(connection_params, "url", None) or repr(connection_params),
+         getattr(connection_params, "headers", None)],
+        sort_keys=True,
+        default=str,
+    )
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = MCPSessionPool(connection_params)
+        return _pools[key]
+
+
+async def close_session_pools() -> None:
+    """Close the sessions of every pool of this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        await pool.close_all()
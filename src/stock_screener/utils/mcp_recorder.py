@@ -0,0 +1,75 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from mcp import types as mcp_types
+
+from stock_screener.utils.paths import DATA_DIR
+from stock_screener.utils.read_env_vars import ENV
+
+
+RECORDINGS_DIR = DATA_DIR / "mcp_recordings"
+
+_default_recorder_lock = threading.Lock()
+_default_recorder: Optional["MCPRecorder"] = None
+
+
+class MCPRecorder:
+    """Append the tool definitions and tool calls of an MCP server to a JSON Lines file.
+
+    Every line is either {"type": "tool", "tool": ...} with a tool definition,
+    or {"type": "call", "tool": ..., "arguments": ..., "result": ..., "seconds": ...}
+    with a call, its result and its latency. The replay server serves them.
+    """
+
+    def __init__(self, path: Union[str, Path] = RECORDINGS_DIR / "yfinance.jsonl"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._recorded_tools: set[str] = set()
+
+    def _append(self, entries: list[dict]) -> None:
+        lines = "".join(json.dumps(entry, default=str) + "\n" for entry in entries)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"ERROR: Failed to record MCP traffic to {self.path}: {e}")
+
+    def record_tools(self, tools: list[mcp_types.Tool]) -> None:
+        """Record the definitions of tools that this recorder has not seen yet."""
+        new_tools = [tool for tool in tools if tool.name not in self._recorded_tools]
+        self._recorded_tools.update(tool.name for tool in new_tools)
+        if new_tools:
+            self._append([
+                {"type": "tool", "tool": tool.model_dump(mode="json", by_alias=True, exclude_none=True)}
+                for tool in new_tools
+            ])
+
+    def record_call(
+            self, tool_name: str, arguments: dict[str, Any], result: mcp_types.CallToolResult, seconds: float
+        ) -> None:
+        self._append([{
+            "type": "call",
+            "tool": tool_name,
+            "arguments": arguments,
+            "result": result.model_dump(mode="json", by_alias=True, exclude_none=True),
+            "seconds": seconds,
+            "recorded_at": time.time(),
+        }])
+
+
+def get_recorder() -> Optional[MCPRecorder]:
+    """Return the recorder configured under [mcp-recorder], or None when recording is off."""
+    global _default_recorder
+
+    if not ENV.mcp_recorder.get("RECORD", False):
+        return None
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = MCPRecorder(
+                ENV.mcp_recorder.get("PATH") or RECORDINGS_DIR / "yfinance.jsonl"
+            )
+    return _default_recorder
@@ -0,0 +1,157 @@
+import time
+from typing import Any, List, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.auth.auth_credential import AuthCredential
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_session_manager import retry_on_closed_resource
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from google.adk.tools.tool_context import ToolContext
+from mcp import types as mcp_types
+
+from stock_screener.utils.mcp_batching import prefetch, take_prefetched
+from stock_screener.utils.mcp_pool import get_session_pool
+from stock_screener.utils.mcp_recorder import get_recorder
+from stock_screener.utils.read_env_vars import ENV
+from stock_screener.utils.tool_cache import ToolResultCache, get_tool_cache, tool_key
+from stock_screener.utils.tracing import inject_trace_context
+
+
+class TracedMCPTool(MCPTool):
+    """MCP tool that sends the current trace context in the `_meta` of each call.
+
+    Records each call and its result when recording is on under [mcp-recorder].
+    """
+
+    @retry_on_closed_resource
+    async def _run_async_impl(
+            self, *, args: dict[str, Any], tool_context: ToolContext, credential: AuthCredential
+        ) -> Any:
+        headers = await self._get_headers(tool_context, credential)
+        session = await self._mcp_session_manager.create_session(headers=headers)
+
+        request = mcp_types.ClientRequest(
+            mcp_types.CallToolRequest(
+                method="tools/call",
+                params=mcp_types.CallToolRequestParams(
+                    name=self.name,
+                    arguments=args,
+                    _meta=inject_trace_context() or None,
+                ),
+            )
+        )
+        start = time.perf_counter()
+        result = await session.send_request(request, mcp_types.CallToolResult)
+
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.record_call(self.name, args, result, time.perf_counter() - start)
+        return result
+
+
+class CachedMCPTool(TracedMCPTool):
+    """Traced MCP tool that reuses results from a ToolResultCache within the tool's TTL.
+
+    When MCPBatchingPlugin runs, the first call of a model turn also starts
+    the other calls of that turn to the tools of the same toolset.
+    """
+
+    def __init__(self, *, cache: Optional[ToolResultCache], **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+        # The tools of the same toolset, by name
+        self._siblings: dict[str, "CachedMCPTool"] = {}
+
+    async def _run_async_impl(
+            self, *, args: dict[str, Any], tool_context: ToolContext, credential: AuthCredential
+        ) -> Any:
+        if tool_context is not None:
+            prefetch(
+                tool_context.invocation_id,
+                self._siblings,
+                lambda tool, tool_args: tool._call(tool_args, tool_context, credential),
+            )
+            prefetched = take_prefetched(tool_context.invocation_id, self.name, args)
+            if prefetched is not None:
+                return await prefetched
+        return await self._call(args, tool_context, credential)
+
+    async def _call(
+            self, args: dict[str, Any], tool_context: ToolContext, credential: AuthCredential
+        ) -> Any:
+        ttl = self._cache.ttl(self.name) if self._cache else 0
+        if not ttl:
+            return await super()._run_async_impl(
+                args=args, tool_context=tool_context, credential=credential
+            )
+
+        key = tool_key(self.name, args)
+        result = await self._cache.get(key)
+        if result is None:
+            result = await super()._run_async_impl(
+                args=args, tool_context=tool_context, credential=credential
+            )
+            await self._cache.put(key, result, ttl)
+        return result
+
+
+class TracedMCPToolset(MCPToolset):
+    """MCP toolset whose tools propagate the trace context to the MCP server.
+
+    Borrows its sessions from the process-wide pool of the server, unless
+    the pool is disabled under [mcp-pool].
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if ENV.mcp_pool.get("ENABLED", True):
+            self._mcp_session_manager = get_session_pool(self._connection_params)
+
+    def _wrap_tool(self, tool: MCPTool) -> BaseTool:
+        return TracedMCPTool(
+            mcp_tool=tool._mcp_tool,
+            mcp_session_manager=self._mcp_session_manager,
+            auth_scheme=self._auth_scheme,
+            auth_credential=self._auth_credential,
+        )
+
+    async def get_tools(
+            self, readonly_context: Optional[ReadonlyContext] = None
+        ) -> List[BaseTool]:
+        tools = await super().get_tools(readonly_context)
+
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.record_tools([tool._mcp_tool for tool in tools])
+        return [self._wrap_tool(tool) for tool in tools]
+
+
+class CachedMCPToolset(TracedMCPToolset):
+    """Traced MCP toolset whose tool results are cached with per-tool TTLs.
+
+    Uses the cache shared by the whole process unless given one, so every
+    agent of the process hits the results of the others.
+    """
+
+    def __init__(self, *args, cache: Optional[ToolResultCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache = cache or get_tool_cache()
+
+    def _wrap_tool(self, tool: MCPTool) -> BaseTool:
+        return CachedMCPTool(
+            cache=self._cache,
+            mcp_tool=tool._mcp_tool,
+            mcp_session_manager=self._mcp_session_manager,
+            auth_scheme=self._auth_scheme,
+            auth_credential=self._auth_credential,
+        )
+
+    async def get_tools(
+            self, readonly_context: Optional[ReadonlyContext] = None
+        ) -> List[BaseTool]:
+        tools = await super().get_tools(readonly_context)
+        siblings = {tool.name: tool for tool in tools}
+        for tool in tools:
+            tool._siblings = siblings
+        return tools
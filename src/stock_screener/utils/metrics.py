@@ -0,0 +1,275 @@
+"""In-process metrics exported in the Prometheus text format.
+
+Every server worker keeps its own metrics, so with several workers each
+scrape of /metrics reports the worker that served it.
+"""
+
+import abc
+import contextlib
+import threading
+import time
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+from stock_screener.utils.runners import InvocationPlugin
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _Metric(abc.ABC):
+    """Base class of the metrics, holding one series per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._series: dict[tuple[str, ...], Any] = {}
+        # Observations may come from worker threads
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects the labels {list(self.labelnames)}, got {list(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def _samples(self, labels: dict[str, str], value: Any) -> list[str]:
+        """Return the exposition lines of one series."""
+
+    def render(self) -> str:
+        with self._lock:
+            series = sorted(self._series.items())
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in series:
+            lines.extend(self._samples(dict(zip(self.labelnames, key)), value))
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """A count that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def _samples(self, labels: dict[str, str], value: float) -> list[str]:
+        return [f"{self.name}{_format_labels(labels)} {value:g}"]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            bucket_counts, count, total = self._series.get(key, ((0,) * len(self.buckets), 0, 0.0))
+            bucket_counts = tuple(
+                bucket_count + (value <= bound)
+                for bucket_count, bound in zip(bucket_counts, self.buckets)
+            )
+            self._series[key] = (bucket_counts, count + 1, total + value)
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self, labels: dict[str, str], value: tuple[tuple[int, ...], int, float]) -> list[str]:
+        bucket_counts, count, total = value
+        samples = [
+            f"{self.name}_bucket{_format_labels({**labels, 'le': f'{bound:g}'})} {bucket_count}"
+            for bound, bucket_count in zip(self.buckets, bucket_counts)
+        ]
+        samples += [
+            f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}",
+            f"{self.name}_sum{_format_labels(labels)} {total:g}",
+            f"{self.name}_count{_format_labels(labels)} {count}",
+        ]
+        return samples
+
+
+def render_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    return "".join(metric.render() for metric in REGISTRY)
+
+
+TASK_LATENCY = Histogram(
+    "a2a_task_duration_seconds",
+    "End-to-end duration of A2A tasks.",
+    ("route", "status"),
+)
+QUEUE_WAIT = Histogram(
+    "a2a_queue_wait_seconds",
+    "Time requests wait for the agent to be built or for a free shard slot.",
+    ("stage",),
+)
+LLM_TURN_LATENCY = Histogram(
+    "llm_turn_duration_seconds",
+    "Duration of LLM calls, from the request to the complete response.",
+    ("model",),
+)
+TOOL_LATENCY = Histogram(
+    "tool_call_duration_seconds",
+    "Duration of agent tool calls, including MCP tools.",
+    ("tool",),
+)
+SESSION_LATENCY = Histogram(
+    "session_service_duration_seconds",
+    "Duration of session service calls made by the executor.",
+    ("operation",),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by LLM calls.",
+    ("model", "type"),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Lookups of the response caches, by result.",
+    ("cache", "result"),
+)
+FAILURES = Counter(
+    "failures_total",
+    "Failed tasks and tool calls.",
+    ("component",),
+)
+
+
+class MetricsPlugin(InvocationPlugin):
+    """ADK plugin recording LLM turn latency, token usage and tool call latency."""
+
+    # Only times tool calls, so MCPBatchingPlugin may start them early
+    may_skip_tools = False
+
+    def __init__(self):
+        super().__init__(name="metrics")
+        # Running LLM call of each invocation: model, start and end times, latest usage and error
+        self._llm_calls: dict[str, dict[str, Any]] = {}
+        # Start times of the running tool calls of each invocation, by function call id
+        self._tools_started: dict[str, dict[str, float]] = {}
+
+    def _end_llm_call(self, invocation_id: str) -> None:
+        call = self._llm_calls.pop(invocation_id, None)
+        if call is None or call["ended"] is None:
+            return
+
+        model = call["model"]
+        LLM_TURN_LATENCY.observe(call["ended"] - call["started"], model=model)
+        usage = call["usage"]
+        if usage:
+            for token_type, token_count in [
+                ("prompt", usage.prompt_token_count),
+                ("completion", usage.candidates_token_count),
+                ("thoughts", usage.thoughts_token_count),
+            ]:
+                if token_count:
+                    LLM_TOKENS.inc(token_count, model=model, type=token_type)
+        if call["failed"]:
+            FAILURES.inc(component="llm")
+
+    def close_invocation(self, invocation_id: str) -> None:
+        self._end_llm_call(invocation_id)
+        self._tools_started.pop(invocation_id, None)
+
+    async def before_model_callback(
+            self, *, callback_context: CallbackContext, llm_request: LlmRequest
+        ) -> Optional[LlmResponse]:
+        self._end_llm_call(callback_context.invocation_id)
+        self._llm_calls[callback_context.invocation_id] = {
+            "model": llm_request.model or "",
+            "started": time.perf_counter(),
+            "ended": None,
+            "usage": None,
+            "failed": False,
+        }
+        return None
+
+    async def after_model_callback(
+            self, *, callback_context: CallbackContext, llm_response: LlmResponse
+        ) -> Optional[LlmResponse]:
+        # Streamed calls report every partial chunk, then one or more complete responses
+        # (the aggregated text, then the function calls) carrying the same usage, so the
+        # call is counted once, from its last complete response, when it ends
+        if llm_response.partial:
+            return None
+
+        call = self._llm_calls.get(callback_context.invocation_id)
+        if call is None:
+            return None
+        call["ended"] = time.perf_counter()
+        if llm_response.usage_metadata:
+            call["usage"] = llm_response.usage_metadata
+        if llm_response.error_code:
+            call["failed"] = True
+        return None
+
+    async def before_tool_callback(
+            self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+        ) -> Optional[dict]:
+        self._tools_started.setdefault(tool_context.invocation_id, {})[
+            tool_context.function_call_id
+        ] = time.perf_counter()
+        return None
+
+    async def after_tool_callback(
+            self,
+            *,
+            tool: BaseTool,
+            tool_args: dict[str, Any],
+            tool_context: ToolContext,
+            result: dict,
+        ) -> Optional[dict]:
+        started = self._tools_started.get(tool_context.invocation_id, {}).pop(
+            tool_context.function_call_id, None
+        )
+        if started is not None:
+            TOOL_LATENCY.observe(time.perf_counter() - started, tool=tool.name)
+
+        # MCP tools report errors in the result instead of raising
+        if isinstance(result, dict) and (result.get("isError") or result.get("error")):
+            FAILURES.inc(component="tool")
+        return None
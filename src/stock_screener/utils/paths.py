@@ -3,7 +3,8 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent.parent
 CONFIGS_DIR = ROOT_DIR / "configs"
 # AGENTS_DIR = ROOT_DIR / "agents"
-# DATA_DIR = ROOT_DIR / "data"
+DATA_DIR = ROOT_DIR / "data"
+OHLCV_DIR = DATA_DIR / "ohlcv"
 # LOGS_DIR = ROOT_DIR / "logs"
 # MODELS_DIR = ROOT_DIR / "models"
 # UTILS_DIR = ROOT_DIR / "utils"
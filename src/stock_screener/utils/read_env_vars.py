@@ -14,8 +14,32 @@ class EnvVars:
 
         self.google_api_key = env_vars.get("secrets", {}).get("GOOGLE_API_KEY", "")
         self.mcp_urls = env_vars.get("mcp-urls", [])
-        agent_urls = env_vars.get("agent-urls", {})
-        self.agent_urls = [agent_urls[key] for key in agent_urls]
+        # An agent is given a list of URLs when it runs several replicas
+        agent_urls = {
+            key: urls if isinstance(urls, list) else [urls]
+            for key, urls in env_vars.get("agent-urls", {}).items()
+        }
+        self.agent_urls = [url for key in agent_urls for url in agent_urls[key]]
+        # Request timeouts of remote agents by URL, for agents listed under [agent-timeouts]
+        agent_timeouts = env_vars.get("agent-timeouts", {})
+        self.agent_timeouts = {
+            url: agent_timeouts[key]
+            for key in agent_timeouts if key in agent_urls
+            for url in agent_urls[key]
+        }
+        self.offline = env_vars.get("data", {}).get("OFFLINE", False)
+        self.data = env_vars.get("data", {})
+        self.a2a_server = env_vars.get("a2a-server", {})
+        self.sessions = env_vars.get("sessions", {})
+        self.tracing = env_vars.get("tracing", {})
+        self.host_agent = env_vars.get("host-agent", {})
+        self.tool_cache = env_vars.get("tool-cache", {})
+        self.mcp_pool = env_vars.get("mcp-pool", {})
+        self.mcp_batching = env_vars.get("mcp-batching", {})
+        self.mcp_recorder = env_vars.get("mcp-recorder", {})
+        self.mcp_replay = env_vars.get("mcp-replay", {})
+        # TTLs of MCP tool results in seconds, by tool name
+        self.tool_ttls = env_vars.get("tool-ttls", {})
     
     def export_google_api_key(self):
         """Export the Google API key."""
@@ -0,0 +1,40 @@
+"""ADK runner releasing the per-invocation state of its plugins however a run ends.
+
+ADK calls `after_run_callback` only when a run completes: a run that raises,
+is cancelled or is closed early by its consumer skips it. Plugins keeping
+state per invocation subclass `InvocationPlugin` and release it in
+`close_invocation`, which `ScopedRunner` calls in every case.
+"""
+
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import Session
+
+
+class InvocationPlugin(BasePlugin):
+    """Plugin keeping state per invocation."""
+
+    def close_invocation(self, invocation_id: str) -> None:
+        """Release the state of an invocation. Called once when its run ends, however it ends."""
+
+
+class ScopedRunner(Runner):
+    """Runner calling `close_invocation` on its plugins when each run ends."""
+
+    async def _exec_with_plugin(
+            self,
+            invocation_context: InvocationContext,
+            session: Session,
+            execute_fn: Callable[[InvocationContext], AsyncGenerator[Event, None]],
+        ) -> AsyncGenerator[Event, None]:
+        try:
+            async for event in super()._exec_with_plugin(invocation_context, session, execute_fn):
+                yield event
+        finally:
+            for plugin in invocation_context.plugin_manager.plugins:
+                if isinstance(plugin, InvocationPlugin):
+                    plugin.close_invocation(invocation_context.invocation_id)
@@ -0,0 +1,331 @@
+import hashlib
+import json
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+from pydantic import PrivateAttr
+
+from stock_screener.utils.paths import DATA_DIR
+from stock_screener.utils.read_env_vars import ENV
+
+
+SessionKey = tuple[str, str, str]
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory session service with LRU + TTL eviction and a memory cap.
+
+    Sessions idle for longer than the TTL are evicted, and so are the least
+    recently used ones when there are more than `max_sessions` sessions or
+    their estimated size exceeds `max_bytes`. If `spill_dir` is set, evicted
+    sessions are spilled to disk with zlib compression and restored
+    transparently the next time they are requested. Spilled sessions that
+    are not requested within `spill_ttl_seconds` are deleted.
+    """
+
+    def __init__(
+            self,
+            max_sessions: int = ENV.sessions.get("MAX_SESSIONS", 1000),
+            ttl_seconds: float = ENV.sessions.get("TTL_MINUTES", 60) * 60,
+            max_bytes: int = ENV.sessions.get("MAX_MEGABYTES", 256) * 1024 * 1024,
+            spill_dir: Union[str, Path, None] = (
+                DATA_DIR / "sessions" if ENV.sessions.get("SPILL_TO_DISK", False) else None
+            ),
+            spill_ttl_seconds: float = ENV.sessions.get("SPILL_TTL_HOURS", 24) * 3600,
+            sweep_interval: float = 600,
+        ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+        # Least recently used first, values are the last access times
+        self._lru: OrderedDict[SessionKey, float] = OrderedDict()
+        self._sizes: dict[SessionKey, int] = {}
+        self._total_bytes = 0
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "evicted_ttl": 0,
+            "evicted_lru": 0,
+            "evicted_memory": 0,
+            "spilled": 0,
+            "restored": 0,
+            "spill_expired": 0,
+        }
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the eviction counters and current usage."""
+        return {
+            **self.counters,
+            "sessions": len(self._lru),
+            "bytes": self._total_bytes,
+        }
+
+    def _spill_path(self, key: SessionKey) -> Path:
+        # Session ids come from clients, so they are hashed rather than used as paths
+        digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+        return self.spill_dir / f"{digest}.json.z"
+
+    def _touch(self, key: SessionKey, size_delta: int = 0) -> None:
+        self._lru[key] = time.monotonic()
+        self._lru.move_to_end(key)
+        self._sizes[key] = self._sizes.get(key, 0) + size_delta
+        self._total_bytes += size_delta
+
+    def _forget(self, key: SessionKey) -> Optional[Session]:
+        """Remove a session from memory and the bookkeeping, returning it."""
+        app_name, user_id, session_id = key
+        self._lru.pop(key, None)
+        self._total_bytes -= self._sizes.pop(key, 0)
+        return self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+
+    def _spill(self, key: SessionKey, session: Session) -> None:
+        path = self._spill_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(zlib.compress(session.model_dump_json().encode()))
+        self.counters["spilled"] += 1
+
+    def _evict(self, key: SessionKey, counter: str) -> None:
+        session = self._forget(key)
+        self.counters[counter] += 1
+        if session is not None and self.spill_dir:
+            self._spill(key, session)
+
+    def _sweep_spilled(self) -> None:
+        """Delete spilled sessions that were not restored within the spill TTL."""
+        self._last_sweep = time.monotonic()
+        if not self.spill_dir or not self.spill_dir.exists():
+            return
+
+        cutoff = time.time() - self.spill_ttl_seconds
+        for path in self.spill_dir.glob("*.json.z"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    self.counters["spill_expired"] += 1
+            except FileNotFoundError:
+                pass
+
+    def _restore(self, key: SessionKey) -> bool:
+        """Load a spilled session back into memory."""
+        if not self.spill_dir:
+            return False
+
+        path = self._spill_path(key)
+        try:
+            if path.stat().st_mtime < time.time() - self.spill_ttl_seconds:
+                path.unlink()
+                self.counters["spill_expired"] += 1
+                return False
+        except FileNotFoundError:
+            return False
+
+        data = zlib.decompress(path.read_bytes())
+        path.unlink()
+        session = Session.model_validate_json(data)
+
+        app_name, user_id, session_id = key
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = session
+        self._touch(key, len(data))
+        self.counters["restored"] += 1
+        return True
+
+    def _enforce_limits(self) -> None:
+        now = time.monotonic()
+
+        # Oldest first, so expired sessions are at the front
+        while self._lru:
+            key, last_access = next(iter(self._lru.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._evict(key, "evicted_ttl")
+
+        while len(self._lru) > self.max_sessions or (
+            self._total_bytes > self.max_bytes and len(self._lru) > 1
+        ):
+            counter = "evicted_lru" if len(self._lru) > self.max_sessions else "evicted_memory"
+            self._evict(next(iter(self._lru)), counter)
+
+        if self.spill_dir and now - self._last_sweep > self.sweep_interval:
+            self._sweep_spilled()
+
+    async def create_session(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            state: Optional[dict[str, Any]] = None,
+            session_id: Optional[str] = None,
+        ) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._touch((app_name, user_id, session.id), len(session.model_dump_json()))
+        self._enforce_limits()
+        return session
+
+    async def get_session(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            session_id: str,
+            config: Optional[GetSessionConfig] = None,
+        ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        self._enforce_limits()
+
+        if key in self._lru:
+            self.counters["hits"] += 1
+            self._touch(key)
+        elif self._restore(key):
+            self._enforce_limits()
+        else:
+            self.counters["misses"] += 1
+
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def delete_session(
+            self, *, app_name: str, user_id: str, session_id: str
+        ) -> None:
+        key = (app_name, user_id, session_id)
+        self._forget(key)
+        if self.spill_dir:
+            self._spill_path(key).unlink(missing_ok=True)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        # The session may have been spilled while the agent was running
+        if key not in self._lru:
+            self._restore(key)
+
+        event = await super().append_event(session=session, event=event)
+        if key in self._lru:
+            self._touch(key, len(event.model_dump_json()))
+            self._enforce_limits()
+        return event
+
+
+class BoundedArtifactService(InMemoryArtifactService):
+    """In-memory artifact service with LRU + TTL eviction and a memory cap."""
+
+    max_artifacts: int = ENV.sessions.get("MAX_ARTIFACTS", 1000)
+    ttl_seconds: float = ENV.sessions.get("TTL_MINUTES", 60) * 60
+    max_bytes: int = ENV.sessions.get("MAX_MEGABYTES", 256) * 1024 * 1024
+
+    _lru: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _sizes: dict = PrivateAttr(default_factory=dict)
+    _total_bytes: int = PrivateAttr(default=0)
+    _counters: dict = PrivateAttr(
+        default_factory=lambda: {"evicted_ttl": 0, "evicted_lru": 0, "evicted_memory": 0}
+    )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the eviction counters and current usage."""
+        return {
+            **self._counters,
+            "artifacts": len(self._lru),
+            "bytes": self._total_bytes,
+        }
+
+    @staticmethod
+    def _part_size(artifact: types.Part) -> int:
+        if artifact.inline_data and artifact.inline_data.data:
+            return len(artifact.inline_data.data)
+        if artifact.text:
+            return len(artifact.text)
+        return len(artifact.model_dump_json())
+
+    def _forget(self, path: str) -> None:
+        self._lru.pop(path, None)
+        self._total_bytes -= self._sizes.pop(path, 0)
+        self.artifacts.pop(path, None)
+
+    def _enforce_limits(self) -> None:
+        now = time.monotonic()
+
+        while self._lru:
+            path, last_access = next(iter(self._lru.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._forget(path)
+            self._counters["evicted_ttl"] += 1
+
+        while len(self._lru) > self.max_artifacts or (
+            self._total_bytes > self.max_bytes and len(self._lru) > 1
+        ):
+            counter = "evicted_lru" if len(self._lru) > self.max_artifacts else "evicted_memory"
+            self._forget(next(iter(self._lru)))
+            self._counters[counter] += 1
+
+    async def save_artifact(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            session_id: str,
+            filename: str,
+            artifact: types.Part,
+        ) -> int:
+        version = await super().save_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            artifact=artifact,
+        )
+
+        path = self._artifact_path(app_name, user_id, session_id, filename)
+        size = self._part_size(artifact)
+        self._lru[path] = time.monotonic()
+        self._lru.move_to_end(path)
+        self._sizes[path] = self._sizes.get(path, 0) + size
+        self._total_bytes += size
+        self._enforce_limits()
+        return version
+
+    async def load_artifact(
+            self,
+            *,
+            app_name: str,
+            user_id: str,
+            session_id: str,
+            filename: str,
+            version: Optional[int] = None,
+        ) -> Optional[types.Part]:
+        self._enforce_limits()
+
+        path = self._artifact_path(app_name, user_id, session_id, filename)
+        if path in self._lru:
+            self._lru[path] = time.monotonic()
+            self._lru.move_to_end(path)
+
+        return await super().load_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            version=version,
+        )
+
+    async def delete_artifact(
+            self, *, app_name: str, user_id: str, session_id: str, filename: str
+        ) -> None:
+        self._forget(self._artifact_path(app_name, user_id, session_id, filename))
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from mcp.types import CallToolResult
+
+from stock_screener.utils.metrics import CACHE_REQUESTS
+from stock_screener.utils.paths import DATA_DIR
+from stock_screener.utils.read_env_vars import ENV
+
+
+# Seconds a tool result stays valid, overridden by [tool-ttls]. Tools that are
+# not listed are not cached.
+DEFAULT_TOOL_TTLS = {
+    "get_ticker_financials": 6 * 3600,
+    "get_gross_margins": 6 * 3600,
+    "get_stock_info": 15 * 60,
+    "get_market_cap": 5 * 60,
+    "screen_stocks": 5 * 60,
+    "get_technical_signals": 5 * 60,
+    "screen_bullish_stocks": 5 * 60,
+    "get_news": 30,
+}
+
+_default_cache_lock = threading.Lock()
+_default_cache: Optional["ToolResultCache"] = None
+
+
+def tool_key(tool_name: str, args: dict) -> str:
+    """Return the cache key of a tool call, the same for any order of the arguments."""
+    return json.dumps([tool_name, args], sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ToolResultCache:
+    """Two-tier cache of MCP tool results with per-tool TTLs.
+
+    The memory tier is an LRU of at most `max_entries` results. The optional
+    disk tier is a SQLite database in WAL mode, shared by every process on the
+    host, so the Streamlit app, the host agent and the A2A servers reuse each
+    other's results. Expired rows are deleted at startup and, at most every
+    `sweep_interval` seconds, when a result is written. Error results are
+    never cached.
+
+    The disk tier is queried in worker threads, so an SQLite write lock held
+    by another process never blocks the event loop.
+    """
+
+    def __init__(
+            self,
+            ttls: Optional[dict[str, float]] = None,
+            max_entries: int = ENV.tool_cache.get("MAX_ENTRIES", 2048),
+            db_path: Optional[Union[str, Path]] = None,
+            sweep_interval: float = ENV.tool_cache.get("SWEEP_SECONDS", 600),
+        ):
+        self.ttls = {**DEFAULT_TOOL_TTLS, **ENV.tool_ttls} if ttls is None else ttls
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CallToolResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Guards the connection, the memory tier never waits for it
+        self._db_lock = threading.Lock()
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tool_results (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tool_results_expires_at ON tool_results (expires_at)"
+            )
+            with self._db_lock:
+                self._evict_disk(time.time())
+
+    def ttl(self, tool_name: str) -> float:
+        """Return the TTL of a tool's results in seconds, 0 if they are not cached."""
+        return self.ttls.get(tool_name, 0)
+
+    def _evict_disk(self, now: float) -> None:
+        """Delete the expired results of the disk tier. Must be called with the db lock held."""
+        self._conn.execute("DELETE FROM tool_results WHERE expires_at <= ?", (now,))
+        self._last_sweep = now
+
+    def _remember(self, key: str, result: CallToolResult, expires_at: float) -> None:
+        """Add a result to the memory tier. Must be called with the lock held."""
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str, now: float) -> Optional[tuple[CallToolResult, float]]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT result, expires_at FROM tool_results WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return CallToolResult.model_validate_json(row[0]), row[1]
+
+    def _write_disk(self, key: str, result: str, expires_at: float, now: float) -> None:
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, result, expires_at) VALUES (?, ?, ?)",
+                (key, result, expires_at),
+            )
+            if now - self._last_sweep >= self.sweep_interval:
+                self._evict_disk(now)
+
+    async def get(self, key: str) -> Optional[CallToolResult]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.inc(cache="tool_memory", result="hit")
+                return entry[1]
+            self._entries.pop(key, None)
+            CACHE_REQUESTS.inc(cache="tool_memory", result="miss")
+
+        if self._conn is None:
+            return None
+        found = await asyncio.to_thread(self._read_disk, key, now)
+        if found is None:
+            CACHE_REQUESTS.inc(cache="tool_disk", result="miss")
+            return None
+        CACHE_REQUESTS.inc(cache="tool_disk", result="hit")
+        result, expires_at = found
+        with self._lock:
+            self._remember(key, result, expires_at)
+        return result
+
+    async def put(self, key: str, result: CallToolResult, ttl: float) -> None:
+        if result.isError or ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(key, result, expires_at)
+        if self._conn is not None:
+            await asyncio.to_thread(
+                self._write_disk, key, result.model_dump_json(exclude_none=True), expires_at, now
+            )
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """Return the tool result cache shared by all toolsets of this process, or None when disabled."""
+    global _default_cache
+
+    if not ENV.tool_cache.get("ENABLED", True):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            db_path = None
+            if ENV.tool_cache.get("DISK", False):
+                db_path = ENV.tool_cache.get("DISK_PATH") or DATA_DIR / "tool_cache.db"
+            _default_cache = ToolResultCache(db_path=db_path)
+    return _default_cache
@@ -0,0 +1,176 @@
+"""Distributed tracing with OpenTelemetry.
+
+ADK already opens spans for every agent invocation, LLM call and tool call.
+This module installs a tracer provider that exports them, and propagates the
+W3C trace context through A2A message metadata and MCP request `_meta`, so a
+host agent question, the remote agent task and its MCP tool calls end up in
+one trace.
+"""
+
+import json
+import sys
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Mapping, Optional, Sequence, Union
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from stock_screener.utils.paths import DATA_DIR
+from stock_screener.utils.read_env_vars import ENV
+
+
+TRACES_PATH = DATA_DIR / "traces" / "spans.jsonl"
+
+TRACER = trace.get_tracer("stock_screener")
+
+_provider_lock = threading.Lock()
+_provider: Optional[TracerProvider] = None
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Append finished spans to a JSON Lines file, one span per line."""
+
+    def __init__(self, path: Union[str, Path] = TRACES_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _to_dict(span: ReadableSpan) -> dict:
+        return {
+            "trace_id": format(span.context.trace_id, "032x"),
+            "span_id": format(span.context.span_id, "016x"),
+            "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+            "name": span.name,
+            "service": span.resource.attributes.get("service.name"),
+            "start_ns": span.start_time,
+            "end_ns": span.end_time,
+            "duration_ms": (span.end_time - span.start_time) / 1e6,
+            "status": span.status.status_code.name,
+            "attributes": dict(span.attributes or {}),
+        }
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(self._to_dict(span), default=str) + "\n" for span in spans)
+        try:
+            # Workers share the file, so each batch is appended in one write
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"ERROR: Failed to export spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build_exporter(name: str) -> SpanExporter:
+    """Return the span exporter configured under [tracing]."""
+    if name == "jsonl":
+        return JsonlSpanExporter(ENV.tracing.get("JSONL_PATH") or TRACES_PATH)
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise ImportError(
+                "The otlp exporter needs the opentelemetry-exporter-otlp-proto-http package"
+            ) from e
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown span exporter: {name}, expected jsonl, console or otlp")
+
+
+def setup_tracing(
+        service_name: str,
+        exporter: Optional[SpanExporter] = None,
+        enabled: bool = ENV.tracing.get("ENABLED", False),
+    ) -> Optional[TracerProvider]:
+    """Install a tracer provider that sends spans to `exporter`.
+
+    The exporter defaults to the one configured under [tracing]. Does nothing
+    when tracing is disabled, or when this process already set up tracing.
+    """
+    global _provider
+
+    if not enabled and exporter is None:
+        return None
+
+    with _provider_lock:
+        if _provider is None:
+            _provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            _provider.add_span_processor(
+                BatchSpanProcessor(exporter or _build_exporter(ENV.tracing.get("EXPORTER", "jsonl")))
+            )
+            trace.set_tracer_provider(_provider)
+            print(f"Tracing enabled for {service_name}.")
+    return _provider
+
+
+def inject_trace_context(carrier: Optional[dict] = None) -> dict:
+    """Add the current trace context (traceparent, tracestate) to `carrier` and return it."""
+    carrier = {} if carrier is None else carrier
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_trace_context(carrier: Optional[Mapping]) -> otel_context.Context:
+    """Return the trace context sent in `carrier`, or the current context if there is none."""
+    if not carrier:
+        return otel_context.get_current()
+    return propagate.extract({key: value for key, value in carrier.items() if isinstance(value, str)})
+
+
+def print_waterfall(path: Union[str, Path] = TRACES_PATH, trace_id: Optional[str] = None) -> None:
+    """Print a trace from a JSONL span file as an indented waterfall.
+
+    Prints the most recently started trace when `trace_id` is not given.
+    """
+    spans = [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines() if line]
+    if not spans:
+        print(f"No spans in {path}")
+        return
+
+    if trace_id is None:
+        trace_id = max(spans, key=lambda span: span["start_ns"])["trace_id"]
+    spans = [span for span in spans if span["trace_id"] == trace_id]
+    if not spans:
+        print(f"No spans of trace {trace_id} in {path}")
+        return
+
+    span_ids = {span["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        # Spans whose parent was not exported are shown as roots
+        parent = span["parent_id"] if span["parent_id"] in span_ids else None
+        children[parent].append(span)
+
+    trace_start = min(span["start_ns"] for span in spans)
+    print(f"Trace {trace_id}")
+
+    def show(parent: Optional[str], depth: int) -> None:
+        for span in sorted(children[parent], key=lambda span: span["start_ns"]):
+            offset_ms = (span["start_ns"] - trace_start) / 1e6
+            print(
+                f"{offset_ms:>10.1f} ms {span['duration_ms']:>10.1f} ms  "
+                f"{'  ' * depth}{span['name']} [{span['service']}]"
+            )
+            show(span["span_id"], depth + 1)
+
+    show(None, 0)
+
+
+if __name__ == "__main__":
+
+    print_waterfall(trace_id=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+
+from a2a.types import DataPart, Part, TextPart
+from google.adk.sessions import InMemorySessionService
+
+from stock_screener.a2a_server.agent_executor import TechAnalystAgentExecutor
+
+
+class Updater:
+    """Records the artifact chunks written to a task."""
+
+    def __init__(self):
+        self.artifacts = []
+
+    async def add_artifact(self, parts, artifact_id, name, append, last_chunk):
+        self.artifacts.append((name, [part.root for part in parts], append, last_chunk))
+
+
+def text(value: str) -> list[Part]:
+    return [Part(root=TextPart(text=value))]
+
+
+async def chunks(*items):
+    for item in items:
+        yield item
+
+
+def executor(**kwargs) -> TechAnalystAgentExecutor:
+    executor = TechAnalystAgentExecutor(**kwargs)
+    executor.artifact_name = "response"
+    return executor
+
+
+async def test_emit_replaces_streamed_text_with_whole_text():
+    updater = Updater()
+    answer = await executor()._emit(chunks(
+        ("response", text("Hel"), False),
+        ("signals", [Part(root=DataPart(data={"tool": "t"}))], False),
+        ("response", text("lo"), False),
+        ("signals", [Part(root=DataPart(data={}))], True),
+        ("response", text("\n"), True),
+    ), updater)
+
+    assert answer == "Hello\n"
+    response = [chunk for chunk in updater.artifacts if chunk[0] == "response"]
+    assert [(parts[0].text, append, last) for _, parts, append, last in response] == [
+        ("Hel", False, False),
+        ("lo", True, False),
+        ("Hello\n", False, True),
+    ]
+    # Artifacts with other parts are only appended to
+    signals = [chunk for chunk in updater.artifacts if chunk[0] == "signals"]
+    assert [(append, last) for _, _, append, last in signals] == [(False, False), (True, True)]
+
+
+async def test_emit_keeps_single_chunk():
+    updater = Updater()
+    await executor()._emit(chunks(("response", text("table"), True)), updater)
+    assert [(parts[0].text, append) for _, parts, append, _ in updater.artifacts] == [("table", False)]
+
+
+async def test_warm_up_retried_until_it_succeeds():
+    warming = TechAnalystAgentExecutor(warmup_retry_seconds=0.001, warmup_max_retry_seconds=0.002)
+    attempts = []
+
+    async def warm_up_once(prime_ticker):
+        attempts.append(warming.warmup_error)
+        if len(attempts) < 3:
+            raise ConnectionError("MCP server is not up")
+        warming.ready = True
+        warming.warmup_error = None
+
+    warming._warm_up_once = warm_up_once
+    await warming.warm_up()
+
+    assert attempts == [None, "MCP server is not up", "MCP server is not up"]
+    assert warming.ready
+    assert warming.warmup_error is None
+
+
+async def test_concurrent_sharded_runs_use_their_own_sessions():
+    sharded = executor(shard_size=1)
+    created, deleted = [], []
+
+    async def collect_response(query, user_id, session_id):
+        created.append(session_id)
+        await asyncio.sleep(0.01)
+        return f"| {query.split(': ')[1].split('.')[0]} | bullish | - |"
+
+    async def delete_session(app_name, user_id, session_id):
+        deleted.append(session_id)
+
+    sharded._collect_response = collect_response
+    sharded.runner = SimpleNamespace(
+        app_name="app", session_service=SimpleNamespace(delete_session=delete_session)
+    )
+
+    async def screen(tickers):
+        return [chunk async for chunk in sharded._sharded_chunks(tickers, "user", "ctx")]
+
+    await asyncio.gather(screen(["TSLA", "INTC"]), screen(["TSLA", "META", "AMD"]))
+
+    assert len(created) == len(set(created)) == 5
+    assert sorted(deleted) == sorted(created)
+
+
+async def test_fast_path_answer_added_to_the_conversation():
+    routed = executor(coalesce=False)
+    routed.agent = SimpleNamespace(name="TechnicalAnalystAgent")
+    routed.runner = SimpleNamespace(app_name="app", session_service=InMemorySessionService())
+
+    async def fast_path_chunks(tickers):
+        yield "response", text(f"| {tickers[0]} | bearish |\n"), True
+
+    routed._fast_path_chunks = fast_path_chunks
+    context = SimpleNamespace(message=None, get_user_input=lambda: "Run technical analysis for stock TSLA")
+
+    assert await routed._respond(context, "user", "ctx", Updater()) == "fast_path"
+
+    session = await routed.runner.session_service.get_session(
+        app_name="app", user_id="user", session_id="ctx"
+    )
+    assert [(event.author, event.content.parts[0].text) for event in session.events] == [
+        ("user", "Run technical analysis for stock TSLA"),
+        ("TechnicalAnalystAgent", "| TSLA | bearish |\n"),
+    ]
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from stock_screener.a2a_server.coalescing import SingleFlight
+
+
+class Computation:
+    """Counts its runs and yields items once released."""
+
+    def __init__(self, items=("a", "b", "c"), error: Exception | None = None):
+        self.items = items
+        self.error = error
+        self.runs = 0
+        self.closed = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        try:
+            for item in self.items:
+                await self.release.wait()
+                yield item
+            if self.error:
+                raise self.error
+        finally:
+            self.closed += 1
+
+
+async def collect(items) -> list:
+    return [item async for item in items]
+
+
+async def test_concurrent_subscribers_share_one_run():
+    flight = SingleFlight()
+    computation = Computation()
+
+    first = asyncio.create_task(collect(flight.subscribe("key", computation)))
+    await asyncio.sleep(0)
+    assert flight.in_flight("key")
+    second = asyncio.create_task(collect(flight.subscribe("key", computation)))
+    computation.release.set()
+
+    assert await first == ["a", "b", "c"]
+    assert await second == ["a", "b", "c"]
+    assert computation.runs == 1
+    assert flight.stats == {"started": 1, "coalesced": 1, "in_flight": 0}
+
+
+async def test_late_subscriber_gets_earlier_items():
+    flight = SingleFlight()
+    computation = Computation()
+    computation.release.set()
+
+    first = flight.subscribe("key", computation)
+    assert await anext(first) == "a"
+    assert await collect(flight.subscribe("key", computation)) == ["a", "b", "c"]
+    assert await collect(first) == ["b", "c"]
+
+
+async def test_finished_runs_are_not_reused():
+    flight = SingleFlight()
+    computation = Computation()
+    computation.release.set()
+
+    await collect(flight.subscribe("key", computation))
+    await asyncio.sleep(0)
+    await collect(flight.subscribe("key", computation))
+
+    assert computation.runs == 2
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+    computation = Computation()
+    computation.release.set()
+
+    await asyncio.gather(
+        collect(flight.subscribe("a", computation)),
+        collect(flight.subscribe("b", computation)),
+    )
+    assert computation.runs == 2
+
+
+async def test_errors_reach_every_subscriber():
+    flight = SingleFlight()
+    computation = Computation(error=RuntimeError("boom"))
+
+    subscribers = [asyncio.create_task(collect(flight.subscribe("key", computation))) for _ in range(2)]
+    await asyncio.sleep(0)
+    computation.release.set()
+
+    for subscriber in subscribers:
+        with pytest.raises(RuntimeError, match="boom"):
+            await subscriber
+
+
+async def test_run_continues_while_a_subscriber_remains():
+    flight = SingleFlight()
+    computation = Computation()
+
+    leaving = asyncio.create_task(collect(flight.subscribe("key", computation)))
+    staying = asyncio.create_task(collect(flight.subscribe("key", computation)))
+    await asyncio.sleep(0)
+    leaving.cancel()
+    await asyncio.sleep(0)
+    computation.release.set()
+
+    assert await staying == ["a", "b", "c"]
+    assert computation.runs == 1
+
+
+async def test_run_is_canceled_when_the_last_subscriber_leaves():
+    flight = SingleFlight()
+    computation = Computation()
+
+    subscriber = asyncio.create_task(collect(flight.subscribe("key", computation)))
+    await asyncio.sleep(0.01)
+    subscriber.cancel()
+    await asyncio.sleep(0.01)
+
+    assert computation.closed == 1
+    assert not flight.in_flight("key")
+
+
+async def test_canceled_run_is_not_joined_while_it_finishes():
+    flight = SingleFlight()
+    runs = []
+
+    def start():
+        runs.append(len(runs))
+
+        async def items(run=runs[-1]):
+            yield "a"
+            if run == 0:
+                await asyncio.Event().wait()
+        return items()
+
+    first = flight.subscribe("key", start)
+    assert await anext(first) == "a"
+    # The last subscriber leaves: the run is canceled but has not finished yet
+    await first.aclose()
+    assert not flight.in_flight("key")
+
+    assert await collect(flight.subscribe("key", start)) == ["a"]
+    assert len(runs) == 2
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+
+from stock_screener.a2a_client.card_cache import AgentCardCache
+from stock_screener.a2a_client.host_agent import HostAgent
+
+
+def card(name: str, url: str) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f"{name} agent",
+        url=url,
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    )
+
+
+class FlakyAgents:
+    """Card resolver where each address answers after failing a number of times."""
+
+    def __init__(self, failures: dict[str, int]):
+        self.failures = failures
+        self.calls: dict[str, int] = {}
+
+    async def __call__(self, client, address: str) -> AgentCard | None:
+        self.calls[address] = self.calls.get(address, 0) + 1
+        if self.calls[address] <= self.failures[address]:
+            return None
+        return card(address.rsplit(":", 1)[-1], address)
+
+
+async def start(tmp_path, failures: dict[str, int]) -> tuple[HostAgent, FlakyAgents]:
+    host = HostAgent(
+        card_cache=AgentCardCache(tmp_path / "cards.json"),
+        response_cache=None,
+        card_retry_seconds=0.01,
+    )
+    agents = FlakyAgents(failures)
+    host._resolve_card = agents
+    await host._async_init_components(list(failures))
+    return host, agents
+
+
+async def test_unanswered_agents_retried_until_they_answer(tmp_path):
+    host, agents = await start(tmp_path, {"http://a:1": 0, "http://b:2": 3})
+    assert set(host.cards) == {"1"}
+
+    await asyncio.wait_for(host._refresh_task, timeout=5)
+    assert set(host.cards) == {"1", "2"}
+    assert agents.calls["http://b:2"] == 4
+    assert host._stale_addresses == []
+    assert '"name": "2"' in host.agents
+    await host.aclose()
+
+
+async def test_refresh_restarted_on_the_serving_loop(tmp_path):
+    host, agents = await start(tmp_path, {"http://b:2": 1000})
+    # The loop of a synchronous startup stops and cancels the refresh
+    host._refresh_task.cancel()
+    await asyncio.sleep(0)
+
+    agents.failures["http://b:2"] = 0
+    host._ensure_card_refresh()
+    await asyncio.wait_for(host._refresh_task, timeout=5)
+    assert set(host.cards) == {"2"}
+    await host.aclose()
+
+
+async def test_aclose_stops_the_refresh(tmp_path):
+    host, _ = await start(tmp_path, {"http://b:2": 1000})
+    task = host._refresh_task
+    await host.aclose()
+    assert task.cancelled()
+
+
+async def test_refresh_restarted_when_the_startup_loop_is_blocked(tmp_path):
+    # Like main() of the Gradio app: the startup loop blocks in launch()
+    # while requests are served by another loop
+    started, release = threading.Event(), threading.Event()
+    created = {}
+
+    async def startup():
+        created["host"], created["agents"] = await start(tmp_path, {"http://b:2": 1000})
+        started.set()
+        release.wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(startup(),))
+    thread.start()
+    try:
+        assert await asyncio.to_thread(started.wait, 5)
+        host, agents = created["host"], created["agents"]
+        stuck = host._refresh_task
+        assert not stuck.done()
+
+        agents.failures["http://b:2"] = 0
+        host._ensure_card_refresh()
+        assert host._refresh_task is not stuck
+        await asyncio.wait_for(host._refresh_task, timeout=5)
+        assert set(host.cards) == {"2"}
+    finally:
+        release.set()
+        await asyncio.to_thread(thread.join, 5)
+    # Canceled, or finished once the startup loop ran again with nothing left to refresh
+    assert stuck.done()
+    await host.aclose()
+
+
+def delegating_host(tmp_path, answers: dict[str, float]) -> tuple[HostAgent, list, list]:
+    """Host whose delegations answer after the given seconds."""
+    host = HostAgent(
+        card_cache=AgentCardCache(tmp_path / "cards.json"), response_cache=None, batch_deadline=0.05
+    )
+    host.remote_agent_connections = {name: object() for name in answers}
+    started, stopped = [], []
+
+    async def delegate(agent_name, task, state, context_id, message_id):
+        started.append(agent_name)
+        try:
+            await asyncio.sleep(answers[agent_name])
+        except asyncio.CancelledError:
+            stopped.append(agent_name)
+            raise
+        return f"{agent_name} done"
+
+    host._delegate = delegate
+    return host, started, stopped
+
+
+async def test_late_delegations_are_stopped(tmp_path):
+    host, _, stopped = delegating_host(tmp_path, {"fast": 0, "slow": 10})
+    results = await host.send_messages(["fast", "slow"], ["a", "b"], SimpleNamespace(state={}))
+
+    assert results[0]["result"] == "fast done"
+    assert "No answer" in results[1]["error"]
+    assert stopped == ["slow"]
+
+
+async def test_delegations_stopped_when_the_call_is_canceled(tmp_path):
+    host, started, stopped = delegating_host(tmp_path, {"a": 10, "b": 10})
+    call = asyncio.create_task(host.send_messages(["a", "b"], ["x", "y"], SimpleNamespace(state={})))
+    while len(started) < 2:
+        await asyncio.sleep(0)
+    call.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert sorted(stopped) == ["a", "b"]
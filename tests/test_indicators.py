@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_screener.indicators.engine import (
+    atr,
+    bollinger_bands,
+    classify_signals,
+    compute_indicators,
+    ema,
+    latest_values,
+    macd,
+    rsi,
+    sma,
+)
+
+
+@pytest.fixture
+def prices():
+    """Random-walk prices of three tickers, the last one with a shorter history."""
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, size=(3, 260)), axis=1)
+    close[2, :60] = np.nan
+    high = close + rng.uniform(0, 2, size=close.shape)
+    low = close - rng.uniform(0, 2, size=close.shape)
+    return close, high, low
+
+
+def assert_rows_equal(actual: np.ndarray, expected: list[pd.Series]) -> None:
+    for row, series in zip(actual, expected):
+        np.testing.assert_allclose(row, series.to_numpy(dtype=float), rtol=1e-9, atol=1e-9)
+
+
+def test_sma_matches_pandas(prices):
+    close, _, _ = prices
+    expected = [pd.Series(row).rolling(50).mean() for row in close]
+    assert_rows_equal(sma(close, 50), expected)
+
+
+def test_sma_longer_than_history_is_nan():
+    assert np.isnan(sma(np.arange(10.0), 20)).all()
+
+
+def test_ema_matches_pandas(prices):
+    close, _, _ = prices
+    expected = [pd.Series(row).ewm(span=20, adjust=False).mean() for row in close]
+    assert_rows_equal(ema(close, 20), expected)
+
+
+def test_rsi_matches_pandas(prices):
+    close, _, _ = prices
+    expected = []
+    for row in close:
+        delta = pd.Series(row).diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        series = 100 - 100 / (1 + gain / loss)
+        # The engine only reports values once a full period of changes was seen
+        series[delta.notna().cumsum() < 14] = np.nan
+        expected.append(series)
+    assert_rows_equal(rsi(close, 14), expected)
+
+
+def test_rsi_of_rising_prices_is_100():
+    values = rsi(np.arange(1.0, 31.0), 14)
+    assert np.isnan(values[0, :14]).all()
+    np.testing.assert_array_equal(values[0, 14:], 100.0)
+
+
+def test_macd_matches_pandas(prices):
+    close, _, _ = prices
+    macd_line, signal_line, hist = macd(close)
+
+    expected_macd, expected_signal = [], []
+    for row in close:
+        series = pd.Series(row)
+        line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+        expected_macd.append(line)
+        expected_signal.append(line.ewm(span=9, adjust=False).mean())
+
+    assert_rows_equal(macd_line, expected_macd)
+    assert_rows_equal(signal_line, expected_signal)
+    np.testing.assert_allclose(hist, macd_line - signal_line)
+
+
+def test_bollinger_bands_match_pandas(prices):
+    close, _, _ = prices
+    middle, upper, lower = bollinger_bands(close, 20, 2.0)
+
+    rolling = [pd.Series(row).rolling(20) for row in close]
+    assert_rows_equal(middle, [r.mean() for r in rolling])
+    assert_rows_equal(upper, [r.mean() + 2 * r.std(ddof=0) for r in rolling])
+    assert_rows_equal(lower, [r.mean() - 2 * r.std(ddof=0) for r in rolling])
+
+
+def test_atr_matches_pandas(prices):
+    close, high, low = prices
+    expected = []
+    for h, l_, c in zip(high, low, close):
+        h, l_, c = pd.Series(h), pd.Series(l_), pd.Series(c)
+        previous_close = c.shift(1)
+        true_range = pd.concat(
+            [h - l_, (h - previous_close).abs(), (l_ - previous_close).abs()], axis=1
+        ).max(axis=1)
+        expected.append(true_range.ewm(alpha=1 / 14, adjust=False).mean())
+    assert_rows_equal(atr(high, low, close, 14), expected)
+
+
+def test_compute_indicators_rejects_unknown_names(prices):
+    close, _, _ = prices
+    with pytest.raises(ValueError, match="Unknown indicators"):
+        compute_indicators(close, indicators=("sma_50", "vwap"))
+
+
+def test_latest_values_skip_trailing_nan():
+    series = np.array([
+        [1.0, 2.0, np.nan],
+        [np.nan, np.nan, np.nan],
+    ])
+    latest = latest_values({"close": series})["close"]
+    assert latest[0] == 2.0
+    assert np.isnan(latest[1])
+
+
+def test_classify_signals():
+    latest = {
+        "close": np.array([110.0, 90.0, 100.0]),
+        "sma_50": np.array([100.0, 100.0, 100.0]),
+        "sma_200": np.array([90.0, 110.0, np.nan]),
+        "macd_hist": np.array([1.0, -1.0, 0.0]),
+        "rsi_14": np.array([60.0, 40.0, 50.0]),
+    }
+    assert classify_signals(latest).tolist() == ["bullish", "bearish", "neutral"]
@@ -0,0 +1,89 @@
+import datetime as dt
+
+import pytest
+
+from stock_screener.utils.market_hours import (
+    MARKET_TZ,
+    holidays,
+    is_market_open,
+    is_trading_day,
+    next_open,
+    previous_trading_day,
+    seconds_until_next_open,
+)
+
+
+def at(year: int, month: int, day: int, hour: int = 12, minute: int = 0) -> dt.datetime:
+    return dt.datetime(year, month, day, hour, minute, tzinfo=MARKET_TZ)
+
+
+@pytest.mark.parametrize("day", [
+    dt.date(2024, 1, 1),    # New Year's Day
+    dt.date(2024, 1, 15),   # Martin Luther King Jr. Day
+    dt.date(2024, 2, 19),   # Washington's Birthday
+    dt.date(2024, 3, 29),   # Good Friday
+    dt.date(2025, 4, 18),   # Good Friday
+    dt.date(2024, 5, 27),   # Memorial Day
+    dt.date(2024, 6, 19),   # Juneteenth
+    dt.date(2022, 6, 20),   # Juneteenth on a Sunday, observed on Monday
+    dt.date(2026, 7, 3),    # Independence Day on a Saturday, observed on Friday
+    dt.date(2024, 9, 2),    # Labor Day
+    dt.date(2024, 11, 28),  # Thanksgiving Day
+    dt.date(2022, 12, 26),  # Christmas Day on a Sunday, observed on Monday
+    dt.date(2023, 1, 2),    # New Year's Day on a Sunday, observed on Monday
+])
+def test_holidays(day):
+    assert day in holidays(day.year)
+    assert not is_trading_day(day)
+
+
+def test_new_year_on_saturday_not_observed_on_friday():
+    # 2022-01-01 was a Saturday, the market was open on 2021-12-31
+    assert dt.date(2021, 12, 31) not in holidays(2021)
+    assert is_trading_day(dt.date(2021, 12, 31))
+    assert dt.date(2022, 1, 1) not in holidays(2022)
+
+
+def test_juneteenth_only_from_2022():
+    assert dt.date(2021, 6, 18) not in holidays(2021)
+    assert is_trading_day(dt.date(2021, 6, 18))
+
+
+def test_weekends_and_regular_days():
+    assert not is_trading_day(dt.date(2024, 6, 22))
+    assert not is_trading_day(dt.date(2024, 6, 23))
+    assert is_trading_day(dt.date(2024, 6, 24))
+
+
+def test_is_market_open():
+    assert is_market_open(at(2024, 6, 24, 9, 30))
+    assert is_market_open(at(2024, 6, 24, 15, 59))
+    assert not is_market_open(at(2024, 6, 24, 9, 29))
+    assert not is_market_open(at(2024, 6, 24, 16, 0))
+    assert not is_market_open(at(2024, 3, 29))
+    # 14:00 UTC is 10:00 in New York
+    assert is_market_open(dt.datetime(2024, 6, 24, 14, 0, tzinfo=dt.timezone.utc))
+
+
+def test_naive_time_rejected():
+    with pytest.raises(ValueError):
+        is_market_open(dt.datetime(2024, 6, 24, 12, 0))
+
+
+def test_next_open():
+    assert next_open(at(2024, 6, 24, 8, 0)) == at(2024, 6, 24, 9, 30)
+    assert next_open(at(2024, 6, 24, 9, 30)) == at(2024, 6, 25, 9, 30)
+    # Friday after the close, over the weekend
+    assert next_open(at(2024, 6, 21, 17, 0)) == at(2024, 6, 24, 9, 30)
+    # Thursday before Good Friday, over the long weekend
+    assert next_open(at(2024, 3, 28, 17, 0)) == at(2024, 4, 1, 9, 30)
+    assert seconds_until_next_open(at(2024, 6, 24, 9, 0)) == 1800
+
+
+def test_previous_trading_day():
+    assert previous_trading_day(dt.date(2024, 6, 25)) == dt.date(2024, 6, 24)
+    assert previous_trading_day(dt.date(2024, 6, 24)) == dt.date(2024, 6, 21)
+    # Tuesday after Easter Monday: Good Friday is skipped, Easter Monday is open
+    assert previous_trading_day(dt.date(2024, 4, 2)) == dt.date(2024, 4, 1)
+    assert previous_trading_day(dt.date(2024, 4, 1)) == dt.date(2024, 3, 28)
+    assert previous_trading_day(dt.date(2024, 1, 2)) == dt.date(2023, 12, 29)
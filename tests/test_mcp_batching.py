@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from stock_screener.utils import mcp_batching
+from stock_screener.utils.mcp_batching import MCPBatchingPlugin, prefetch, take_prefetched
+from stock_screener.utils.metrics import MetricsPlugin
+
+
+class SkippingPlugin(BasePlugin):
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        return {"skipped": True}
+
+
+def calls_event(*tickers: str, author: str = "agent") -> Event:
+    return Event(
+        invocation_id="inv",
+        author=author,
+        content=types.Content(role="model", parts=[
+            types.Part(function_call=types.FunctionCall(name="get_price", args={"ticker": ticker}))
+            for ticker in tickers
+        ]),
+    )
+
+
+def context(agent: LlmAgent, plugins: list[BasePlugin]) -> SimpleNamespace:
+    return SimpleNamespace(
+        invocation_id="inv",
+        agent=agent,
+        plugin_manager=SimpleNamespace(plugins=plugins),
+    )
+
+
+async def announce(event: Event, agent: LlmAgent | None = None, extra_plugins=()) -> MCPBatchingPlugin:
+    plugin = MCPBatchingPlugin()
+    ctx = context(agent or LlmAgent(name="agent"), [MetricsPlugin(), plugin, *extra_plugins])
+    await plugin.on_event_callback(invocation_context=ctx, event=event)
+    return plugin
+
+
+async def test_prefetch_starts_announced_calls_once():
+    plugin = await announce(calls_event("TSLA", "INTC", "TSLA"))
+    started = []
+
+    async def call(tool, args):
+        started.append(args["ticker"])
+        return args["ticker"].lower()
+
+    prefetch("inv", {"get_price": object()}, call)
+    assert await take_prefetched("inv", "get_price", {"ticker": "INTC"}) == "intc"
+    assert await take_prefetched("inv", "get_price", {"ticker": "TSLA"}) == "tsla"
+    assert sorted(started) == ["INTC", "TSLA"]
+    # The second TSLA call of the response
+    assert await take_prefetched("inv", "get_price", {"ticker": "TSLA"}) == "tsla"
+    assert started.count("TSLA") == 1
+    plugin.close_invocation("inv")
+    assert take_prefetched("inv", "get_price", {"ticker": "TSLA"}) is None
+
+
+async def test_failed_calls_not_kept():
+    plugin = await announce(calls_event("TSLA", "TSLA", "INTC"))
+
+    async def call(tool, args):
+        raise ConnectionError("MCP server is down")
+
+    prefetch("inv", {"get_price": object()}, call)
+    await asyncio.sleep(0)
+    assert take_prefetched("inv", "get_price", {"ticker": "TSLA"}) is None
+    assert take_prefetched("inv", "get_price", {"ticker": "INTC"}) is None
+    plugin.close_invocation("inv")
+
+
+async def test_single_call_not_announced():
+    plugin = await announce(calls_event("TSLA"))
+    assert "inv" not in mcp_batching._announced
+    plugin.close_invocation("inv")
+
+
+async def test_calls_that_may_be_skipped_not_announced():
+    agent = LlmAgent(name="agent", before_tool_callback=lambda tool, args, tool_context: None)
+    plugin = await announce(calls_event("TSLA", "INTC"), agent=agent)
+    assert "inv" not in mcp_batching._announced
+
+    plugin = await announce(calls_event("TSLA", "INTC"), extra_plugins=[SkippingPlugin(name="skip")])
+    assert "inv" not in mcp_batching._announced
+    plugin.close_invocation("inv")
+
+
+async def test_close_invocation_cancels_started_calls():
+    plugin = await announce(calls_event("TSLA", "INTC"))
+    release = asyncio.Event()
+
+    async def call(tool, args):
+        await release.wait()
+
+    prefetch("inv", {"get_price": object()}, call)
+    tasks = list(mcp_batching._prefetched["inv"].values())
+    plugin.close_invocation("inv")
+    await asyncio.sleep(0)
+
+    assert all(task.cancelled() for task in tasks)
+    assert "inv" not in mcp_batching._prefetched
+    assert "inv" not in mcp_batching._announced
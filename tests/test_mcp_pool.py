@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+import anyio
+from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_client_server_memory_streams
+
+from stock_screener.utils.mcp_pool import MCPSessionPool, _ADKTransport
+
+
+class MemoryTransport(_ADKTransport):
+    """Connections to an in-process MCP server instead of the URL of the pool."""
+
+    def __init__(self):
+        self.server = FastMCP("test")
+        self.server.tool(name="ping")(lambda: "pong")
+        self.streams = []
+        self.closed = 0
+
+    def merge_headers(self, headers):
+        return headers
+
+    @asynccontextmanager
+    async def open(self, headers):
+        server = self.server._mcp_server
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(lambda: server.run(*server_streams, server.create_initialization_options()))
+                self.streams.append(client_streams)
+                try:
+                    yield client_streams
+                finally:
+                    tg.cancel_scope.cancel()
+                    self.closed += 1
+
+
+def pool(size: int = 1) -> tuple[MCPSessionPool, MemoryTransport]:
+    pool = MCPSessionPool(StreamableHTTPServerParams(url="http://mcp"), size=size, health_check_interval=0)
+    pool._transport = transport = MemoryTransport()
+    return pool, transport
+
+
+async def test_sessions_reused():
+    sessions, transport = pool(size=2)
+    borrowed = [await sessions.create_session() for _ in range(4)]
+
+    assert borrowed[0] is borrowed[2] and borrowed[1] is borrowed[3]
+    assert borrowed[0] is not borrowed[1]
+    assert len(transport.streams) == 2
+    assert (await borrowed[0].list_tools()).tools[0].name == "ping"
+
+    await sessions.close_all()
+    assert transport.closed == 2
+
+
+async def test_broken_session_replaced():
+    sessions, transport = pool()
+    first = await sessions.create_session()
+    # The connection drops
+    await transport.streams[0][1].aclose()
+
+    second = await sessions.create_session()
+    assert second is not first
+    assert sessions.stats["reconnected"] == 1
+    assert transport.closed == 1
+    assert (await second.send_ping()) is not None
+    await sessions.close_all()
+
+
+async def test_sessions_of_another_loop_not_shared():
+    sessions, transport = pool()
+    opened, release = threading.Event(), threading.Event()
+    created = {}
+
+    async def other_loop():
+        created["session"] = await sessions.create_session()
+        opened.set()
+        # Keep the loop running, so that it can close its session
+        await asyncio.to_thread(release.wait, 5)
+
+    thread = threading.Thread(target=asyncio.run, args=(other_loop(),))
+    thread.start()
+    try:
+        assert await asyncio.to_thread(opened.wait, 5)
+        session = await sessions.create_session()
+        assert session is not created["session"]
+        await session.send_ping()
+
+        for _ in range(100):
+            if transport.closed:
+                break
+            await asyncio.sleep(0.01)
+        assert transport.closed == 1
+    finally:
+        release.set()
+        await asyncio.to_thread(thread.join, 5)
+    await sessions.close_all()
+    assert transport.closed == 2
@@ -0,0 +1,45 @@
+from fastmcp import Client
+from mcp.types import CallToolResult, TextContent, Tool
+
+from stock_screener.mcp_replay.server import create_server
+from stock_screener.utils.mcp_recorder import MCPRecorder
+
+
+def market_cap_tool() -> Tool:
+    return Tool(
+        name="get_market_cap",
+        description="Market cap of a ticker.",
+        inputSchema={"type": "object", "properties": {"ticker": {"type": "string"}}},
+    )
+
+
+async def test_recorded_calls_replayed(tmp_path):
+    path = tmp_path / "recording.jsonl"
+    recorder = MCPRecorder(path)
+    recorder.record_tools([market_cap_tool()])
+    recorded = CallToolResult(content=[TextContent(type="text", text="1.2T")])
+    recorder.record_call("get_market_cap", {"ticker": "TSLA"}, recorded, seconds=0.3)
+
+    async with Client(create_server(path)) as client:
+        tools = {tool.name: tool for tool in await client.list_tools()}
+        assert tools["get_market_cap"].description == "Market cap of a ticker."
+        # Tools of the project are served even without recorded calls
+        assert "get_news" in tools
+
+        result = await client.call_tool_mcp("get_market_cap", {"ticker": "TSLA"})
+    assert not result.isError
+    assert result.content == recorded.content
+
+
+async def test_calls_never_recorded_fail(tmp_path):
+    path = tmp_path / "recording.jsonl"
+    recorder = MCPRecorder(path)
+    recorder.record_call(
+        "get_market_cap", {"ticker": "TSLA"},
+        CallToolResult(content=[TextContent(type="text", text="1.2T")]), seconds=0.3,
+    )
+
+    async with Client(create_server(path)) as client:
+        result = await client.call_tool_mcp("get_market_cap", {"ticker": "INTC"})
+    assert result.isError
+    assert "No recorded result for get_market_cap" in result.content[0].text
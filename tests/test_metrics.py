@@ -0,0 +1,105 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from stock_screener.utils.metrics import LLM_TOKENS, LLM_TURN_LATENCY, MetricsPlugin
+from stock_screener.utils.runners import ScopedRunner
+
+
+class ScriptedLlm(BaseLlm):
+    """Model yielding the scripted responses, then raising the scripted error."""
+
+    responses: list[LlmResponse] = []
+    error: Exception | None = None
+
+    async def generate_content_async(
+            self, llm_request: LlmRequest, stream: bool = False
+        ) -> AsyncGenerator[LlmResponse, None]:
+        for response in self.responses:
+            yield response
+        if self.error:
+            raise self.error
+
+
+def text_response(text: str, partial: bool = False, usage: bool = True) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part.from_text(text=text)]),
+        partial=partial,
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=10, candidates_token_count=4,
+        ) if usage else None,
+    )
+
+
+async def start_run(model: BaseLlm):
+    plugin = MetricsPlugin()
+    runner = ScopedRunner(
+        app_name="test",
+        agent=LlmAgent(name="agent", model=model),
+        session_service=InMemorySessionService(),
+        plugins=[plugin],
+    )
+    session = await runner.session_service.create_session(app_name="test", user_id="user")
+    events = runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part.from_text(text="hi")]),
+    )
+    return plugin, events
+
+
+def tokens(model: str, token_type: str) -> float:
+    return LLM_TOKENS._series.get((model, token_type), 0)
+
+
+def turns(model: str) -> int:
+    series = LLM_TURN_LATENCY._series.get((model,))
+    return series[1] if series else 0
+
+
+async def test_usage_counted_once_per_call():
+    # Streaming yields the chunks, then the aggregated response and the last chunk with the same usage
+    model = ScriptedLlm(model="once", responses=[
+        text_response("Hel", partial=True, usage=False),
+        text_response("Hello"),
+        text_response("Hello"),
+    ])
+    plugin, events = await start_run(model)
+    [event async for event in events]
+
+    assert tokens("once", "prompt") == 10
+    assert tokens("once", "completion") == 4
+    assert turns("once") == 1
+    assert plugin._llm_calls == {}
+
+
+async def test_state_released_when_run_fails():
+    model = ScriptedLlm(model="failing", responses=[text_response("Hel", partial=True)],
+                        error=RuntimeError("boom"))
+    plugin, events = await start_run(model)
+    with pytest.raises(RuntimeError):
+        [event async for event in events]
+
+    assert plugin._llm_calls == {}
+    assert tokens("failing", "prompt") == 0
+
+
+async def test_state_released_when_run_closed_early():
+    model = ScriptedLlm(model="closed", responses=[text_response("Hello"), text_response("Hello")])
+    plugin, events = await start_run(model)
+    await anext(events)
+    assert plugin._llm_calls
+
+    # Closing the run closes the nested ADK generators on the next loop iterations
+    await events.aclose()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert plugin._llm_calls == {}
+    assert tokens("closed", "prompt") == 10
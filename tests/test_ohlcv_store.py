@@ -0,0 +1,122 @@
+import threading
+
+import numpy as np
+import pytest
+
+from stock_screener.data import prices
+from stock_screener.data.ohlcv_store import OHLCVStore
+
+
+def bars(first: str, days: int, start_value: float = 1.0) -> tuple[np.ndarray, ...]:
+    dates = np.arange(np.datetime64(first), np.datetime64(first) + days)
+    values = np.arange(days, dtype=np.float64) + start_value
+    return dates, values, values + 1, values - 1, values, values * 100
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(tmp_path)
+
+
+def test_append_and_read(store):
+    assert store.append("tsla", *bars("2024-01-01", 10)) == 10
+
+    assert store.tickers() == ["TSLA"]
+    assert store.num_rows("TSLA") == 10
+    assert store.last_date("TSLA") == np.datetime64("2024-01-10")
+
+    columns = store.read("TSLA", start="2024-01-03", end="2024-01-05")
+    assert columns["date"].tolist() == np.arange(
+        np.datetime64("2024-01-03"), np.datetime64("2024-01-06")
+    ).tolist()
+    np.testing.assert_array_equal(columns["close"], [3.0, 4.0, 5.0])
+
+
+def test_read_missing_ticker_is_empty(store):
+    columns = store.read("NONE")
+    assert all(len(values) == 0 for values in columns.values())
+    assert store.last_date("NONE") is None
+
+
+def test_append_only_writes_newer_unique_rows(store):
+    store.append("TSLA", *bars("2024-01-01", 10))
+
+    dates, opens, highs, lows, closes, volumes = bars("2024-01-06", 10)
+    # Unsorted, with a duplicate date and a missing close
+    order = np.r_[9, 0:9, 9]
+    closes = closes.copy()
+    closes[6] = np.nan
+    written = store.append(
+        "TSLA", dates[order], opens[order], highs[order], lows[order], closes[order], volumes[order]
+    )
+
+    stored = store.read("TSLA")["date"]
+    assert written == 4
+    assert len(stored) == 14
+    assert (np.diff(stored.astype(np.int64)) > 0).all()
+
+
+def test_partial_rows_are_ignored_and_overwritten(store):
+    store.append("TSLA", *bars("2024-01-01", 5))
+    # Simulate an append interrupted after writing the first column
+    with open(store._column_path("TSLA", "date"), "ab") as f:
+        f.write(np.array(["2024-01-06"], dtype="datetime64[D]").tobytes())
+
+    assert store.num_rows("TSLA") == 5
+    assert store.append("TSLA", *bars("2024-01-06", 2)) == 2
+    assert store.num_rows("TSLA") == 7
+    assert store.read("TSLA")["date"][-1] == np.datetime64("2024-01-07")
+
+
+def test_concurrent_appends_write_each_date_once(store):
+    threads = [
+        threading.Thread(target=store.append, args=("TSLA", *bars("2024-01-01", days)))
+        for days in (10, 20, 30, 30, 20, 10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = store.read("TSLA")["date"]
+    assert len(stored) == 30
+    assert (np.diff(stored.astype(np.int64)) > 0).all()
+
+
+def test_load_matrix_aligns_dates(store):
+    store.append("TSLA", *bars("2024-01-01", 10))
+    store.append("INTC", *bars("2024-01-06", 5, start_value=50.0))
+
+    history = store.load_matrix(["TSLA", "INTC", "NONE"], lookback_days=8)
+
+    assert history.tickers == ["TSLA", "INTC", "NONE"]
+    assert history.close.shape == (3, 8)
+    np.testing.assert_array_equal(history.close[0], np.arange(3.0, 11.0))
+    assert np.isnan(history.close[1, :3]).all()
+    np.testing.assert_array_equal(history.close[1, 3:], np.arange(50.0, 55.0))
+    assert np.isnan(history.close[2]).all()
+
+
+def test_refresh_store_remembers_tickers_without_prices(store, monkeypatch):
+    last_session = prices._last_completed_session()
+    downloads = []
+
+    def download_prices(tickers, start):
+        downloads.append(list(tickers))
+        dates, *columns = bars(str(last_session - 9), 10)
+        return {
+            ticker: dict(zip(["date", "open", "high", "low", "close", "volume"], [dates, *columns]))
+            for ticker in tickers if ticker != "INTL"
+        }
+
+    monkeypatch.setattr(prices, "download_prices", download_prices)
+
+    assert prices.refresh_store(["TSLA", "INTL"], store=store) == 10
+    assert prices.refresh_store(["TSLA", "INTL"], store=store) == 0
+    assert downloads == [["TSLA", "INTL"]]
+    assert store.tickers() == ["TSLA"]
+    assert store.last_check("INTL")[0] == last_session
+
+    # Once the recheck interval has passed, the ticker is tried again
+    prices.refresh_store(["TSLA", "INTL"], store=store, recheck_seconds=0)
+    assert downloads == [["TSLA", "INTL"], ["INTL"]]
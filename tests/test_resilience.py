@@ -0,0 +1,148 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from a2a.client import A2AClientHTTPError
+from a2a.types import AgentCapabilities, AgentCard
+
+from stock_screener.a2a_client import resilience
+from stock_screener.a2a_client.http_pool import HttpClientPool
+from stock_screener.a2a_client.replica_set import ReplicaSet
+from stock_screener.a2a_client.resilience import (
+    AgentUnavailableError,
+    CircuitBreaker,
+    LatencyWindow,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    # Only the clock of the breakers, the event loop keeps the real one
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def open_breaker(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=3)
+    assert window.percentile(95) is None
+    for seconds in [5, 1, 2, 3]:
+        window.add(seconds)
+    assert len(window) == 3
+    assert window.percentile(0) == 1
+    assert window.percentile(95) == 3
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_trial_success_closes(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_trial_failure_opens_again(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_released_trial_lets_next_call_through(clock):
+    breaker = open_breaker(clock)
+    clock.now += 30
+    breaker.allow()
+    breaker.release()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+class Connection:
+    """Remote agent connection failing, or hanging until cancelled."""
+
+    def __init__(self):
+        self.hang = False
+
+    async def send_message(self, message_request, timeout=None):
+        if self.hang:
+            await asyncio.Event().wait()
+        raise A2AClientHTTPError(503, "unavailable")
+
+
+def card() -> AgentCard:
+    return AgentCard(
+        name="analyst",
+        description="analyst",
+        url="http://analyst",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    )
+
+
+async def test_cancelled_trial_frees_the_circuit(clock):
+    replicas = ReplicaSet(
+        HttpClientPool(), max_retries=0, hedge=False, circuit_failures=1, circuit_reset=30
+    )
+    replicas.add(card(), "http://analyst")
+    connection = replicas.replicas["http://analyst"].connection = Connection()
+
+    with pytest.raises(AgentUnavailableError):
+        await replicas.send_message(None)
+    assert replicas.breaker.state == "open"
+
+    # The trial call is cancelled before the agent answers
+    clock.now += 30
+    connection.hang = True
+    trial = asyncio.create_task(replicas.send_message(None))
+    await asyncio.sleep(0.01)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert replicas.breaker.state == "half_open"
+
+    connection.hang = False
+    with pytest.raises(AgentUnavailableError, match="failed"):
+        await replicas.send_message(None)
+    assert replicas.breaker.state == "open"
@@ -0,0 +1,19 @@
+from stock_screener.a2a_client.response_cache import task_key
+
+
+AGENTS = ("Technical Analyst Agent",)
+
+
+def test_ticker_tasks_share_a_key():
+    first = task_key("Technical Analyst Agent", "Perform technical analysis on: TSLA, INTC.", AGENTS)
+    second = task_key("Technical Analyst Agent", "Run technical analysis for stocks: INTC and TSLA", AGENTS)
+    assert first is not None
+    assert first == second
+
+
+def test_free_form_tasks_not_cached():
+    assert task_key("Technical Analyst Agent", "And what about the one we discussed?", AGENTS) is None
+
+
+def test_tasks_of_other_agents_not_cached():
+    assert task_key("Portfolio Agent", "Run technical analysis for stock TSLA", AGENTS) is None
@@ -0,0 +1,68 @@
+import pytest
+from a2a.types import DataPart, Message, Part, Role, TextPart
+
+from stock_screener.a2a_server.screening import (
+    classify_query,
+    parse_batch_request,
+    parse_screening_request,
+    table_rows,
+)
+from stock_screener.indicators.engine import INDICATORS
+
+
+def data_message(data: dict) -> Message:
+    return Message(role=Role.user, message_id="m1", parts=[Part(root=DataPart(data=data))])
+
+
+def test_parse_batch_request_defaults():
+    request = parse_batch_request(data_message({"tickers": ["tsla", "INTC", "TSLA"]}))
+
+    assert request == {"tickers": ["TSLA", "INTC"], "indicators": list(INDICATORS), "lookback": 300}
+
+
+def test_text_message_is_not_a_batch_request():
+    message = Message(role=Role.user, message_id="m1", parts=[Part(root=TextPart(text="TSLA"))])
+    assert parse_batch_request(message) is None
+    assert parse_batch_request(None) is None
+
+
+@pytest.mark.parametrize("data, error", [
+    ({"tickers": "TSLA"}, "must be a list"),
+    ({"tickers": ["TSLA", "../etc/passwd"]}, "Invalid ticker symbols"),
+    ({"tickers": ["TSLA"], "indicators": ["vwap"]}, "Unknown indicators"),
+    ({"tickers": ["TSLA"], "lookback": 0}, "positive number"),
+])
+def test_parse_batch_request_rejects_invalid_payloads(data, error):
+    with pytest.raises(ValueError, match=error):
+        parse_batch_request(data_message(data))
+
+
+def test_parse_batch_request_caps_the_number_of_tickers():
+    message = data_message({"tickers": ["AAA", "BBB", "CCC"]})
+
+    assert parse_batch_request(message, max_tickers=3)["tickers"] == ["AAA", "BBB", "CCC"]
+    with pytest.raises(ValueError, match="At most 2 tickers"):
+        parse_batch_request(message, max_tickers=2)
+
+
+@pytest.mark.parametrize("query, tickers", [
+    ("Run technical analysis for TSLA.", ["TSLA"]),
+    ("Is the stock INTC bullish or bearish right now?", ["INTC"]),
+    ("What are the technical signals for BRK.B?", ["BRK.B"]),
+    ("Perform technical analysis on: TSLA, INTC and GOOGL.", ["TSLA", "INTC", "GOOGL"]),
+    ("What about its RSI?", []),
+    ("Run technical analysis for the company Tesla.", []),
+])
+def test_classify_query(query, tickers):
+    assert classify_query(query) == tickers
+
+
+def test_parse_screening_request_rejects_free_text():
+    assert parse_screening_request("Perform technical analysis on: the biggest tech stocks") == []
+
+
+def test_table_rows_fall_back_to_one_row_per_ticker():
+    assert table_rows("| Ticker | Signal |\n|---|---|\n| TSLA | bullish |", ["TSLA"]) == "| TSLA | bullish |\n"
+    assert table_rows("No data | sorry", ["TSLA", "INTC"]) == (
+        "| TSLA | - | No data / sorry |\n| INTC | - | No data / sorry |\n"
+    )
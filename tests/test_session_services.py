@@ -0,0 +1,146 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.adk.events import Event
+from google.genai import types
+
+from stock_screener.utils import session_services
+from stock_screener.utils.session_services import BoundedArtifactService, BoundedSessionService
+
+
+APP = "app"
+USER = "user"
+
+
+def text_event(text: str) -> Event:
+    return Event(author="user", content=types.Content(role="user", parts=[types.Part(text=text)]))
+
+
+class Clock:
+    """Monotonic clock of the services, moved forward by the tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(session_services, "time", SimpleNamespace(monotonic=clock, time=time.time))
+    return clock
+
+
+async def create(service: BoundedSessionService, session_id: str, text: str = "hello"):
+    session = await service.create_session(app_name=APP, user_id=USER, session_id=session_id)
+    await service.append_event(session, text_event(text))
+    return session
+
+
+async def get(service: BoundedSessionService, session_id: str):
+    return await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+
+
+async def test_least_recently_used_session_is_evicted():
+    service = BoundedSessionService(max_sessions=2, spill_dir=None)
+    await create(service, "s1")
+    await create(service, "s2")
+    await get(service, "s1")
+    await create(service, "s3")
+
+    assert await get(service, "s2") is None
+    assert await get(service, "s1") is not None
+    assert service.stats["evicted_lru"] == 1
+    assert service.stats["sessions"] == 2
+
+
+async def test_idle_sessions_expire(clock):
+    service = BoundedSessionService(ttl_seconds=60, spill_dir=None)
+    await create(service, "s1")
+    clock.now += 61
+
+    assert await get(service, "s1") is None
+    assert service.stats["evicted_ttl"] == 1
+
+
+async def test_memory_cap_keeps_newest_session():
+    service = BoundedSessionService(max_bytes=1, spill_dir=None)
+    await create(service, "s1")
+    await create(service, "s2")
+
+    assert await get(service, "s1") is None
+    assert await get(service, "s2") is not None
+    assert service.stats["evicted_memory"] >= 1
+
+
+@pytest.mark.parametrize("limits", [{"max_sessions": 1}, {"ttl_seconds": 60}])
+async def test_evicted_sessions_are_spilled_and_restored(tmp_path, clock, limits):
+    service = BoundedSessionService(spill_dir=tmp_path, **limits)
+    await create(service, "s1", "first question")
+    clock.now += 61
+    await create(service, "s2")
+
+    session = await get(service, "s1")
+
+    assert session is not None
+    assert session.events[0].content.parts[0].text == "first question"
+    assert service.stats["spilled"] >= 1
+    assert service.stats["restored"] == 1
+
+
+async def test_spill_paths_stay_in_spill_dir(tmp_path):
+    spill_dir = tmp_path / "sessions"
+    service = BoundedSessionService(max_sessions=1, spill_dir=spill_dir)
+    await create(service, "../../../escaped")
+    await create(service, "s2")
+
+    assert [path.parent for path in tmp_path.rglob("*.json.z")] == [spill_dir]
+    assert await get(service, "../../../escaped") is not None
+
+
+async def test_expired_spilled_sessions_are_deleted(tmp_path):
+    service = BoundedSessionService(
+        max_sessions=1, spill_dir=tmp_path, spill_ttl_seconds=60, sweep_interval=0
+    )
+    await create(service, "s1")
+    await create(service, "s2")
+    spilled = list(tmp_path.glob("*.json.z"))
+    assert len(spilled) == 1
+
+    old = time.time() - 120
+    os.utime(spilled[0], (old, old))
+    await create(service, "s3")
+
+    assert await get(service, "s1") is None
+    assert service.stats["spill_expired"] == 1
+    # s2 was spilled when s3 was created
+    assert len(list(tmp_path.glob("*.json.z"))) == 1
+
+
+async def test_delete_session_removes_spilled_copy(tmp_path):
+    service = BoundedSessionService(max_sessions=1, spill_dir=tmp_path)
+    await create(service, "s1")
+    await create(service, "s2")
+    await service.delete_session(app_name=APP, user_id=USER, session_id="s1")
+
+    assert await get(service, "s1") is None
+
+
+async def test_artifact_service_evicts_least_recently_used():
+    service = BoundedArtifactService(max_artifacts=2)
+    for name in ["a", "b", "c"]:
+        await service.save_artifact(
+            app_name=APP, user_id=USER, session_id="s1", filename=name, artifact=types.Part(text=name)
+        )
+
+    loaded = [
+        await service.load_artifact(app_name=APP, user_id=USER, session_id="s1", filename=name)
+        for name in ["a", "b", "c"]
+    ]
+    assert loaded[0] is None
+    assert [part.text for part in loaded[1:]] == ["b", "c"]
+    assert service.stats["evicted_lru"] == 1
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from a2a.types import Task, TaskState, TaskStatus
+
+from stock_screener.a2a_server.task_store import SQLiteTaskStore
+
+
+def make_task(task_id: str, state: TaskState = TaskState.working, context_id: str = "ctx") -> Task:
+    return Task(id=task_id, context_id=context_id, status=TaskStatus(state=state))
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = SQLiteTaskStore(tmp_path / "tasks.db", batch_size=3, flush_interval=60)
+    yield store
+    await store.close()
+
+
+async def test_intermediate_updates_are_buffered(store):
+    await store.save(make_task("t1"))
+
+    assert store._read("t1") is None
+    assert (await store.get("t1")).status.state == TaskState.working
+
+    await store.flush()
+    assert store._read("t1").status.state == TaskState.working
+
+
+async def test_final_states_are_written_through(store):
+    await store.save(make_task("t1"))
+    await store.save(make_task("t1", TaskState.completed))
+
+    assert "t1" not in store._pending
+    assert store._read("t1").status.state == TaskState.completed
+
+
+async def test_full_batch_is_flushed(store):
+    for i in range(3):
+        await store.save(make_task(f"t{i}"))
+
+    assert not store._pending
+    assert all(store._read(f"t{i}") for i in range(3))
+
+
+async def test_buffered_task_is_written_as_last_saved(store):
+    task = make_task("t1")
+    await store.save(task)
+    task.status = TaskStatus(state=TaskState.input_required)
+    task.metadata = {"step": 2}
+    await store.save(task)
+
+    stored = store._read("t1")
+    assert stored.status.state == TaskState.input_required
+    assert stored.metadata == {"step": 2}
+
+
+async def test_flush_after_interval(tmp_path):
+    store = SQLiteTaskStore(tmp_path / "tasks.db", flush_interval=0.01)
+    await store.save(make_task("t1"))
+    await asyncio.sleep(0.1)
+
+    assert store._read("t1") is not None
+    await store.close()
+
+
+async def test_get_by_context_includes_buffered_tasks(store):
+    await store.save(make_task("t1", TaskState.completed))
+    await store.save(make_task("t2"))
+    await store.save(make_task("t3", context_id="other"))
+
+    assert [task.id for task in await store.get_by_context("ctx")] == ["t1", "t2"]
+
+
+async def test_delete(store):
+    await store.save(make_task("t1", TaskState.completed))
+    await store.save(make_task("t2"))
+    await store.delete("t1")
+    await store.delete("t2")
+
+    assert await store.get("t1") is None
+    assert await store.get("t2") is None
+
+
+async def test_evict_expired(store):
+    await store.save(make_task("t1", TaskState.completed))
+    assert await store.evict_expired() == 0
+
+    store.ttl_seconds = -1
+    assert await store.evict_expired() == 1
+    assert await store.get("t1") is None
+
+
+async def test_tasks_survive_reopening(tmp_path):
+    store = SQLiteTaskStore(tmp_path / "tasks.db", flush_interval=60)
+    await store.save(make_task("t1"))
+    await store.close()
+
+    reopened = SQLiteTaskStore(tmp_path / "tasks.db")
+    assert (await reopened.get("t1")).status.state == TaskState.working
+    await reopened.close()
+
+
+async def test_final_states_are_not_overwritten(store):
+    await store.save(make_task("t1", TaskState.canceled))
+    # The worker running the task saves its result after the cancel
+    await store.save(make_task("t1", TaskState.completed))
+    await store.save(make_task("t1"))
+    await store.flush()
+
+    assert store._read("t1").status.state == TaskState.canceled
+
+
+async def test_canceled(store):
+    await store.save(make_task("t1", TaskState.canceled))
+    await store.save(make_task("t2", TaskState.completed))
+    await store.save(make_task("t3"))
+
+    assert await store.canceled(["t1", "t2", "t3", "t4"]) == {"t1"}
+    assert await store.canceled([]) == set()
@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+from mcp.types import CallToolResult, TextContent
+
+from stock_screener.utils import tool_cache
+from stock_screener.utils.tool_cache import ToolResultCache, tool_key
+
+
+def result(text: str, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+def disk_keys(path) -> list[str]:
+    with sqlite3.connect(path) as conn:
+        return sorted(key for (key,) in conn.execute("SELECT key FROM tool_results"))
+
+
+def test_tool_key_ignores_argument_order():
+    assert tool_key("get_market_cap", {"a": 1, "b": 2}) == tool_key("get_market_cap", {"b": 2, "a": 1})
+
+
+async def test_memory_tier_lru_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = ToolResultCache(ttls={}, max_entries=2)
+    await cache.put("a", result("a"), ttl=10)
+    await cache.put("b", result("b"), ttl=100)
+    await cache.get("a")
+    await cache.put("c", result("c"), ttl=100)
+    assert await cache.get("b") is None
+    assert (await cache.get("a")).content[0].text == "a"
+
+    now[0] += 10
+    assert await cache.get("a") is None
+    assert await cache.get("c") is not None
+
+
+async def test_errors_not_cached():
+    cache = ToolResultCache(ttls={})
+    await cache.put("a", result("failed", is_error=True), ttl=10)
+    assert await cache.get("a") is None
+
+
+async def test_disk_tier_shared_between_caches(tmp_path):
+    await ToolResultCache(ttls={}, db_path=tmp_path / "cache.db").put("a", result("a"), ttl=100)
+    cache = ToolResultCache(ttls={}, db_path=tmp_path / "cache.db")
+    assert (await cache.get("a")).content[0].text == "a"
+
+
+async def test_disk_tier_swept_on_write(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    path = tmp_path / "cache.db"
+    cache = ToolResultCache(ttls={}, db_path=path, sweep_interval=60)
+    await cache.put("short", result("short"), ttl=10)
+    await cache.put("long", result("long"), ttl=1000)
+
+    # Expired, but the last sweep is too recent
+    now[0] += 30
+    await cache.put("other", result("other"), ttl=1000)
+    assert disk_keys(path) == ["long", "other", "short"]
+
+    now[0] += 30
+    await cache.put("other", result("other"), ttl=1000)
+    assert disk_keys(path) == ["long", "other"]
+
+
+async def test_locked_disk_tier_does_not_block_the_loop(tmp_path):
+    cache = ToolResultCache(ttls={}, db_path=tmp_path / "cache.db")
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0.001)
+
+    ticker = asyncio.create_task(tick())
+    with cache._db_lock:
+        lookup = asyncio.create_task(cache.get("a"))
+        await asyncio.sleep(0.05)
+        assert not lookup.done()
+    assert await lookup is None
+    ticker.cancel()
+    assert len(ticks) > 5